@@ -0,0 +1,54 @@
+"""add board ingest states
+
+Revision ID: 3f9a6c1d2e47
+Revises: b814a274450d
+Create Date: 2026-10-17 09:12:40.118273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d2e47'
+down_revision: Union[str, Sequence[str], None] = 'b814a274450d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('board_ingest_states',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('board_token', sa.String(length=255), nullable=False),
+    sa.Column('etag', sa.String(length=255), nullable=True),
+    sa.Column('last_modified', sa.String(length=100), nullable=True),
+    sa.Column('job_watermarks', sa.JSON(), nullable=False),
+    sa.Column('with_jd', sa.Boolean(), nullable=False, server_default=sa.false()),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'board_token', name='uq_board_ingest_states_source_board')
+    )
+    op.create_index(op.f('ix_board_ingest_states_id'), 'board_ingest_states', ['id'], unique=False)
+
+    op.add_column('job_postings', sa.Column('board_token', sa.String(length=255), nullable=True))
+    op.add_column('job_postings', sa.Column('external_id', sa.String(length=100), nullable=True))
+    op.create_index(
+        'ix_job_postings_source_board_external',
+        'job_postings',
+        ['source', 'board_token', 'external_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_postings_source_board_external', table_name='job_postings')
+    op.drop_column('job_postings', 'external_id')
+    op.drop_column('job_postings', 'board_token')
+
+    op.drop_index(op.f('ix_board_ingest_states_id'), table_name='board_ingest_states')
+    op.drop_table('board_ingest_states')
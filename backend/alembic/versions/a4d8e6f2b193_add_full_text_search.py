@@ -0,0 +1,137 @@
+"""add full text search
+
+Revision ID: a4d8e6f2b193
+Revises: f3c9a7e2d851
+Create Date: 2026-10-17 18:40:12.730194
+
+"""
+import zlib
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import SEARCH_TS_CONFIG
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e6f2b193'
+down_revision: Union[str, Sequence[str], None] = 'f3c9a7e2d851'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 500
+
+# 与 app.crud.search_index 保持一致
+FTS_TABLES = {'applications': 'applications_fts', 'job_postings': 'job_postings_fts'}
+
+jd_blobs = sa.table('jd_blobs', sa.column('hash', sa.String), sa.column('codec', sa.String), sa.column('data', sa.LargeBinary))
+events = sa.table('events', sa.column('application_id', sa.Integer), sa.column('event_time', sa.DateTime), sa.column('notes', sa.Text))
+
+
+def _decompress(codec, data):
+    if data is None:
+        return ''
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    return zlib.decompress(data).decode('utf-8')
+
+
+def _insert_docs(conn, fts: str, docs: list) -> None:
+    if not docs:
+        return
+    if conn.dialect.name == 'postgresql':
+        conn.execute(
+            sa.text(
+                f"""
+                INSERT INTO {fts} (id, document)
+                VALUES (
+                    :id,
+                    setweight(to_tsvector(CAST(:cfg AS regconfig), :title), 'A')
+                    || setweight(to_tsvector(CAST(:cfg AS regconfig), :location), 'B')
+                    || setweight(to_tsvector(CAST(:cfg AS regconfig), :body), 'C')
+                )
+                """
+            ),
+            [{**d, 'cfg': SEARCH_TS_CONFIG} for d in docs],
+        )
+    else:
+        conn.execute(
+            sa.text(f"INSERT INTO {fts} (rowid, title, location, body) VALUES (:id, :title, :location, :body)"),
+            docs,
+        )
+
+
+def _backfill(conn, table_name: str) -> None:
+    t = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('company_name', sa.String),
+        sa.column('role_title', sa.String),
+        sa.column('location', sa.String),
+        sa.column('jd_hash', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.company_name, t.c.role_title, t.c.location, jd_blobs.c.codec, jd_blobs.c.data)
+            .select_from(t.outerjoin(jd_blobs, jd_blobs.c.hash == t.c.jd_hash))
+            .where(t.c.id > last_id)
+            .order_by(t.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        notes = defaultdict(list)
+        if table_name == 'applications':
+            for app_id, note in conn.execute(
+                sa.select(events.c.application_id, events.c.notes)
+                .where(events.c.application_id.in_([r[0] for r in rows]), events.c.notes.isnot(None))
+                .order_by(events.c.event_time)
+            ):
+                notes[app_id].append(note)
+
+        docs = []
+        for row_id, company_name, role_title, location, codec, data in rows:
+            docs.append({
+                'id': row_id,
+                'title': ' '.join(p for p in (company_name, role_title) if p),
+                'location': location or '',
+                'body': '\n'.join([_decompress(codec, data), *notes[row_id]]),
+            })
+        _insert_docs(conn, FTS_TABLES[table_name], docs)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    for fts in FTS_TABLES.values():
+        if conn.dialect.name == 'postgresql':
+            op.create_table(fts,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('document', sa.dialects.postgresql.TSVECTOR(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+            )
+            op.create_index(f'ix_{fts}_document', fts, ['document'], unique=False, postgresql_using='gin')
+        else:
+            # rowid = 原表 id；porter 词干 + unicode61 分词
+            op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5(title, location, body, tokenize='porter unicode61')")
+
+    # 现有数据建索引（JD 从 jd_blobs 解压，application 带上事件备注）
+    for table_name in FTS_TABLES:
+        _backfill(conn, table_name)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    for fts in FTS_TABLES.values():
+        if conn.dialect.name == 'postgresql':
+            op.drop_index(f'ix_{fts}_document', table_name=fts)
+            op.drop_table(fts)
+        else:
+            op.execute(f"DROP TABLE {fts}")
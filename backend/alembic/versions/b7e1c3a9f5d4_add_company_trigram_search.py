@@ -0,0 +1,62 @@
+"""add company trigram search
+
+Revision ID: b7e1c3a9f5d4
+Revises: a4d8e6f2b193
+Create Date: 2026-10-17 19:05:31.284417
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c3a9f5d4'
+down_revision: Union[str, Sequence[str], None] = 'a4d8e6f2b193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+# 与 app.crud.crud_company.company_search_key 保持一致
+_NON_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('company_index', sa.Column('search_key', sa.String(length=255), nullable=False, server_default=''))
+
+    conn = op.get_bind()
+    t = sa.table('company_index', sa.column('id', sa.Integer), sa.column('normalized_name', sa.String), sa.column('search_key', sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.normalized_name).where(t.c.id > last_id).order_by(t.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        conn.execute(
+            t.update().where(t.c.id == sa.bindparam('row_id')).values(search_key=sa.bindparam('key')),
+            [{'row_id': row_id, 'key': _NON_ALNUM.sub('', name or '')} for row_id, name in rows],
+        )
+
+    with op.batch_alter_table('company_index') as batch_op:
+        batch_op.alter_column('search_key', server_default=None)
+
+    if conn.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_company_index_search_key_trgm', 'company_index', ['search_key'], unique=False,
+            postgresql_using='gin', postgresql_ops={'search_key': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_company_index_search_key_trgm', table_name='company_index')
+    with op.batch_alter_table('company_index') as batch_op:
+        batch_op.drop_column('search_key')
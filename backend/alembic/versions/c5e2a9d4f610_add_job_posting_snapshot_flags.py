@@ -0,0 +1,37 @@
+"""add job posting snapshot flags
+
+Revision ID: c5e2a9d4f610
+Revises: 8b1e4d7a5c02
+Create Date: 2026-10-17 13:05:22.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a9d4f610'
+down_revision: Union[str, Sequence[str], None] = '8b1e4d7a5c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('is_new', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('job_postings', sa.Column('closed_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_job_postings_is_new_created_at',
+        'job_postings',
+        ['is_new', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_postings_is_new_created_at', table_name='job_postings')
+    op.drop_column('job_postings', 'closed_at')
+    op.drop_column('job_postings', 'is_new')
@@ -0,0 +1,32 @@
+"""add hot path composite indexes
+
+Revision ID: c8f2d6a1e937
+Revises: b7e1c3a9f5d4
+Create Date: 2026-10-17 22:41:06.273915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2d6a1e937'
+down_revision: Union[str, Sequence[str], None] = 'b7e1c3a9f5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_application_id_event_type_event_time', 'events', ['application_id', 'event_type', 'event_time'], unique=False)
+    op.create_index('ix_applications_status_created_at_id', 'applications', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_company_index_search_key_popularity', 'company_index', ['search_key', 'popularity', 'last_seen_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_company_index_search_key_popularity', table_name='company_index')
+    op.drop_index('ix_applications_status_created_at_id', table_name='applications')
+    op.drop_index('ix_events_application_id_event_type_event_time', table_name='events')
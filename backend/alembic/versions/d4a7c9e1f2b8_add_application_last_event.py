@@ -0,0 +1,62 @@
+"""add application last event
+
+Revision ID: d4a7c9e1f2b8
+Revises: c8f2d6a1e937
+Create Date: 2026-10-17 23:20:14.906352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c9e1f2b8'
+down_revision: Union[str, Sequence[str], None] = 'c8f2d6a1e937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('applications', sa.Column('last_event_id', sa.Integer(), nullable=True))
+    op.add_column('applications', sa.Column('last_event_type', sa.String(length=60), nullable=True))
+    op.add_column('applications', sa.Column('last_event_at', sa.DateTime(), nullable=True))
+
+    # 回填：每个 application 最近的一条事件（(event_time, id) 最大，同一时间取 id 大的），
+    # 相关子查询走 ix_events_application_id_event_time_id
+    op.execute(
+        """
+        UPDATE applications SET last_event_id = (
+            SELECT e.id FROM events e
+            WHERE e.application_id = applications.id
+            ORDER BY e.event_time DESC, e.id DESC
+            LIMIT 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE applications SET
+            last_event_type = (SELECT e.event_type FROM events e WHERE e.id = applications.last_event_id),
+            last_event_at = (SELECT e.event_time FROM events e WHERE e.id = applications.last_event_id)
+        WHERE last_event_id IS NOT NULL
+        """
+    )
+
+    op.create_index(
+        'ix_applications_last_activity_id',
+        'applications',
+        [sa.text('coalesce(last_event_at, created_at)'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_last_activity_id', table_name='applications')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.drop_column('last_event_at')
+        batch_op.drop_column('last_event_type')
+        batch_op.drop_column('last_event_id')
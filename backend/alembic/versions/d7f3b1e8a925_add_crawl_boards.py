@@ -0,0 +1,51 @@
+"""add crawl boards
+
+Revision ID: d7f3b1e8a925
+Revises: c5e2a9d4f610
+Create Date: 2026-10-17 15:41:09.307514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b1e8a925'
+down_revision: Union[str, Sequence[str], None] = 'c5e2a9d4f610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('crawl_boards',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('board_token', sa.String(length=255), nullable=False),
+    sa.Column('fetch_jd', sa.Boolean(), nullable=False, server_default=sa.true()),
+    sa.Column('enabled', sa.Boolean(), nullable=False, server_default=sa.true()),
+    sa.Column('next_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_status', sa.String(length=20), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('last_duration_ms', sa.Integer(), nullable=True),
+    sa.Column('consecutive_failures', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['company_index.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'board_token', name='uq_crawl_boards_source_board')
+    )
+    op.create_index(op.f('ix_crawl_boards_company_id'), 'crawl_boards', ['company_id'], unique=False)
+    op.create_index(op.f('ix_crawl_boards_id'), 'crawl_boards', ['id'], unique=False)
+    op.create_index(op.f('ix_crawl_boards_next_run_at'), 'crawl_boards', ['next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_crawl_boards_next_run_at'), table_name='crawl_boards')
+    op.drop_index(op.f('ix_crawl_boards_id'), table_name='crawl_boards')
+    op.drop_index(op.f('ix_crawl_boards_company_id'), table_name='crawl_boards')
+    op.drop_table('crawl_boards')
@@ -0,0 +1,145 @@
+"""move jd text to jd blobs
+
+Revision ID: e2b8c4f1a736
+Revises: d7f3b1e8a925
+Create Date: 2026-10-17 17:22:48.915302
+
+"""
+import hashlib
+import zlib
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c4f1a736'
+down_revision: Union[str, Sequence[str], None] = 'd7f3b1e8a925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 500
+
+jd_blobs = sa.table(
+    'jd_blobs',
+    sa.column('hash', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('data', sa.LargeBinary),
+    sa.column('raw_size', sa.Integer),
+    sa.column('compressed_size', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _normalize(text):
+    # 与 app.crud.crud_jd_blob.normalize_jd 保持一致
+    if not text:
+        return None
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip() or None
+
+
+def _move_to_blobs(conn, table_name: str, seen: set) -> None:
+    t = sa.table(table_name, sa.column('id', sa.Integer), sa.column('jd_text', sa.Text), sa.column('jd_hash', sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.jd_text)
+            .where(t.c.id > last_id, t.c.jd_text.isnot(None))
+            .order_by(t.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        blobs, updates = [], []
+        for row_id, text in rows:
+            normalized = _normalize(text)
+            if normalized is None:
+                continue
+            raw = normalized.encode("utf-8")
+            h = hashlib.sha256(raw).hexdigest()
+            if h not in seen:
+                seen.add(h)
+                data = zlib.compress(raw, 6)
+                blobs.append({
+                    'hash': h, 'codec': 'zlib', 'data': data,
+                    'raw_size': len(raw), 'compressed_size': len(data), 'created_at': datetime.utcnow(),
+                })
+            updates.append({'row_id': row_id, 'h': h})
+
+        if blobs:
+            conn.execute(jd_blobs.insert(), blobs)
+        if updates:
+            conn.execute(t.update().where(t.c.id == sa.bindparam('row_id')).values(jd_hash=sa.bindparam('h')), updates)
+
+
+def _restore_from_blobs(conn, table_name: str) -> None:
+    t = sa.table(table_name, sa.column('id', sa.Integer), sa.column('jd_text', sa.Text), sa.column('jd_hash', sa.String))
+    rows = conn.execute(
+        sa.select(t.c.id, jd_blobs.c.codec, jd_blobs.c.data).join(jd_blobs, jd_blobs.c.hash == t.c.jd_hash)
+    ).all()
+    updates = []
+    for row_id, codec, data in rows:
+        if codec == 'zstd':
+            import zstandard
+            raw = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            raw = zlib.decompress(data)
+        updates.append({'row_id': row_id, 'text': raw.decode("utf-8")})
+    for i in range(0, len(updates), BATCH):
+        conn.execute(
+            t.update().where(t.c.id == sa.bindparam('row_id')).values(jd_text=sa.bindparam('text')),
+            updates[i:i + BATCH],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jd_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('codec', sa.String(length=10), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('raw_size', sa.Integer(), nullable=False),
+    sa.Column('compressed_size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+
+    for table_name in ('job_postings', 'applications'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('jd_hash', sa.String(length=64), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_{table_name}_jd_hash'), ['jd_hash'], unique=False)
+            batch_op.create_foreign_key(f'fk_{table_name}_jd_hash_jd_blobs', 'jd_blobs', ['jd_hash'], ['hash'])
+
+    # 现有 JD 压缩后搬进 jd_blobs（同样的 JD 只存一份）
+    conn = op.get_bind()
+    seen: set = set()
+    for table_name in ('job_postings', 'applications'):
+        _move_to_blobs(conn, table_name, seen)
+
+    for table_name in ('job_postings', 'applications'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('jd_text')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ('job_postings', 'applications'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('jd_text', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    for table_name in ('job_postings', 'applications'):
+        _restore_from_blobs(conn, table_name)
+
+    for table_name in ('job_postings', 'applications'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_constraint(f'fk_{table_name}_jd_hash_jd_blobs', type_='foreignkey')
+            batch_op.drop_index(batch_op.f(f'ix_{table_name}_jd_hash'))
+            batch_op.drop_column('jd_hash')
+
+    op.drop_table('jd_blobs')
@@ -0,0 +1,31 @@
+"""add application external ref
+
+Revision ID: e6b2d8f4a1c3
+Revises: d4a7c9e1f2b8
+Create Date: 2026-10-17 23:58:41.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2d8f4a1c3'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c9e1f2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('applications', sa.Column('external_ref', sa.String(length=200), nullable=True))
+    op.create_index(op.f('ix_applications_external_ref'), 'applications', ['external_ref'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_applications_external_ref'), table_name='applications')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.drop_column('external_ref')
@@ -0,0 +1,33 @@
+"""add application lower name index
+
+Revision ID: f1a3c5e7b9d2
+Revises: e6b2d8f4a1c3
+Create Date: 2026-10-17 19:41:07.284615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b9d2'
+down_revision: Union[str, Sequence[str], None] = 'e6b2d8f4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_applications_lower_company_role',
+        'applications',
+        [sa.text('lower(company_name)'), sa.text('lower(role_title)')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_lower_company_role', table_name='applications')
@@ -0,0 +1,38 @@
+"""add keyset pagination indexes
+
+Revision ID: f3c9a7e2d851
+Revises: e2b8c4f1a736
+Create Date: 2026-10-17 18:12:40.518236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a7e2d851'
+down_revision: Union[str, Sequence[str], None] = 'e2b8c4f1a736'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_applications_created_at_id', 'applications', ['created_at', 'id'], unique=False)
+    op.create_index('ix_applications_updated_at_id', 'applications', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_applications_company_name_id', 'applications', ['company_name', 'id'], unique=False)
+    op.create_index('ix_applications_role_title_id', 'applications', ['role_title', 'id'], unique=False)
+    op.create_index('ix_job_postings_created_at_id', 'job_postings', ['created_at', 'id'], unique=False)
+    op.create_index('ix_events_application_id_event_time_id', 'events', ['application_id', 'event_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_application_id_event_time_id', table_name='events')
+    op.drop_index('ix_job_postings_created_at_id', table_name='job_postings')
+    op.drop_index('ix_applications_role_title_id', table_name='applications')
+    op.drop_index('ix_applications_company_name_id', table_name='applications')
+    op.drop_index('ix_applications_updated_at_id', table_name='applications')
+    op.drop_index('ix_applications_created_at_id', table_name='applications')
@@ -0,0 +1,28 @@
+from typing import Any, Iterable
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> list[str]:
+    """
+    ?fields=company_name,role_title -> 要 SELECT / 输出的字段；不传 = schema 的全部字段。
+    id 总是带上；未知字段 400
+    """
+    allowed = list(schema.model_fields)
+    if not fields:
+        return allowed
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})",
+        )
+    return ["id", *(f for f in dict.fromkeys(requested) if f != "id")]
+
+
+def project(obj: Any, fields: Iterable[str]) -> dict:
+    # 只读已加载的列：load_only 之外的属性会 raiseload
+    return {f: getattr(obj, f) for f in fields}
@@ -4,6 +4,7 @@ from app.api.v1.metrics import router as metrics_router
 from app.api.v1.companies import router as companies_router
 from app.api.v1.jobs import router as jobs_router
 from app.api.v1.ingest import router as ingest_router
+from app.api.v1.crawl import router as crawl_router
 
 all_routers = [
     applications_router,
@@ -12,4 +13,5 @@ all_routers = [
     companies_router,
     jobs_router,
     ingest_router,
+    crawl_router,
 ]
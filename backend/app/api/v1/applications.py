@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import csv
+import io
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.api.fields import parse_fields, project
+from app.core.config import IMPORT_BATCH_SIZE
 from app.schemas.application import (
     ApplicationCreate,
+    ApplicationDetailOut,
     ApplicationOut,
     ApplicationListOut,
 )
@@ -12,6 +20,10 @@ from app.crud.crud_application import (
     list_applications,
     get_application,
 )
+from app.crud.crud_jd_blob import get_jd_text
+from app.crud.pagination import InvalidCursor
+from app.services import exporter
+from app.services.importer import FORMATS, detect_format, import_applications
 
 router = APIRouter(tags=["applications"])
 
@@ -27,45 +39,117 @@ def create_application_api(
     return create_application(db, data)
 
 
-@router.get("/applications", response_model=ApplicationListOut)
+@router.post("/applications/import")
+def import_applications_api(
+    file: UploadFile = File(..., description="CSV or NDJSON, one application field set and/or event per row"),
+    format: str | None = Query(default=None, pattern=f"^({'|'.join(FORMATS)})$", description="default: from the file name"),
+    batch_size: int = Query(default=IMPORT_BATCH_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk import applications and their events (see app.services.importer for the row format).
+    Rows are streamed and committed in batches; invalid rows are reported and skipped.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the format from the file name; pass ?format=csv|ndjson")
+
+    # 上传文件超过 1MB 会落盘（SpooledTemporaryFile），这里按行流式读
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_applications(db, stream, fmt=fmt, batch_size=batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable {fmt} file: {e}")
+    finally:
+        stream.detach()
+
+
+@router.get("/applications", response_model=ApplicationListOut, response_model_exclude_unset=True)
 def list_applications_api(
+    response: Response,
     status: str | None = None,
     search: str | None = Query(default=None, min_length=1),
+    active_since: datetime | None = Query(
+        default=None, description="Only applications with an event (or created) at/after this time"
+    ),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    order_by: str = Query(default="created_at"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page (ignores offset)"),
+    order_by: str = Query(
+        default="created_at",
+        description=(
+            "created_at / updated_at / company_name / role_title / last_activity_at (latest event, "
+            "else created_at), or relevance (with search)"
+        ),
+    ),
     order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    fields: str | None = Query(default=None, description="Comma-separated fields to return, e.g. company_name,status"),
     db: Session = Depends(get_db),
 ):
     """
     List job applications with pagination, sorting and filtering
     """
-    total, items = list_applications(
-        db,
-        status=status,
-        search=search,
-        limit=limit,
-        offset=offset,
-        order_by=order_by,
-        order=order,
-    )
+    columns = parse_fields(fields, ApplicationOut)
+    try:
+        page = list_applications(
+            db,
+            status=status,
+            search=search,
+            active_since=active_since,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order_by=order_by,
+            order=order,
+            columns=columns,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    # 响应体保持 {total, items}（兼容），游标 / 总数是否精确跟 /jobs 一样放响应头
+    response.headers["X-Total-Count"] = str(page.total)
+    response.headers["X-Total-Exact"] = "true" if page.total_exact else "false"
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
     return {
-        "total": total,
-        "items": items,
+        "total": page.total,
+        "items": [project(a, columns) for a in page.items],
     }
 
 
-@router.get("/applications/{application_id}", response_model=ApplicationOut)
+@router.get("/applications/export")
+def export_applications_api(
+    format: str = Query(default="csv", pattern=f"^({'|'.join(exporter.FORMATS)})$"),
+    status: str | None = None,
+    since: datetime | None = Query(default=None, description="Only applications updated at or after this time"),
+):
+    """
+    Stream all applications joined with their events (one row per event) as CSV, NDJSON or Parquet.
+    Rows are read through a server-side cursor and sent chunk by chunk.
+    """
+    if format == "parquet" and not exporter.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs pyarrow (pip install pyarrow)")
+
+    filename = f"applications-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        exporter.stream_export(format, status=status, since=since),
+        media_type=exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/applications/{application_id}", response_model=ApplicationDetailOut)
 def get_application_api(
     application_id: int,
     db: Session = Depends(get_db),
 ):
     """
-    Get a single application by ID
+    Get a single application by ID (including the JD text)
     """
     application = get_application(db, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    return application
+    out = ApplicationDetailOut.model_validate(application)
+    out.jd_text = get_jd_text(db, application.jd_hash)
+    return out
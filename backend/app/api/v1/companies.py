@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.crud.company_prefix_index import get_company_prefix_index
 from app.crud.crud_company import suggest_companies
 
 router = APIRouter(tags=["companies"])
@@ -11,7 +12,19 @@ router = APIRouter(tags=["companies"])
 def companies_suggest(
     q: str = Query(..., min_length=1),
     limit: int = Query(default=10, ge=1, le=20),
+    fuzzy: bool = Query(default=True, description="Typo-tolerant trigram matching; false = prefix only"),
     db: Session = Depends(get_db),
 ):
-    rows = suggest_companies(db, q=q, limit=limit)
+    rows = suggest_companies(db, q=q, limit=limit, fuzzy=fuzzy)
     return [{"id": r.id, "name": r.name, "source": r.source} for r in rows]
+
+
+@router.post("/companies/suggest/index/rebuild")
+def rebuild_company_prefix_index(db: Session = Depends(get_db)):
+    """
+    Reload the in-process company prefix index from company_index
+    (e.g. after writes from another process).
+    """
+    index = get_company_prefix_index()
+    index.rebuild(db)
+    return index.stats()
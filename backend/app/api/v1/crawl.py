@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.crud.crud_crawl_board import (
+    create_crawl_board,
+    delete_crawl_board,
+    get_crawl_board,
+    list_crawl_boards,
+    set_crawl_board_enabled,
+    set_crawl_board_next_run,
+)
+from app.schemas.crawl_board import CrawlBoardCreate, CrawlBoardOut
+from app.services.crawl_scheduler import get_crawl_scheduler
+
+router = APIRouter(tags=["crawl"])
+
+
+@router.post("/crawl/boards", response_model=CrawlBoardOut, status_code=201)
+def register_crawl_board(data: CrawlBoardCreate, db: Session = Depends(get_db)):
+    """
+    Register a job board for recurring crawls (linked to a company_index row).
+    New boards are crawled right away, then re-crawled on a popularity-based interval.
+    """
+    board = create_crawl_board(
+        db,
+        company_name=(data.company_name or data.board_token).strip(),
+        source=data.source,
+        board_token=data.board_token,
+        fetch_jd=data.fetch_jd,
+    )
+    # 重新注册一个停用过的 board 会把它重新启用：也要放回调度（有 next_run_at 就按原计划）
+    get_crawl_scheduler().schedule(board.id, board.next_run_at)
+    return board
+
+
+@router.get("/crawl/boards", response_model=list[CrawlBoardOut])
+def list_crawl_boards_api(enabled_only: bool = False, db: Session = Depends(get_db)):
+    return list_crawl_boards(db, enabled_only=enabled_only)
+
+
+@router.post("/crawl/boards/{board_id}/run", response_model=CrawlBoardOut)
+def run_crawl_board_now(board_id: int, db: Session = Depends(get_db)):
+    """Move a board to the front of the schedule."""
+    board = get_crawl_board(db, board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Crawl board not found")
+    board = set_crawl_board_next_run(db, board, datetime.utcnow())
+    get_crawl_scheduler().schedule(board.id)
+    return board
+
+
+@router.post("/crawl/boards/{board_id}/enabled", response_model=CrawlBoardOut)
+def set_crawl_board_enabled_api(board_id: int, enabled: bool, db: Session = Depends(get_db)):
+    board = set_crawl_board_enabled(db, board_id, enabled)
+    if not board:
+        raise HTTPException(status_code=404, detail="Crawl board not found")
+    if enabled:
+        get_crawl_scheduler().schedule(board.id, board.next_run_at)
+    else:
+        get_crawl_scheduler().unschedule(board.id)
+    return board
+
+
+@router.delete("/crawl/boards/{board_id}")
+def delete_crawl_board_api(board_id: int, db: Session = Depends(get_db)):
+    if not delete_crawl_board(db, board_id):
+        raise HTTPException(status_code=404, detail="Crawl board not found")
+    get_crawl_scheduler().unschedule(board_id)
+    return {"ok": True}
+
+
+@router.get("/crawl/scheduler")
+def crawl_scheduler_stats():
+    """Scheduler lag (due -> started) and crawl duration percentiles."""
+    return get_crawl_scheduler().stats()
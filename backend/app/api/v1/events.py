@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.schemas.event import EventCreate, EventOut
+from app.schemas.event import EventBatchCreate, EventBatchOut, EventCreate, EventOut
 from app.crud.crud_application import get_application
-from app.crud.crud_event import add_event, list_events_for_application, delete_event
+from app.crud.crud_event import add_event, add_events_batch, list_events_for_application, delete_event
+from app.crud.pagination import InvalidCursor
 
 router = APIRouter(tags=["events"])
 
@@ -20,18 +21,44 @@ def create_event(application_id: int, data: EventCreate, db: Session = Depends(g
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/events/batch", response_model=EventBatchOut)
+def create_events_batch(data: EventBatchCreate, db: Session = Depends(get_db)):
+    """
+    Record events for many applications in one call (e.g. a calendar sync).
+    Same rules as the single-event endpoint, applied in event_time order;
+    accepted events are committed in one transaction, each item gets its own result.
+    """
+    results = add_events_batch(db, data.events)
+    succeeded = sum(1 for r in results if r["ok"])
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
 @router.get("/applications/{application_id}/events", response_model=list[EventOut])
 def list_events(
     application_id: int,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page (ignores offset)"),
     db: Session = Depends(get_db),
 ):
     app_obj = get_application(db, application_id)
     if not app_obj:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    return list_events_for_application(db, application_id, limit=limit, offset=offset)
+    try:
+        page = list_events_for_application(db, application_id, limit=limit, offset=offset, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.delete("/events/{event_id}")
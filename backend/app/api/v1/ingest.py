@@ -1,49 +1,115 @@
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.ingest.greenhouse import fetch_greenhouse_jobs
-from app.crud.crud_job_posting import upsert_job_posting
-from app.crud.crud_company import upsert_company_index
+from app.crud.crud_ingest_job import create_ingest_job, get_ingest_job
+from app.crud.fingerprint_index import get_fingerprint_index
+from app.ingest.adapters import ADAPTERS
+from app.ingest.ratelimit import get_rate_limiter
+from app.ingest.resilience import get_resilience
+from app.schemas.ingest import IngestBatchCreate
+from app.schemas.ingest_job import IngestJobCreate, IngestJobOut
+from app.services.ingestion import ingest_board, ingest_boards
+from app.services.job_runner import get_job_runner
 
 router = APIRouter(tags=["ingest"])
 
 
-@router.post("/ingest/greenhouse/{board_token}")
-async def ingest_greenhouse(board_token: str, db: Session = Depends(get_db)):
-    try:
-        jobs = await fetch_greenhouse_jobs(board_token)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Greenhouse fetch failed: {e}")
+@router.post("/ingest/batch")
+async def ingest_batch(data: IngestBatchCreate):
+    """
+    Import many job boards concurrently in one call (nightly crawl).
+    Boards share the global concurrency cap and per-host rate limiter.
+    """
+    # 同一个 board 只抓一次
+    boards: dict[tuple[str, str], str] = {}
+    for b in data.boards:
+        token = b.board_token.strip()
+        boards.setdefault((b.source, token), (b.company_name or token).strip())
+
+    results = await ingest_boards(
+        [(source, token, company) for (source, token), company in boards.items()],
+        fetch_jd=data.fetch_jd,
+        incremental=not data.full_refresh,
+    )
+
+    ok = [r for r in results if r["ok"]]
+    return {
+        "boards": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "created": sum(r["created"] for r in ok),
+        "updated": sum(r["updated"] for r in ok),
+        "results": results,
+        "rate_limiter": get_rate_limiter().stats(),
+        "resilience": get_resilience().stats(),
+    }
 
-    created_or_existing = 0
 
-    for j in jobs:
-        # Greenhouse jobs fields (common):
-        # id, title, location: {name}, absolute_url, updated_at
-        title = j.get("title") or ""
-        location = (j.get("location") or {}).get("name")
-        url = j.get("absolute_url")
+@router.get("/ingest/stats")
+def ingest_stats():
+    """Process-wide ingestion counters: rate limiting, retries / circuits, fingerprint set."""
+    return {
+        "rate_limiter": get_rate_limiter().stats(),
+        "resilience": get_resilience().stats(),
+        "fingerprint_index": get_fingerprint_index().stats(),
+    }
 
-        # company_name：Greenhouse API 不一定直接给公司名
-        # MVP：先用 board_token 当 company（或你可传 query 参数 company=xxx）
-        company_name = board_token
 
-        if not title:
-            continue
+@router.post("/ingest/{source}/{board_token}")
+async def ingest_source_board(
+    source: str,
+    board_token: str,
+    company_name: str | None = None,
+    fetch_jd: bool = False,
+    full: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Import one job board (source: greenhouse / lever). Re-runs are incremental
+    (conditional listing request, only changed jobs are written);
+    pass full=true to ignore the stored watermarks.
+    """
+    if source not in ADAPTERS:
+        raise HTTPException(status_code=404, detail=f"Unknown ingestion source: {source}")
 
-        obj = upsert_job_posting(
+    # company_name：公开 board API 不一定直接给公司名
+    # MVP：默认用 board_token 当 company（可传 query 参数 company_name=xxx）
+    try:
+        return await ingest_board(
             db,
-            source="greenhouse",
-            company_name=company_name,
-            role_title=title,
-            location=location,
-            url=url,
-            jd_text=None,  # 列表接口通常没有完整JD，下一步可抓详情页
+            source=source,
+            board_token=board_token,
+            company_name=(company_name or board_token).strip(),
+            fetch_jd=fetch_jd,
+            incremental=not full,
         )
-        created_or_existing += 1
+    except (httpx.HTTPError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"{source} fetch failed: {e}")
+
+
+@router.post("/ingest/jobs", response_model=IngestJobOut, status_code=202)
+def submit_ingest_job(data: IngestJobCreate, db: Session = Depends(get_db)):
+    """
+    Queue an ingestion run in the background and return its id right away.
+    Poll GET /ingest/jobs/{id} for status and counts.
+    """
+    job = create_ingest_job(
+        db,
+        source=data.source,
+        board_token=data.board_token,
+        company_name=data.company_name or data.board_token,
+        fetch_jd=data.fetch_jd,
+        full_refresh=data.full_refresh,
+    )
+    get_job_runner().submit(job.id)
+    return job
 
-        # 反哺公司索引（共用系统）
-        upsert_company_index(db, name=obj.company_name, source="crawler")
 
-    return {"board": board_token, "fetched": len(jobs), "upserted": created_or_existing}
+@router.get("/ingest/jobs/{job_id}", response_model=IngestJobOut)
+def get_ingest_job_api(job_id: int, db: Session = Depends(get_db)):
+    job = get_ingest_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.schemas.job_posting import JobPostingCreate, JobPostingOut
-from app.crud.crud_job_posting import create_job_posting, list_job_postings
+from app.api.fields import parse_fields, project
+from app.schemas.job_posting import JobPostingCreate, JobPostingDetailOut, JobPostingFieldsOut, JobPostingOut
+from app.crud.crud_job_posting import create_job_posting, get_job_posting, list_job_postings
+from app.crud.crud_jd_blob import get_jd_text
 from app.crud.crud_company import upsert_company_index
+from app.crud.fingerprint_index import get_fingerprint_index
+from app.crud.pagination import InvalidCursor
 
 router = APIRouter(tags=["jobs"])
 
@@ -17,12 +21,68 @@ def create_job(data: JobPostingCreate, db: Session = Depends(get_db)):
     return obj
 
 
-@router.get("/jobs", response_model=list[JobPostingOut])
+@router.get("/jobs", response_model=list[JobPostingFieldsOut], response_model_exclude_unset=True)
 def list_jobs(
+    response: Response,
     search: str | None = None,
+    new: bool = Query(default=False, description="Only postings that appeared in the latest crawl of their board"),
+    include_closed: bool = Query(default=False, description="Include postings removed from their board"),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page (ignores offset)"),
+    order_by: str = Query(
+        default="created_at",
+        pattern="^(created_at|relevance)$",
+        description="Newest first, or relevance (with search)",
+    ),
+    fields: str | None = Query(default=None, description="Comma-separated fields to return, e.g. company_name,role_title"),
     db: Session = Depends(get_db),
 ):
-    _, items = list_job_postings(db, search=search, limit=limit, offset=offset)
-    return items
+    """
+    List job postings. Postings removed from their board (closed by a crawl) are left out
+    unless include_closed=true.
+    """
+    columns = parse_fields(fields, JobPostingOut)
+    try:
+        page = list_job_postings(
+            db,
+            search=search,
+            only_new=new,
+            include_closed=include_closed,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order_by=order_by,
+            columns=columns,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 响应体是数组（保持兼容），总数 / 游标放响应头
+    response.headers["X-Total-Count"] = str(page.total)
+    response.headers["X-Total-Exact"] = "true" if page.total_exact else "false"
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [project(j, columns) for j in page.items]
+
+
+@router.get("/jobs/{job_id}", response_model=JobPostingDetailOut)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Single posting including the JD text (decompressed from jd_blobs)."""
+    job = get_job_posting(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job posting not found")
+    out = JobPostingDetailOut.model_validate(job)
+    out.jd_text = get_jd_text(db, job.jd_hash)
+    return out
+
+
+@router.post("/jobs/fingerprint-index/rebuild")
+def rebuild_fingerprint_index(db: Session = Depends(get_db)):
+    """
+    Reload the in-process fingerprint set from job_postings
+    (e.g. after bulk deletes or writes from another process).
+    """
+    index = get_fingerprint_index()
+    index.rebuild(db)
+    return index.stats()
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db
 from app.schemas.metrics import MetricsOverviewOut, MetricsFunnelOut
 from app.crud.crud_metrics import metrics_overview, metrics_time_to_milestones, metrics_by_channel
+from app.crud.counting import get_count_cache
 
 
 router = APIRouter(tags=["metrics"])
@@ -19,4 +20,10 @@ def overview(db: Session = Depends(get_db)):
         **base,
         **timing,
         "channels": channels,
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/metrics/counts")
+def count_cache_stats():
+    """List total-count cache: mode, hit/miss counters and per-table write versions."""
+    return get_count_cache().stats()
@@ -10,4 +10,101 @@ load_dotenv(ENV_PATH)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
-    raise RuntimeError(f"DATABASE_URL is not set. Expected it in {ENV_PATH}")
\ No newline at end of file
+    raise RuntimeError(f"DATABASE_URL is not set. Expected it in {ENV_PATH}")
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# ---- Outbound HTTP (ingestion) ----
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# 需要安装 h2（pip install "httpx[http2]"），否则自动退回 HTTP/1.1
+HTTP2_ENABLED = _env_bool("HTTP2_ENABLED", False)
+
+# ---- Background ingestion ----
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+
+# ---- Ingestion rate limiting (shared by all boards) ----
+# 全局同时在飞的出站请求数
+INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "6"))
+# 每个 host 的令牌桶：每秒补充 rate 个，最多攒 burst 个（rate<=0 关闭）
+INGEST_HOST_RATE = float(os.getenv("INGEST_HOST_RATE", "10"))
+INGEST_HOST_BURST = int(os.getenv("INGEST_HOST_BURST", "20"))
+# 多 board 批量抓取时同时处理几个 board
+INGEST_BOARD_CONCURRENCY = int(os.getenv("INGEST_BOARD_CONCURRENCY", "4"))
+# 抓 JD 时边抓边写：每攒够这么多条写一批（一次 commit），队列最多缓冲 2 批
+INGEST_WRITE_BATCH = int(os.getenv("INGEST_WRITE_BATCH", "100"))
+
+# ---- Ingestion retries / circuit breaker ----
+# 429 / 5xx / 网络错误最多尝试几次（含第一次），退避 = full jitter 指数退避
+INGEST_RETRY_ATTEMPTS = int(os.getenv("INGEST_RETRY_ATTEMPTS", "3"))
+INGEST_RETRY_BASE_DELAY = float(os.getenv("INGEST_RETRY_BASE_DELAY", "0.5"))
+INGEST_RETRY_MAX_DELAY = float(os.getenv("INGEST_RETRY_MAX_DELAY", "10"))
+# Retry-After 超过这个秒数就不等了，直接失败
+INGEST_RETRY_AFTER_MAX = float(os.getenv("INGEST_RETRY_AFTER_MAX", "60"))
+# 同一个 board 连续失败 threshold 次熔断，reset 秒后放一个探测请求
+INGEST_BREAKER_THRESHOLD = int(os.getenv("INGEST_BREAKER_THRESHOLD", "5"))
+INGEST_BREAKER_RESET = float(os.getenv("INGEST_BREAKER_RESET", "30"))
+
+# ---- Fingerprint index ----
+# 进程内 fingerprint 集合：确定不存在的 posting 跳过去重 SELECT（启动时后台加载）
+FINGERPRINT_INDEX_ENABLED = _env_bool("FINGERPRINT_INDEX_ENABLED", True)
+
+# ---- Recurring crawl scheduler (crawl_boards registry) ----
+CRAWL_SCHEDULER_ENABLED = _env_bool("CRAWL_SCHEDULER_ENABLED", False)
+# 基础间隔（秒）：按公司热度 / 最近活跃度缩短，最后夹在 [min, max]
+CRAWL_BASE_INTERVAL = float(os.getenv("CRAWL_BASE_INTERVAL", "21600"))
+CRAWL_MIN_INTERVAL = float(os.getenv("CRAWL_MIN_INTERVAL", "1800"))
+CRAWL_MAX_INTERVAL = float(os.getenv("CRAWL_MAX_INTERVAL", "86400"))
+# 间隔随机抖动比例（±），避免一批 board 同时到期
+CRAWL_JITTER = float(os.getenv("CRAWL_JITTER", "0.1"))
+# 调度器同时抓取的 board 数（全局预算）
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "2"))
+
+# ---- JD storage (jd_blobs) ----
+# zlib（标准库）或 zstd（需要 pip install zstandard，没装自动退回 zlib）
+JD_COMPRESSION = os.getenv("JD_COMPRESSION", "zlib").lower()
+JD_COMPRESSION_LEVEL = int(os.getenv("JD_COMPRESSION_LEVEL", "6"))
+
+# ---- List total counts ----
+# exact：精确 count，按 (表, 过滤条件) 缓存，写入时失效；estimated：没有搜索词的列表用估算
+# （PostgreSQL planner 估算 / SQLite 数到上限），超过 COUNT_ESTIMATE_MIN_ROWS 才生效
+COUNT_MODE = os.getenv("COUNT_MODE", "exact").lower()
+COUNT_ESTIMATE_MIN_ROWS = int(os.getenv("COUNT_ESTIMATE_MIN_ROWS", "100000"))
+# 缓存兜底过期时间（秒）：别的进程的写入这里感知不到
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+
+# ---- Full-text search ----
+# PostgreSQL 的 text search 配置（english 会做词干化）；改了之后需要重建 *_fts 索引
+SEARCH_TS_CONFIG = os.getenv("SEARCH_TS_CONFIG", "english")
+
+# ---- Company suggestions ----
+# 模糊联想的最低 trigram 相似度（同 pg_trgm.similarity_threshold；0.2 能容下 "opneai" 这种字母换位）
+COMPANY_SUGGEST_MIN_SIMILARITY = float(os.getenv("COMPANY_SUGGEST_MIN_SIMILARITY", "0.2"))
+# SQLite 进程内三元组索引：启动时后台加载，之后每隔这么多秒后台重新加载，兜底别的进程写入的公司（<= 0 不刷新）
+COMPANY_TRIGRAM_REFRESH = float(os.getenv("COMPANY_TRIGRAM_REFRESH", "300"))
+# 进程内前缀索引（/companies/suggest 不再每个字查库；启动时后台加载，没加载好之前照旧查库）
+COMPANY_PREFIX_INDEX_ENABLED = _env_bool("COMPANY_PREFIX_INDEX_ENABLED", True)
+
+# ---- Bulk import (applications + events from CSV / NDJSON) ----
+# 每批多少行一个事务
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+# 报告里最多保留多少条行级错误（总数照样统计）
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# ---- Export (streamed CSV / NDJSON / Parquet) ----
+# 每次从数据库游标拉多少行（= 每次往外发的一块；Parquet 一个 row group）
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+
+# ---- Ingestion sources（可指向本地 stub server 做测试 / 压测）----
+GREENHOUSE_API_BASE = os.getenv("GREENHOUSE_API_BASE", "https://boards-api.greenhouse.io/v1/boards")
+LEVER_API_BASE = os.getenv("LEVER_API_BASE", "https://api.lever.co/v0/postings")
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.company_index import CompanyIndex
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH = 10_000
+# 每个前缀预先算好的候选数（= /companies/suggest 的 limit 上限）
+TOP_K = 20
+# 这个长度以内的前缀存 top-K（命中的公司多，现排太慢）；更长的前缀在有序数组里 bisect 出范围再排
+TOP_PREFIX_LEN = 4
+
+_KEY_END = "\U0010ffff"
+
+
+@dataclass
+class PrefixEntry:
+    name: str
+    source: str
+    search_key: str
+    popularity: int
+    last_seen_at: datetime | None
+
+    @property
+    def rank(self) -> tuple:
+        # 和原来的 SQL 一样：ORDER BY popularity DESC, last_seen_at DESC
+        return self.popularity, self.last_seen_at or datetime.min
+
+
+def _keys(normalized_name: str, search_key: str) -> set[str]:
+    # normalized_name 和去掉空格标点的 search_key 都能前缀命中（"open a" / "opena"）
+    return {k for k in (normalized_name, search_key) if k}
+
+
+class CompanyPrefixIndex:
+    """
+    进程内的公司名前缀索引（/companies/suggest 每敲一个字一次请求，不再每次 LIKE + ORDER BY 查库）。
+
+    - 短前缀（<= TOP_PREFIX_LEN）：dict 前缀 -> 按 (popularity, last_seen_at) 排好的 top-K id
+    - 长前缀：(key, id) 有序数组 bisect 出范围（已经很窄）再取 top-K
+
+    启动时后台加载，upsert_company_index 时增量更新（popularity / last_seen_at 只增不减，
+    所以 top-K 只需要往里插、不会有被挤出去的又该回来）。没加载好之前 lookup() 返回 None，调用方查库。
+    多进程部署时别的进程写入的公司看不到，可以 POST /companies/suggest/index/rebuild
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, PrefixEntry] = {}
+        self._sorted: list[tuple[str, int]] = []
+        self._top: dict[str, list[int]] = {}
+        self._loaded = False
+        self._loading = False
+        self._upserted_while_loading: dict[int, tuple[str, PrefixEntry]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.unknown = 0
+        self.load_seconds: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """全量（重新）加载；加载期间的 upsert() 不会丢"""
+        started = time.perf_counter()
+        with self._lock:
+            self._loading = True
+            self._upserted_while_loading = {}
+
+        entries: dict[int, PrefixEntry] = {}
+        sorted_keys: list[tuple[str, int]] = []
+        candidates: dict[str, set[int]] = {}
+        try:
+            rows = db.execute(
+                select(
+                    CompanyIndex.id,
+                    CompanyIndex.name,
+                    CompanyIndex.normalized_name,
+                    CompanyIndex.search_key,
+                    CompanyIndex.source,
+                    CompanyIndex.popularity,
+                    CompanyIndex.last_seen_at,
+                ).execution_options(yield_per=LOAD_BATCH)
+            )
+            for company_id, name, norm, search_key, source, popularity, last_seen_at in rows:
+                entries[company_id] = PrefixEntry(name, source, search_key, popularity, last_seen_at)
+                for key in _keys(norm, search_key):
+                    sorted_keys.append((key, company_id))
+                    for n in range(1, min(len(key), TOP_PREFIX_LEN) + 1):
+                        candidates.setdefault(key[:n], set()).add(company_id)
+        except Exception:
+            with self._lock:
+                self._loading = False
+            raise
+
+        sorted_keys.sort()
+        top = {
+            prefix: heapq.nlargest(TOP_K, ids, key=lambda i: entries[i].rank)
+            for prefix, ids in candidates.items()
+        }
+
+        with self._lock:
+            self._entries, self._sorted, self._top = entries, sorted_keys, top
+            for company_id, (norm, entry) in self._upserted_while_loading.items():
+                self._apply(company_id, norm, entry)
+            self._upserted_while_loading = {}
+            self._loading = False
+            self._loaded = True
+
+        self.load_seconds = round(time.perf_counter() - started, 3)
+        return len(entries)
+
+    def rebuild(self, db: Session) -> int:
+        return self.load(db)
+
+    def _apply(self, company_id: int, normalized_name: str, entry: PrefixEntry) -> None:
+        # 调用方持有 self._lock
+        is_new = company_id not in self._entries
+        self._entries[company_id] = entry
+        for key in _keys(normalized_name, entry.search_key):
+            if is_new:
+                insort(self._sorted, (key, company_id))
+            for n in range(1, min(len(key), TOP_PREFIX_LEN) + 1):
+                ids = self._top.setdefault(key[:n], [])
+                if company_id not in ids:
+                    if len(ids) >= TOP_K and entry.rank <= self._entries[ids[-1]].rank:
+                        continue
+                    ids.append(company_id)
+                ids.sort(key=lambda i: self._entries[i].rank, reverse=True)
+                del ids[TOP_K:]
+
+    def upsert(self, obj: CompanyIndex) -> None:
+        """upsert_company_index 提交后调用"""
+        entry = PrefixEntry(obj.name, obj.source, obj.search_key, obj.popularity, obj.last_seen_at)
+        with self._lock:
+            if self._loading:
+                self._upserted_while_loading[obj.id] = (obj.normalized_name, entry)
+            if self._loaded:
+                self._apply(obj.id, obj.normalized_name, entry)
+
+    def lookup(self, prefix: str, *, limit: int = TOP_K) -> list[tuple[int, PrefixEntry]] | None:
+        """前缀命中的公司，热度 / 最近出现高的在前；None = 还没加载，需要查库"""
+        if not self._loaded:
+            self.unknown += 1
+            return None
+        self.hits += 1
+        if not prefix:
+            return []
+        with self._lock:
+            if len(prefix) <= TOP_PREFIX_LEN:
+                ids = self._top.get(prefix, [])[:limit]
+            else:
+                lo = bisect_left(self._sorted, (prefix,))
+                hi = bisect_left(self._sorted, (prefix + _KEY_END,))
+                ids = heapq.nlargest(
+                    limit, {i for _, i in self._sorted[lo:hi]}, key=lambda i: self._entries[i].rank
+                )
+            return [(i, self._entries[i]) for i in ids]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "companies": len(self._entries),
+            "keys": len(self._sorted),
+            "prefixes": len(self._top),
+            "hits": self.hits,
+            "unknown": self.unknown,
+            "load_seconds": self.load_seconds,
+        }
+
+
+_index = CompanyPrefixIndex()
+
+
+def get_company_prefix_index() -> CompanyPrefixIndex:
+    return _index
+
+
+def load_company_prefix_index() -> int | None:
+    """启动时在后台线程里调用；DB 不可用时只记日志（索引保持未加载，照旧查库）"""
+    db = SessionLocal()
+    try:
+        return _index.load(db)
+    except SQLAlchemyError:
+        logger.exception("failed to load company prefix index")
+        return None
+    finally:
+        db.close()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import COMPANY_TRIGRAM_REFRESH
+from app.core.database import SessionLocal
+from app.models.company_index import CompanyIndex
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH = 10_000
+
+
+def trigrams(key: str) -> set[str]:
+    # 和 pg_trgm 一样：前面补两个空格、后面补一个（开头的字符权重更高）
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    # 同 pg_trgm similarity()：共享 trigram / 并集
+    ga, gb = trigrams(a), trigrams(b)
+    return len(ga & gb) / len(ga | gb) if ga or gb else 0.0
+
+
+@dataclass
+class _Entry:
+    name: str
+    source: str
+    key: str
+    n_trigrams: int
+    popularity: int
+    last_seen_at: datetime
+
+
+class CompanyTrigramIndex:
+    """
+    进程内的 company_index 三元组倒排索引（SQLite 上代替 pg_trgm）：
+    trigram -> company id 数组；查询时数共享 trigram 个数，算 Jaccard 相似度（同 pg_trgm similarity）。
+
+    启动时后台加载，upsert_company_index 时增量更新；别的进程写入的公司靠后台
+    每 COMPANY_TRIGRAM_REFRESH 秒重新加载兜底（都不在请求路径上）。
+    没加载好之前 search() 返回 None，调用方只用前缀命中
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _Entry] = {}
+        self._postings: dict[str, array] = {}
+        self._loaded = False
+        self._loading = False
+        self._upserted_while_loading: dict[int, _Entry] = {}
+        self._lock = threading.Lock()
+        self.load_seconds: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """全量（重新）加载；加载期间的 upsert() 不会丢，旧索引在换上新的之前照常可查"""
+        started = time.perf_counter()
+        with self._lock:
+            self._loading = True
+            self._upserted_while_loading = {}
+
+        entries: dict[int, _Entry] = {}
+        postings: dict[str, array] = {}
+        try:
+            rows = db.execute(
+                select(
+                    CompanyIndex.id,
+                    CompanyIndex.name,
+                    CompanyIndex.source,
+                    CompanyIndex.search_key,
+                    CompanyIndex.popularity,
+                    CompanyIndex.last_seen_at,
+                ).execution_options(yield_per=LOAD_BATCH)
+            )
+            for company_id, name, source, key, popularity, last_seen_at in rows:
+                grams = trigrams(key)
+                entries[company_id] = _Entry(name, source, key, len(grams), popularity, last_seen_at)
+                for g in grams:
+                    postings.setdefault(g, array("i")).append(company_id)
+        except Exception:
+            with self._lock:
+                self._loading = False
+            raise
+
+        with self._lock:
+            self._entries, self._postings = entries, postings
+            for company_id, entry in self._upserted_while_loading.items():
+                self._apply(company_id, entry)
+            self._upserted_while_loading = {}
+            self._loading = False
+            self._loaded = True
+        self.load_seconds = round(time.perf_counter() - started, 3)
+        return len(entries)
+
+    def _apply(self, company_id: int, entry: _Entry) -> None:
+        # 调用方持有 self._lock
+        old = self._entries.get(company_id)
+        if old is not None:
+            # search_key 由 normalized_name 决定，不会变；只更新展示名和排序用的字段
+            old.name, old.source = entry.name, entry.source
+            old.popularity, old.last_seen_at = entry.popularity, entry.last_seen_at
+            return
+        self._entries[company_id] = entry
+        for g in trigrams(entry.key):
+            self._postings.setdefault(g, array("i")).append(company_id)
+
+    def upsert(self, obj: CompanyIndex) -> None:
+        """upsert_company_index 提交后调用"""
+        entry = _Entry(
+            obj.name, obj.source, obj.search_key, len(trigrams(obj.search_key)), obj.popularity, obj.last_seen_at
+        )
+        with self._lock:
+            if self._loading:
+                self._upserted_while_loading[obj.id] = entry
+            if self._loaded:
+                self._apply(obj.id, entry)
+
+    def search(self, key: str, *, min_similarity: float, limit: int) -> list[tuple[int, _Entry, float]] | None:
+        """
+        返回相似度 >= min_similarity 的前 limit 个 (id, entry, similarity)，相似度高的在前；
+        None = 还没加载
+        """
+        if not self._loaded:
+            return None
+        grams = trigrams(key)
+        shared: Counter[int] = Counter()
+        with self._lock:
+            for g in grams:
+                ids = self._postings.get(g)
+                if ids:
+                    shared.update(ids)
+            hits = []
+            for company_id, n in shared.items():
+                entry = self._entries[company_id]
+                similarity = n / (len(grams) + entry.n_trigrams - n)
+                if similarity >= min_similarity:
+                    hits.append((company_id, entry, similarity))
+        hits.sort(key=lambda h: h[2], reverse=True)
+        return hits[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "companies": len(self._entries),
+            "trigrams": len(self._postings),
+            "load_seconds": self.load_seconds,
+        }
+
+
+_index = CompanyTrigramIndex()
+
+
+def get_company_trigram_index() -> CompanyTrigramIndex:
+    return _index
+
+
+def load_company_trigram_index() -> int | None:
+    """在后台线程里调用；DB 不可用时只记日志（没加载好就只有前缀命中，加载过的保留旧索引）"""
+    db = SessionLocal()
+    try:
+        return _index.load(db)
+    except SQLAlchemyError:
+        logger.exception("failed to load company trigram index")
+        return None
+    finally:
+        db.close()
+
+
+async def run_company_trigram_refresher(interval: float = COMPANY_TRIGRAM_REFRESH) -> None:
+    """启动时加载，之后每 interval 秒在线程里重新加载（interval <= 0 只加载一次）"""
+    while True:
+        await asyncio.to_thread(load_company_trigram_index)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import COUNT_CACHE_SIZE, COUNT_CACHE_TTL, COUNT_ESTIMATE_MIN_ROWS, COUNT_MODE
+
+
+class CountCache:
+    """
+    列表总数的计数层：
+    - exact：按 (表, 过滤条件) 缓存 count(*)；crud 的写路径 bump(表) 递增写版本号，版本变了缓存即失效。
+      版本号是进程内的，别的进程 / 直接改库的写入靠 TTL 兜底
+    - estimated（COUNT_MODE=estimated 且调用方允许，一般是没有搜索词的列表）：
+      PostgreSQL 用 EXPLAIN 的 planner 行数估算，SQLite 数到上限为止（capped count）；
+      结果不大时照样给精确值
+
+    count() 返回 (total, exact)
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, maxsize: int = COUNT_CACHE_SIZE) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._versions: dict[str, int] = {}
+        # (table, mode, key) -> (version, expires_at, total, exact)
+        self._cache: OrderedDict[tuple, tuple[int, float, int, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.estimates = 0
+
+    def bump(self, *tables: str) -> None:
+        """写路径调用：表内容（或过滤条件涉及的列）变了"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def count(
+        self,
+        db: Session,
+        q: Query,
+        *,
+        table: str,
+        key: tuple[Hashable, ...] = (),
+        estimate: bool = True,
+    ) -> tuple[int, bool]:
+        """
+        key：过滤条件（缓存键的一部分）
+        estimate：允许估算（ilike 搜索这类估不准的查询传 False）
+        """
+        mode = COUNT_MODE if estimate else "exact"
+        cache_key = (table, mode, key)
+        now = time.monotonic()
+        with self._lock:
+            version = self._versions.get(table, 0)
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] == version and cached[1] > now:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return cached[2], cached[3]
+            self.misses += 1
+
+        # 版本号在查询前取：查询期间有写入的话，存进去的就是旧版本，下次自然重算
+        total, exact = None, True
+        if mode == "estimated":
+            total, exact = self._estimate(db, q)
+        if total is None:
+            total, exact = q.count(), True
+
+        with self._lock:
+            self._cache[cache_key] = (version, now + self.ttl, total, exact)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return total, exact
+
+    def _estimate(self, db: Session, q: Query) -> tuple[int | None, bool]:
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            compiled = q.statement.compile(dialect=db.bind.dialect)
+            plan = db.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            # 小结果集不值得估算（而且 planner 对小表估得也不准）
+            if estimate < COUNT_ESTIMATE_MIN_ROWS:
+                return None, True
+            self.estimates += 1
+            return estimate, False
+
+        if dialect == "sqlite":
+            # 最多数 cap + 1 行：超过上限就只说“至少 cap 行”
+            cap = COUNT_ESTIMATE_MIN_ROWS
+            limited = (
+                q.statement.with_only_columns(literal_column("1"), maintain_column_froms=True)
+                .order_by(None)
+                .limit(cap + 1)
+                .subquery()
+            )
+            n = db.execute(select(func.count()).select_from(limited)).scalar_one()
+            if n > cap:
+                self.estimates += 1
+                return cap, False
+            return n, True
+
+        return None, True
+
+    def stats(self) -> dict:
+        return {
+            "mode": COUNT_MODE,
+            "ttl_seconds": self.ttl,
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "estimates": self.estimates,
+            "versions": dict(self._versions),
+        }
+
+
+_counts = CountCache()
+
+
+def get_count_cache() -> CountCache:
+    return _counts
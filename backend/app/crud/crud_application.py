@@ -1,15 +1,36 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, or_
-
-from app.models.application import Application
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import or_, select
+
+from app.crud.counting import get_count_cache
+from app.crud import search_index
+from app.crud.crud_jd_blob import get_jd_text, get_jd_texts, put_jd_blob
+from app.crud.pagination import Page, paginate
+from app.models.application import Application, last_activity_at
+from app.models.event import Event
 from app.schemas.application import ApplicationCreate
 
 
-def create_application(db: Session, data: ApplicationCreate) -> Application:
+def _utc_naive(value: datetime) -> datetime:
+    # 库里都是 utcnow() 的 naive UTC；带时区的先转过来（混着比较大小会报错）
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def create_application(db: Session, data: ApplicationCreate, *, jd_hash: str | None = None) -> Application:
     """
     Create a new job application
+
+    JD 正文存进 jd_blobs，这里只存引用；
+    jd_hash：直接引用已有的 JD（比如从 Job Inbox 转过来的），不用再传正文
     """
     payload = data.model_dump()
+    jd_text = payload.pop("jd_text", None)
+    payload["jd_hash"] = jd_hash or put_jd_blob(db, jd_text)
 
     # Ensure defaults (in case schema doesn't include these fields)
     payload.setdefault("status", "active")
@@ -17,7 +38,10 @@ def create_application(db: Session, data: ApplicationCreate) -> Application:
 
     obj = Application(**payload)
     db.add(obj)
+    db.flush()
+    index_application(db, obj, jd_text=jd_text)
     db.commit()
+    get_count_cache().bump("applications")
     db.refresh(obj)
     return obj
 
@@ -26,9 +50,66 @@ def delete_application(db: Session, application_id: int) -> bool:
     if not obj:
         return False
     db.delete(obj)
+    search_index.remove_docs(db, "applications", [application_id])
     db.commit()
+    get_count_cache().bump("applications")
     return True
 
+def index_application(db: Session, obj: Application, *, jd_text: str | None = None) -> None:
+    """
+    （重新）写入全文索引：公司 + 职位、地点、JD + 全部事件备注。不 commit。
+    jd_text 不传就从 jd_blobs 里取
+    """
+    if jd_text is None:
+        jd_text = get_jd_text(db, obj.jd_hash)
+    notes = db.execute(
+        select(Event.notes)
+        .where(Event.application_id == obj.id, Event.notes.isnot(None))
+        .order_by(Event.event_time)
+    ).scalars()
+    search_index.index_docs(
+        db,
+        "applications",
+        [
+            search_index.SearchDoc(
+                id=obj.id,
+                title=search_index.title_of(obj.company_name, obj.role_title),
+                location=obj.location,
+                body="\n".join([jd_text or "", *notes]),
+            )
+        ],
+    )
+
+
+def index_applications(db: Session, objs: Iterable[Application]) -> None:
+    """批量版 index_application：JD 和事件备注各查一次（不是每个 application 各查一次）。不 commit"""
+    objs = list(objs)
+    if not objs:
+        return
+    jd_texts = get_jd_texts(db, (o.jd_hash for o in objs))
+    notes: dict[int, list[str]] = defaultdict(list)
+    rows = db.execute(
+        select(Event.application_id, Event.notes)
+        .where(Event.application_id.in_([o.id for o in objs]), Event.notes.isnot(None))
+        .order_by(Event.application_id, Event.event_time)
+    )
+    for application_id, note in rows:
+        notes[application_id].append(note)
+    search_index.index_docs(
+        db,
+        "applications",
+        [
+            search_index.SearchDoc(
+                id=o.id,
+                title=search_index.title_of(o.company_name, o.role_title),
+                location=o.location,
+                body="\n".join([jd_texts.get(o.jd_hash) or "", *notes[o.id]]),
+            )
+            for o in objs
+        ],
+    )
+
+
 def get_application(db: Session, application_id: int) -> Application | None:
     """
     Get a single application by ID
@@ -41,18 +122,36 @@ def list_applications(
     *,
     status: str | None = None,
     search: str | None = None,
+    active_since: datetime | None = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
     order_by: str = "created_at",
     order: str = "desc",
-) -> tuple[int, list[Application]]:
+    columns: Iterable[str] | None = None,
+) -> Page[Application]:
+    """
+    search：走全文索引（公司 / 职位 / 地点 / JD / 事件备注），不支持的数据库退回 ilike
+    order_by="relevance"：有 search 时按相关度排序（没有 search 时按 created_at）
+    order_by="last_activity_at" / active_since：按最近活动（最近一条事件的时间，没有事件 = 创建时间）
+    排序 / 筛选，走 ix_applications_last_activity_id
+    cursor：上一页返回的 next_cursor（keyset 分页，给了就忽略 offset）
+    columns：只 SELECT 这些列（load_only），其余列访问时直接报错而不是逐行懒加载；
+    None = 整行
+    """
     q = db.query(Application)
+    search = search.strip() if search else None
 
     if status:
         q = q.filter(Application.status == status)
-
-    if search:
-        pattern = f"%{search.strip()}%"
+    if active_since:
+        q = q.filter(last_activity_at >= _utc_naive(active_since))
+
+    hits = search_index.match(db, "applications", search) if search else None
+    if hits is not None:
+        q = q.join(hits, hits.c.id == Application.id)
+    elif search:
+        pattern = f"%{search}%"
         q = q.filter(
             or_(
                 Application.company_name.ilike(pattern),
@@ -60,24 +159,40 @@ def list_applications(
             )
         )
 
-    total = q.count()
+    total, total_exact = get_count_cache().count(
+        db, q, table="applications", key=(status, search, active_since), estimate=not search
+    )
 
     allowed_order_fields = {
         "created_at": Application.created_at,
         "updated_at": Application.updated_at,
         "company_name": Application.company_name,
         "role_title": Application.role_title,
+        "last_activity_at": last_activity_at.label("last_activity_at"),
     }
 
-    order_column = allowed_order_fields.get(order_by, Application.created_at)
-
-    if order.lower() == "asc":
-        q = q.order_by(asc(order_column))
+    relevance = hits is not None and order_by == "relevance"
+    if relevance:
+        order_column = hits.c.rank
     else:
-        q = q.order_by(desc(order_column))
-
-    items = q.offset(offset).limit(limit).all()
-    return total, items
+        order_column = allowed_order_fields.get(order_by, Application.created_at)
+
+    if columns is not None:
+        # 排序列要用来生成 next_cursor（rank / 表达式由 paginate 额外 SELECT）
+        if order_column.key in Application.__table__.c:
+            columns = {*columns, order_column.key}
+        q = q.options(load_only(*(getattr(Application, c) for c in columns), raiseload=True))
+
+    items, next_cursor = paginate(
+        q,
+        order_column,
+        Application.id,
+        descending=order.lower() != "asc",
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    return Page(items=items, total=total, total_exact=total_exact, next_cursor=next_cursor)
 
 def update_application_status(db: Session, application_id: int, status: str) -> Application | None:
     obj = db.query(Application).filter(Application.id == application_id).first()
@@ -85,5 +200,7 @@ def update_application_status(db: Session, application_id: int, status: str) ->
         return None
     obj.status = status
     db.commit()
+    # status 是列表的过滤条件
+    get_count_cache().bump("applications")
     db.refresh(obj)
     return obj
\ No newline at end of file
@@ -1,19 +1,54 @@
 from __future__ import annotations
 
+import math
+import re
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import desc, func, or_, select
 
+from app.core.config import COMPANY_SUGGEST_MIN_SIMILARITY
+from app.crud.company_prefix_index import TOP_K as PREFIX_TOP_K, get_company_prefix_index
+from app.crud.company_trigram_index import get_company_trigram_index, similarity as trigram_similarity
 from app.models.company_index import CompanyIndex
 
+# 模糊联想排序：相似度为主，热度 / 最近出现为辅（各项都归一到 0~1）
+SIMILARITY_WEIGHT = 0.7
+POPULARITY_WEIGHT = 0.2
+RECENCY_WEIGHT = 0.1
+# popularity 到这个数就算满分（log 缩放）
+POPULARITY_SATURATION = 100
+RECENCY_HALF_LIFE_DAYS = 30
+# 前缀命中的至少按这个相似度算（"ope" 和 "openai" 的 trigram 相似度很低，但显然该排前面）
+PREFIX_SIMILARITY = 0.9
+# trigram 先按相似度取这么多候选，再按综合分排序
+SUGGEST_CANDIDATES = 50
+
+_NON_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+# 前缀范围查询的上界：search_key >= key AND search_key < key + _KEY_END
+_KEY_END = "\U0010ffff"
+
+
+@dataclass
+class CompanySuggestion:
+    id: int
+    name: str
+    source: str
+    score: float
+
 
 def normalize_company_name(name: str) -> str:
     # 最小可用版：trim + lower + 压缩空格
     return " ".join(name.strip().lower().split())
 
 
+def company_search_key(normalized_name: str) -> str:
+    # 模糊匹配去掉空格 / 标点："open ai, inc." -> "openaiinc"，这样 "openai" 也能命中
+    return _NON_ALNUM.sub("", normalized_name)
+
+
 def upsert_company_index(
     db: Session,
     *,
@@ -47,11 +82,14 @@ def upsert_company_index(
         db.add(obj)
         db.commit()
         db.refresh(obj)
+        get_company_trigram_index().upsert(obj)
+        get_company_prefix_index().upsert(obj)
         return obj
 
     obj = CompanyIndex(
         name=name.strip(),
         normalized_name=norm,
+        search_key=company_search_key(norm),
         source=source,
         popularity=1,
         last_seen_at=datetime.utcnow(),
@@ -59,21 +97,126 @@ def upsert_company_index(
     db.add(obj)
     db.commit()
     db.refresh(obj)
+    get_company_trigram_index().upsert(obj)
+    get_company_prefix_index().upsert(obj)
     return obj
 
 
-def suggest_companies(db: Session, *, q: str, limit: int = 10) -> List[CompanyIndex]:
+def _score(similarity: float, popularity: int, last_seen_at: datetime | None, now: datetime) -> float:
+    pop = min(1.0, math.log1p(max(0, popularity)) / math.log1p(POPULARITY_SATURATION))
+    recency = 0.0
+    if last_seen_at:
+        age_days = max(0.0, (now - last_seen_at).total_seconds() / 86400)
+        recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+    return SIMILARITY_WEIGHT * similarity + POPULARITY_WEIGHT * pop + RECENCY_WEIGHT * recency
+
+
+def _prefix_candidates(db: Session, prefix: str, *, limit: int) -> list[tuple]:
+    """
+    前缀命中 (id, name, source, popularity, last_seen_at, search_key)，按热度 / 最近出现排序：
+    先查进程内前缀索引，索引还没加载好才查库（search_key 前缀走索引）
+    """
+    hits = get_company_prefix_index().lookup(prefix, limit=limit)
+    if hits is not None:
+        return [(i, e.name, e.source, e.popularity, e.last_seen_at, e.search_key) for i, e in hits]
+
+    stmt = select(
+        CompanyIndex.id,
+        CompanyIndex.name,
+        CompanyIndex.source,
+        CompanyIndex.popularity,
+        CompanyIndex.last_seen_at,
+        CompanyIndex.search_key,
+    )
+    # normalized_name 以 prefix 开头 => search_key 以 company_search_key(prefix) 开头：
+    # 先用 search_key 的前缀缩小范围（走索引），再精确过滤
+    key = company_search_key(prefix)
+    if key:
+        if db.bind.dialect.name == "postgresql":
+            # pg_trgm 的 GIN 索引支持 LIKE 前缀；btree 范围在非 C collation 下不可靠
+            stmt = stmt.where(CompanyIndex.search_key.like(f"{key}%"))
+        else:
+            # SQLite 的 LIKE 不区分大小写、用不上普通索引；改成范围查询
+            stmt = stmt.where(CompanyIndex.search_key >= key, CompanyIndex.search_key < key + _KEY_END)
+    if key != prefix:
+        stmt = stmt.where(
+            or_(CompanyIndex.normalized_name.like(f"{prefix}%"), CompanyIndex.search_key.like(f"{prefix}%"))
+        )
+    return db.execute(
+        stmt.order_by(desc(CompanyIndex.popularity), desc(CompanyIndex.last_seen_at)).limit(limit)
+    ).all()
+
+
+def _fuzzy_candidates_pg(db: Session, key: str) -> list[tuple]:
+    """pg_trgm：search_key % key 走 GIN 索引"""
+    db.execute(
+        select(func.set_config("pg_trgm.similarity_threshold", str(COMPANY_SUGGEST_MIN_SIMILARITY), True))
+    )
+    similarity = func.similarity(CompanyIndex.search_key, key)
+    return db.execute(
+        select(
+            CompanyIndex.id,
+            CompanyIndex.name,
+            CompanyIndex.source,
+            CompanyIndex.popularity,
+            CompanyIndex.last_seen_at,
+            similarity,
+        )
+        .where(CompanyIndex.search_key.op("%")(key))
+        .order_by(similarity.desc())
+        .limit(SUGGEST_CANDIDATES)
+    ).all()
+
+
+def _fuzzy_candidates_memory(key: str) -> list[tuple]:
+    """SQLite：进程内三元组索引（同样的相似度定义）；索引还没加载好就没有模糊候选，只用前缀命中"""
+    hits = get_company_trigram_index().search(
+        key, min_similarity=COMPANY_SUGGEST_MIN_SIMILARITY, limit=SUGGEST_CANDIDATES
+    )
+    return [(company_id, e.name, e.source, e.popularity, e.last_seen_at, sim) for company_id, e, sim in hits or []]
+
+
+def suggest_companies(
+    db: Session,
+    *,
+    q: str,
+    limit: int = 10,
+    fuzzy: bool = True,
+) -> List[CompanySuggestion]:
+    """
+    fuzzy=True：前缀命中 + trigram 相似度（容错 / 忽略空格标点），按 相似度 + 热度 + 最近出现 综合排序；
+      前缀命中已经够 limit 个时直接从内存返回，不再做 trigram 匹配
+    fuzzy=False：只做前缀匹配（带不带空格标点都行），按热度排序
+    """
     qn = normalize_company_name(q)
     if not qn:
         return []
 
-    # 兼容 SQLite：用 lower(name) like
-    # 用 normalized_name prefix 匹配最快
-    rows = (
-        db.query(CompanyIndex)
-        .filter(CompanyIndex.normalized_name.like(f"{qn}%"))
-        .order_by(desc(CompanyIndex.popularity), desc(CompanyIndex.last_seen_at))
-        .limit(limit)
-        .all()
+    key = company_search_key(qn)
+    dialect = db.bind.dialect.name
+    if not (fuzzy and key and dialect in ("postgresql", "sqlite")):
+        rows = _prefix_candidates(db, qn, limit=limit)
+        return [CompanySuggestion(id=r[0], name=r[1], source=r[2], score=0.0) for r in rows]
+
+    prefix_rows = _prefix_candidates(db, key, limit=max(limit, PREFIX_TOP_K))
+    hits = {}
+    if len(prefix_rows) < limit and len(key) >= 3:
+        if dialect == "postgresql":
+            candidates = _fuzzy_candidates_pg(db, key)
+        else:
+            candidates = _fuzzy_candidates_memory(key)
+        hits = {r[0]: tuple(r) for r in candidates}
+    for company_id, name, source, popularity, last_seen_at, search_key in prefix_rows:
+        sim = max(PREFIX_SIMILARITY, trigram_similarity(key, search_key))
+        hits[company_id] = (company_id, name, source, popularity, last_seen_at, sim)
+
+    now = datetime.utcnow()
+    ranked = sorted(
+        (
+            CompanySuggestion(id=i, name=name, source=source, score=_score(sim, popularity, last_seen_at, now))
+            for i, name, source, popularity, last_seen_at, sim in hits.values()
+        ),
+        key=lambda s: s.score,
+        reverse=True,
     )
-    return rows
+    return ranked[:limit]
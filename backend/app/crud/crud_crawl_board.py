@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.crud.crud_company import normalize_company_name, upsert_company_index
+from app.models.company_index import CompanyIndex
+from app.models.crawl_board import CrawlBoard
+
+
+def create_crawl_board(
+    db: Session,
+    *,
+    company_name: str,
+    source: str,
+    board_token: str,
+    fetch_jd: bool = True,
+) -> CrawlBoard:
+    """
+    注册一个定时抓取的 board；公司不在 company_index 里就新建（source=crawler）。
+    同一个 (source, board_token) 已存在时返回原记录（重新启用）。
+    """
+    board_token = board_token.strip()
+    existing = (
+        db.query(CrawlBoard)
+        .filter(CrawlBoard.source == source, CrawlBoard.board_token == board_token)
+        .first()
+    )
+    if existing:
+        if not existing.enabled:
+            existing.enabled = True
+            db.commit()
+            db.refresh(existing)
+        return existing
+
+    company = (
+        db.query(CompanyIndex)
+        .filter(CompanyIndex.normalized_name == normalize_company_name(company_name))
+        .first()
+    )
+    if company is None:
+        company = upsert_company_index(db, name=company_name, source="crawler")
+
+    obj = CrawlBoard(
+        company_id=company.id,
+        source=source,
+        board_token=board_token,
+        fetch_jd=fetch_jd,
+        enabled=True,
+    )
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def get_crawl_board(db: Session, board_id: int) -> CrawlBoard | None:
+    return (
+        db.query(CrawlBoard)
+        .options(joinedload(CrawlBoard.company))
+        .filter(CrawlBoard.id == board_id)
+        .first()
+    )
+
+
+def list_crawl_boards(db: Session, *, enabled_only: bool = False) -> list[CrawlBoard]:
+    q = db.query(CrawlBoard).options(joinedload(CrawlBoard.company))
+    if enabled_only:
+        q = q.filter(CrawlBoard.enabled.is_(True))
+    return q.order_by(CrawlBoard.next_run_at.asc(), CrawlBoard.id.asc()).all()
+
+
+def set_crawl_board_enabled(db: Session, board_id: int, enabled: bool) -> CrawlBoard | None:
+    obj = get_crawl_board(db, board_id)
+    if not obj:
+        return None
+    obj.enabled = enabled
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def delete_crawl_board(db: Session, board_id: int) -> bool:
+    obj = db.query(CrawlBoard).filter(CrawlBoard.id == board_id).first()
+    if not obj:
+        return False
+    db.delete(obj)
+    db.commit()
+    return True
+
+
+def set_crawl_board_next_run(db: Session, board: CrawlBoard, next_run_at: datetime) -> CrawlBoard:
+    board.next_run_at = next_run_at
+    db.commit()
+    db.refresh(board)
+    return board
+
+
+def record_crawl_board_run(
+    db: Session,
+    board: CrawlBoard,
+    *,
+    ok: bool,
+    error: str | None,
+    duration_ms: int,
+    next_run_at: datetime,
+) -> CrawlBoard:
+    board.last_run_at = datetime.utcnow()
+    board.last_status = "ok" if ok else "failed"
+    board.last_error = None if ok else (error or "")[:2000]
+    board.last_duration_ms = duration_ms
+    board.consecutive_failures = 0 if ok else board.consecutive_failures + 1
+    board.next_run_at = next_run_at
+    db.commit()
+    db.refresh(board)
+    return board
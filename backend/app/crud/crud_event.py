@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, Iterable, List, Sequence
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import desc, func, insert, select, update
 from sqlalchemy.orm import Session
 
+from app.crud.counting import get_count_cache
+from app.crud.crud_application import _utc_naive, index_application, index_applications
+from app.crud.pagination import Page, paginate
 from app.models.application import Application
 from app.models.event import Event
-from app.schemas.event import EventCreate
+from app.schemas.event import EventBatchItem, EventCreate
 
 FINAL_STATUSES = {"rejected", "offer", "closed"}
 
+# 防连点：同一个 application 同一种事件，距上一次不到这么多秒就拒绝
+DUPLICATE_EVENT_SECONDS = 20
+
 # 你可以按需扩展 interview_3 等
 KNOWN_EVENT_TYPES = {"applied", "interview_1", "interview_2", "follow_up", "offer", "rejection", "closed", "reopen"}
 
@@ -31,18 +37,24 @@ def list_events_for_application(
     application_id: int,
     limit: int = 50,
     offset: int = 0,
-) -> List[Event]:
-    return (
-        db.query(Event)
-        .filter(Event.application_id == application_id)
-        .order_by(desc(Event.event_time))
-        .offset(offset)
-        .limit(limit)
-        .all()
+    cursor: str | None = None,
+) -> Page[Event]:
+    """最新的在前；cursor = 上一页的 next_cursor（给了就忽略 offset）"""
+    q = db.query(Event).filter(Event.application_id == application_id)
+    items, next_cursor = paginate(
+        q,
+        Event.event_time,
+        Event.id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
+    return Page(items=items, next_cursor=next_cursor)
 
 
-def _is_duplicate_event(db: Session, application_id: int, event_type: str, seconds: int = 20) -> bool:
+def _is_duplicate_event(
+    db: Session, application_id: int, event_type: str, seconds: int = DUPLICATE_EVENT_SECONDS
+) -> bool:
     """防连点：短时间重复同 event_type 直接拒绝"""
     last = (
         db.query(Event)
@@ -128,13 +140,52 @@ def _apply_strong_fsm(app_obj: Application, event_type: str) -> None:
     raise ValueError(f"Unhandled event_type: {event_type}")
 
 
+def _set_last_event(application: Application, event_id: int, event_type: str, event_time: datetime) -> None:
+    """新事件比 application 上记的最近一条新（(event_time, id) 更大）才替换：补录的旧事件不影响"""
+    if application.last_event_at is None or (event_time, event_id) > (
+        application.last_event_at,
+        application.last_event_id or 0,
+    ):
+        application.last_event_id = event_id
+        application.last_event_type = event_type
+        application.last_event_at = event_time
+
+
+def refresh_last_events(db: Session, application_ids: Iterable[int]) -> None:
+    """按 events 表重算这些 application 的 last_event_*（批量写事件之后用；不 commit）"""
+    ids = sorted(set(application_ids))
+    if not ids:
+        return
+
+    def _latest(column):
+        # 走 ix_events_application_id_event_time_id
+        return (
+            select(column)
+            .where(Event.application_id == Application.id)
+            .order_by(Event.event_time.desc(), Event.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    db.execute(
+        update(Application)
+        .where(Application.id.in_(ids))
+        .values(
+            last_event_id=_latest(Event.id),
+            last_event_type=_latest(Event.event_type),
+            last_event_at=_latest(Event.event_time),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 def add_event(db: Session, application: Application, data: EventCreate) -> Event:
     # event_time：API/UI 传了就用，没传就用当前 UTC
-    event_time = data.event_time or datetime.utcnow()
+    event_time = _utc_naive(data.event_time) if data.event_time else datetime.utcnow()
     event_type = data.event_type
 
     # 防连点/手滑
-    if _is_duplicate_event(db, application.id, event_type, seconds=20):
+    if _is_duplicate_event(db, application.id, event_type, seconds=DUPLICATE_EVENT_SECONDS):
         raise ValueError("Duplicate event too quickly. Try again later.")
 
     # 强约束：先更新 application 的 status / stage（可能抛 ValueError）
@@ -149,43 +200,145 @@ def add_event(db: Session, application: Application, data: EventCreate) -> Event
 
     db.add(obj)
     db.add(application)
+    db.flush()
+    _set_last_event(application, obj.id, event_type, event_time)
+    if obj.notes:
+        # 备注进全文索引（和事件同一个事务）
+        index_application(db, application)
     db.commit()
+    # 状态机可能改了 application.status（列表的过滤条件）
+    get_count_cache().bump("applications")
     db.refresh(obj)
     return obj
 
 
+def add_events_batch(db: Session, items: Sequence[EventBatchItem]) -> list[dict]:
+    """
+    一次写入多个 application 的事件（日历同步等），规则和 add_event 一样（防连点 + 强约束状态机）：
+
+    - 涉及的 application 一次查出来；防连点要的“每个 (application, event_type) 最近一次时间”也一次查出来
+    - 按 event_time（同一时间按提交顺序）在内存里依次过 _apply_strong_fsm，被拒的事件不改状态
+    - 事件一次批量 INSERT，application 的状态变化 / last_event_* 和全文索引一起，整批一个事务提交
+
+    返回和 items 一一对应的 [{"index", "ok", "event" | "error"}]；单条被拒不影响其他条，
+    数据库错误整批回滚并抛出
+    """
+    now = datetime.utcnow()
+    results: list[dict] = [{"index": i, "ok": False} for i in range(len(items))]
+
+    app_ids = sorted({item.application_id for item in items})
+    apps = {a.id: a for a in db.query(Application).filter(Application.id.in_(app_ids))} if app_ids else {}
+    last_seen: dict[tuple[int, str], datetime] = {}
+    if apps:
+        # 走 ix_events_application_id_event_type_event_time
+        last_seen = {
+            (app_id, event_type): last
+            for app_id, event_type, last in db.execute(
+                select(Event.application_id, Event.event_type, func.max(Event.event_time))
+                .where(Event.application_id.in_(list(apps)))
+                .group_by(Event.application_id, Event.event_type)
+            )
+        }
+
+    pending = sorted(
+        ((i, item, _utc_naive(item.event_time) if item.event_time else now) for i, item in enumerate(items)),
+        key=lambda p: (p[2], p[0]),
+    )
+    accepted: list[tuple[int, EventBatchItem, datetime]] = []
+    for i, item, event_time in pending:
+        app_obj = apps.get(item.application_id)
+        if app_obj is None:
+            results[i]["error"] = "Application not found"
+            continue
+        key = (app_obj.id, item.event_type)
+        last = last_seen.get(key)
+        if last is not None and now - last < timedelta(seconds=DUPLICATE_EVENT_SECONDS):
+            results[i]["error"] = "Duplicate event too quickly. Try again later."
+            continue
+        status, stage = app_obj.status, app_obj.current_stage
+        try:
+            _apply_strong_fsm(app_obj, item.event_type)
+        except ValueError as e:
+            app_obj.status, app_obj.current_stage = status, stage
+            results[i]["error"] = str(e)
+            continue
+        last_seen[key] = max(last, event_time) if last is not None else event_time
+        accepted.append((i, item, event_time))
+
+    if not accepted:
+        return results
+
+    try:
+        rows = [
+            {
+                "application_id": item.application_id,
+                "event_type": item.event_type,
+                "event_time": event_time,
+                "notes": item.notes,
+            }
+            for _, item, event_time in accepted
+        ]
+        # 和导入一样：SQLite 上 sort_by_parameter_order 会退化成一行一条 INSERT，
+        # 而 rowid 按插入顺序递增，批量插入后排序就是参数顺序
+        table = Event.__table__
+        sqlite = db.bind.dialect.name == "sqlite"
+        ids = db.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=not sqlite), rows
+        ).scalars().all()
+        if sqlite:
+            ids.sort()
+        for (_, item, event_time), event_id in zip(accepted, ids):
+            _set_last_event(apps[item.application_id], event_id, item.event_type, event_time)
+
+        # 有新备注的 application 重建全文索引（和事件同一个事务）
+        noted = {item.application_id for _, item, _ in accepted if item.notes}
+        if noted:
+            index_applications(db, (apps[app_id] for app_id in sorted(noted)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # 状态机可能改了 application.status（列表的过滤条件）
+    get_count_cache().bump("applications")
+
+    for (i, _, _), event_id, row in zip(accepted, ids, rows):
+        results[i].update(ok=True, event={"id": event_id, **row})
+    return results
+
+
 def delete_event(db: Session, event_id: int) -> bool:
     obj = db.query(Event).filter(Event.id == event_id).first()
     if not obj:
         return False
+    application = obj.application
     db.delete(obj)
+    db.flush()
+    if application is not None and application.last_event_id == obj.id:
+        # 删的是最近一条：退回到剩下的里面最近的一条（没有就清空）
+        prev = db.execute(
+            select(Event.id, Event.event_type, Event.event_time)
+            .where(Event.application_id == application.id)
+            .order_by(Event.event_time.desc(), Event.id.desc())
+            .limit(1)
+        ).first()
+        application.last_event_id, application.last_event_type, application.last_event_at = prev or (None, None, None)
+    if obj.notes and application is not None:
+        index_application(db, application)
     db.commit()
+    # last_event_at 可能变了（active_since 的计数）
+    get_count_cache().bump("applications")
     return True
 
 
 def latest_events_for_applications(db: Session, application_ids: List[int]) -> Dict[int, Event]:
+    """每个 application 最近的一条事件（按 applications.last_event_id，一次按主键取，不再 GROUP BY）"""
     if not application_ids:
         return {}
 
-    subq = (
-        db.query(
-            Event.application_id.label("app_id"),
-            func.max(Event.event_time).label("max_time"),
-        )
-        .filter(Event.application_id.in_(application_ids))
-        .group_by(Event.application_id)
-        .subquery()
-    )
-
     rows = (
         db.query(Event)
-        .join(
-            subq,
-            and_(
-                Event.application_id == subq.c.app_id,
-                Event.event_time == subq.c.max_time,
-            ),
-        )
+        .join(Application, Application.last_event_id == Event.id)
+        .filter(Application.id.in_(application_ids))
         .all()
     )
 
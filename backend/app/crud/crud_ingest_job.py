@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.ingest_job import IngestJob
+
+
+def create_ingest_job(
+    db: Session,
+    *,
+    source: str,
+    board_token: str,
+    company_name: str,
+    fetch_jd: bool = False,
+    full_refresh: bool = False,
+) -> IngestJob:
+    obj = IngestJob(
+        source=source,
+        board_token=board_token.strip(),
+        company_name=company_name.strip(),
+        fetch_jd=fetch_jd,
+        full_refresh=full_refresh,
+        status="queued",
+    )
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def get_ingest_job(db: Session, job_id: int) -> IngestJob | None:
+    return db.query(IngestJob).filter(IngestJob.id == job_id).first()
+
+
+def list_pending_ingest_jobs(db: Session) -> list[IngestJob]:
+    return (
+        db.query(IngestJob)
+        .filter(IngestJob.status.in_(["queued", "running"]))
+        .order_by(IngestJob.id)
+        .all()
+    )
+
+
+def mark_ingest_job_running(db: Session, obj: IngestJob) -> IngestJob:
+    obj.status = "running"
+    obj.started_at = datetime.utcnow()
+    obj.error = None
+    db.add(obj)
+    db.commit()
+    return obj
+
+
+def mark_ingest_job_done(db: Session, obj: IngestJob, result: dict) -> IngestJob:
+    obj.status = "done"
+    obj.result = dict(result)
+    obj.finished_at = datetime.utcnow()
+    db.add(obj)
+    db.commit()
+    return obj
+
+
+def mark_ingest_job_failed(db: Session, obj: IngestJob, error: str) -> IngestJob:
+    obj.status = "failed"
+    obj.error = error
+    obj.finished_at = datetime.utcnow()
+    db.add(obj)
+    db.commit()
+    return obj
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.board_ingest_state import BoardIngestState
+
+
+def get_board_state(db: Session, *, source: str, board_token: str) -> BoardIngestState | None:
+    return (
+        db.query(BoardIngestState)
+        .filter(BoardIngestState.source == source, BoardIngestState.board_token == board_token)
+        .first()
+    )
+
+
+def save_board_state(
+    db: Session,
+    *,
+    source: str,
+    board_token: str,
+    etag: str | None,
+    last_modified: str | None,
+    job_watermarks: dict[str, str],
+    with_jd: bool,
+) -> BoardIngestState:
+    obj = get_board_state(db, source=source, board_token=board_token)
+    if not obj:
+        obj = BoardIngestState(source=source, board_token=board_token)
+
+    obj.etag = etag
+    obj.last_modified = last_modified
+    # JSON 列整体替换（原地修改 dict 不会被 SQLAlchemy 追踪）
+    obj.job_watermarks = dict(job_watermarks)
+    obj.with_jd = with_jd
+    obj.last_run_at = datetime.utcnow()
+
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
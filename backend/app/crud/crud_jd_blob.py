@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import zlib
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import JD_COMPRESSION, JD_COMPRESSION_LEVEL
+from app.models.jd_blob import JdBlob
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+# IN 查询 / 批量 INSERT 的块大小（blob 行比较大，块小一点）
+BLOB_CHUNK = 100
+
+
+def _codec() -> str:
+    if JD_COMPRESSION == "zstd":
+        if zstandard is not None:
+            return "zstd"
+        logger.warning("JD_COMPRESSION=zstd but zstandard is not installed; using zlib")
+    return "zlib"
+
+
+_CODEC = _codec()
+
+
+def normalize_jd(text: str | None) -> str | None:
+    """换行统一成 \\n、去掉行尾空白和首尾空行；空 JD 返回 None"""
+    if not text:
+        return None
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    normalized = "\n".join(line.rstrip() for line in lines).strip()
+    return normalized or None
+
+
+def jd_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _compress(raw: bytes) -> tuple[str, bytes]:
+    if _CODEC == "zstd":
+        return "zstd", zstandard.ZstdCompressor(level=JD_COMPRESSION_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, JD_COMPRESSION_LEVEL)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("JD blob is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown JD codec: {codec}")
+
+
+def _insert_ignore_conflicts(db: Session, rows: list[dict]) -> None:
+    # 并发写同一个 JD：hash 冲突直接跳过（内容一样）
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    # executemany：语句只编译一次（.values(chunk) 每块都要重新编译一条多行 INSERT）
+    if dialect_insert is None:
+        stmt = insert(JdBlob)
+    else:
+        stmt = dialect_insert(JdBlob).on_conflict_do_nothing(index_elements=["hash"])
+    for i in range(0, len(rows), BLOB_CHUNK):
+        db.execute(stmt, rows[i:i + BLOB_CHUNK])
+
+
+def put_jd_blobs(db: Session, texts: Iterable[str | None]) -> list[str | None]:
+    """
+    批量保存 JD，返回对应的 jd_hash 列表（空 JD -> None）。
+    已存在的 hash 不会重复压缩 / 写入。不 commit，由调用方和引用行一起提交。
+    """
+    hashes: list[str | None] = []
+    pending: dict[str, str] = {}
+    for text in texts:
+        normalized = normalize_jd(text)
+        if normalized is None:
+            hashes.append(None)
+            continue
+        h = jd_hash(normalized)
+        hashes.append(h)
+        pending.setdefault(h, normalized)
+
+    if not pending:
+        return hashes
+
+    keys = list(pending)
+    existing: set[str] = set()
+    for i in range(0, len(keys), BLOB_CHUNK):
+        chunk = keys[i:i + BLOB_CHUNK]
+        existing.update(db.execute(select(JdBlob.hash).where(JdBlob.hash.in_(chunk))).scalars())
+
+    rows = []
+    for h, normalized in pending.items():
+        if h in existing:
+            continue
+        raw = normalized.encode("utf-8")
+        codec, data = _compress(raw)
+        rows.append(
+            {
+                "hash": h,
+                "codec": codec,
+                "data": data,
+                "raw_size": len(raw),
+                "compressed_size": len(data),
+                "created_at": datetime.utcnow(),
+            }
+        )
+    if rows:
+        _insert_ignore_conflicts(db, rows)
+    return hashes
+
+
+def put_jd_blob(db: Session, text: str | None) -> str | None:
+    return put_jd_blobs(db, [text])[0]
+
+
+def get_jd_text(db: Session, hash_: str | None) -> str | None:
+    """按引用取 JD 正文（只在详情页调用，这里才解压）"""
+    if not hash_:
+        return None
+    blob = db.get(JdBlob, hash_)
+    if blob is None:
+        return None
+    return _decompress(blob.codec, blob.data).decode("utf-8")
+
+
+def get_jd_texts(db: Session, hashes: Iterable[str | None]) -> dict[str, str]:
+    """批量版 get_jd_text：{hash: 正文}，空引用 / 不存在的 hash 不在结果里"""
+    wanted = sorted({h for h in hashes if h})
+    texts: dict[str, str] = {}
+    for i in range(0, len(wanted), BLOB_CHUNK):
+        rows = db.execute(
+            select(JdBlob.hash, JdBlob.codec, JdBlob.data).where(JdBlob.hash.in_(wanted[i:i + BLOB_CHUNK]))
+        )
+        for hash_, codec, data in rows:
+            texts[hash_] = _decompress(codec, data).decode("utf-8")
+    return texts
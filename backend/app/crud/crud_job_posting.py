@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import hashlib
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from datetime import datetime
+from typing import Iterable
 
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, insert, select, update
+
+from app.crud import search_index
+from app.crud.counting import get_count_cache
+from app.crud.crud_jd_blob import get_jd_texts, put_jd_blob, put_jd_blobs
+from app.crud.fingerprint_index import get_fingerprint_index
+from app.crud.pagination import Page, paginate
 from app.models.job_posting import JobPosting
 from app.schemas.job_posting import JobPostingCreate
 
+# 单条 INSERT 的行数上限（SQLite 旧版本 bind 参数上限 999）
+BULK_INSERT_CHUNK = 100
+# 同一个 job 改了标题 / 地点 / url 时原地更新的列
+_MOVED_COLUMNS = ("company_name", "role_title", "location", "url", "fingerprint", "jd_hash")
 
 
 def _norm(s: str | None) -> str:
@@ -20,10 +33,48 @@ def build_fingerprint(*parts: str | None) -> str:
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
+def _find_by_fingerprint(db: Session, fp: str) -> JobPosting | None:
+    # fingerprint 集合确定没有的，直接跳过 SELECT
+    if get_fingerprint_index().contains(fp) is False:
+        return None
+    return db.query(JobPosting).filter(JobPosting.fingerprint == fp).first()
+
+
+def _search_doc(job_id: int, row, jd_text: str | None) -> search_index.SearchDoc:
+    # row：JobPosting 或 bulk 的行 dict
+    get = row.get if isinstance(row, dict) else lambda k: getattr(row, k)
+    return search_index.SearchDoc(
+        id=job_id,
+        title=search_index.title_of(get("company_name"), get("role_title")),
+        location=get("location"),
+        body=jd_text,
+    )
+
+
+def _save_new(db: Session, obj: JobPosting, *, jd_text: str | None = None) -> JobPosting:
+    """插入新行（连同全文索引）；唯一约束冲突（别的进程刚插入）时返回已有那行"""
+    db.add(obj)
+    try:
+        db.flush()
+        search_index.index_docs(db, "job_postings", [_search_doc(obj.id, obj, jd_text)])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = db.query(JobPosting).filter(JobPosting.fingerprint == obj.fingerprint).first()
+        if existing is None:
+            raise
+        get_fingerprint_index().add([obj.fingerprint])
+        return existing
+    get_count_cache().bump("job_postings")
+    db.refresh(obj)
+    get_fingerprint_index().add([obj.fingerprint])
+    return obj
+
+
 def create_job_posting(db: Session, data: JobPostingCreate) -> JobPosting:
     fp = build_fingerprint(data.company_name, data.role_title, data.location, data.url)
 
-    existing = db.query(JobPosting).filter(JobPosting.fingerprint == fp).first()
+    existing = _find_by_fingerprint(db, fp)
     if existing:
         # 已存在就直接返回（避免重复）
         return existing
@@ -34,40 +85,69 @@ def create_job_posting(db: Session, data: JobPostingCreate) -> JobPosting:
         role_title=data.role_title.strip(),
         location=data.location.strip() if data.location else None,
         url=data.url.strip() if data.url else None,
-        jd_text=data.jd_text.strip() if data.jd_text else None,
+        jd_hash=put_jd_blob(db, data.jd_text),
         fingerprint=fp,
     )
-    db.add(obj)
-    db.commit()
-    db.refresh(obj)
-    return obj
+    return _save_new(db, obj, jd_text=data.jd_text)
 
 
 def list_job_postings(
     db: Session,
     *,
     search: str | None = None,
+    only_new: bool = False,
+    include_closed: bool = False,
     limit: int = 20,
     offset: int = 0,
-) -> tuple[int, list[JobPosting]]:
+    cursor: str | None = None,
+    order_by: str = "created_at",
+    columns: Iterable[str] | None = None,
+) -> Page[JobPosting]:
+    """
+    search：走全文索引（公司 / 职位 / 地点 / JD），不支持的数据库退回 ilike
+    order_by="relevance"：有 search 时按相关度排序，否则按 created_at（新的在前）
+    cursor：上一页返回的 next_cursor（keyset 分页，给了就忽略 offset）
+    columns：只 SELECT 这些列（load_only），其余列访问时直接报错而不是逐行懒加载；
+    None = 整行
+    """
     q = db.query(JobPosting)
+    search = search.strip() if search else None
+
+    if only_new:
+        # 走 ix_job_postings_is_new_created_at
+        q = q.filter(JobPosting.is_new.is_(True))
+    if not include_closed:
+        q = q.filter(JobPosting.closed_at.is_(None))
 
-    if search:
-        s = f"%{search.strip()}%"
+    hits = search_index.match(db, "job_postings", search) if search else None
+    if hits is not None:
+        q = q.join(hits, hits.c.id == JobPosting.id)
+    elif search:
+        s = f"%{search}%"
         q = q.filter(
             (JobPosting.company_name.ilike(s)) |
             (JobPosting.role_title.ilike(s)) |
             (JobPosting.location.ilike(s))
         )
 
-    total = q.count()
-    items = (
-        q.order_by(desc(JobPosting.created_at))
-        .offset(offset)
-        .limit(limit)
-        .all()
+    total, total_exact = get_count_cache().count(
+        db, q, table="job_postings", key=(search, only_new, include_closed), estimate=not search
+    )
+    relevance = hits is not None and order_by == "relevance"
+    order_column = hits.c.rank if relevance else JobPosting.created_at
+    if columns is not None:
+        if not relevance:
+            columns = {*columns, "created_at"}
+        q = q.options(load_only(*(getattr(JobPosting, c) for c in columns), raiseload=True))
+    items, next_cursor = paginate(
+        q,
+        order_column,
+        JobPosting.id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
-    return total, items
+    return Page(items=items, total=total, total_exact=total_exact, next_cursor=next_cursor)
 
 def get_job_posting(db: Session, job_id: int) -> JobPosting | None:
     return db.query(JobPosting).filter(JobPosting.id == job_id).first()
@@ -77,7 +157,10 @@ def delete_job_posting(db: Session, job_id: int) -> bool:
     if not obj:
         return False
     db.delete(obj)
+    search_index.remove_docs(db, "job_postings", [job_id])
     db.commit()
+    get_count_cache().bump("job_postings")
+    get_fingerprint_index().discard(obj.fingerprint)
     return True
 
 def upsert_job_posting(
@@ -92,7 +175,7 @@ def upsert_job_posting(
 ) -> JobPosting:
     fp = build_fingerprint(company_name, role_title, location, url)
 
-    existing = db.query(JobPosting).filter(JobPosting.fingerprint == fp).first()
+    existing = _find_by_fingerprint(db, fp)
     if existing:
         return existing
 
@@ -102,10 +185,309 @@ def upsert_job_posting(
         role_title=role_title.strip(),
         location=location.strip() if location else None,
         url=url.strip() if url else None,
-        jd_text=jd_text.strip() if jd_text else None,
+        jd_hash=put_jd_blob(db, jd_text),
         fingerprint=fp,
     )
-    db.add(obj)
+    return _save_new(db, obj, jd_text=jd_text)
+
+
+def _insert_ignore_conflicts(db: Session, rows: list[dict]) -> dict[str, int]:
+    """
+    INSERT ... ON CONFLICT (fingerprint) DO NOTHING RETURNING fingerprint, id
+    返回真正插入的行 fingerprint -> id（并发写入导致的冲突会被跳过）
+    """
+    dialect = db.bind.dialect.name
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    inserted: dict[str, int] = {}
+    for i in range(0, len(rows), BULK_INSERT_CHUNK):
+        chunk = rows[i:i + BULK_INSERT_CHUNK]
+        if dialect_insert is None:
+            # 其他数据库：前面已经用 IN 查询排除了已存在的 fingerprint
+            db.execute(insert(JobPosting), chunk)
+            inserted.update(_lookup_ids(db, [r["fingerprint"] for r in chunk]))
+            continue
+
+        stmt = (
+            dialect_insert(JobPosting)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["fingerprint"])
+            .returning(JobPosting.fingerprint, JobPosting.id)
+        )
+        inserted.update(db.execute(stmt).all())
+    return inserted
+
+
+def _lookup_ids(db: Session, fps: list[str]) -> dict[str, int]:
+    """fingerprint -> id（IN 查询按块切分）"""
+    ids: dict[str, int] = {}
+    for i in range(0, len(fps), BULK_INSERT_CHUNK):
+        chunk = fps[i:i + BULK_INSERT_CHUNK]
+        ids.update(
+            db.execute(
+                select(JobPosting.fingerprint, JobPosting.id).where(JobPosting.fingerprint.in_(chunk))
+            ).all()
+        )
+    return ids
+
+
+def _lookup_by_external_id(db: Session, source: str, rows: list[dict]) -> dict[str, tuple[int, str, str | None]]:
+    """
+    新 fingerprint -> 同 (source, board_token, external_id) 的已有行 (id, 旧 fingerprint, 旧 jd_hash)：
+    同一个 job 改了标题 / 地点 / url。同一个 external_id 有多行（历史遗留）时取 id 最大的
+    """
+    by_board: dict[str, dict[str, str]] = {}
+    for r in rows:
+        if r["board_token"] is not None and r["external_id"] is not None:
+            by_board.setdefault(r["board_token"], {})[r["external_id"]] = r["fingerprint"]
+
+    found: dict[str, tuple[int, str, str | None]] = {}
+    for board_token, fp_by_ext in by_board.items():
+        ext_ids = list(fp_by_ext)
+        for i in range(0, len(ext_ids), BULK_INSERT_CHUNK):
+            chunk = ext_ids[i:i + BULK_INSERT_CHUNK]
+            rows_ = db.execute(
+                select(JobPosting.external_id, JobPosting.id, JobPosting.fingerprint, JobPosting.jd_hash)
+                .where(
+                    JobPosting.source == source,
+                    JobPosting.board_token == board_token,
+                    JobPosting.external_id.in_(chunk),
+                )
+                .order_by(JobPosting.id)
+            ).all()
+            for ext_id, job_id, old_fp, old_jd_hash in rows_:
+                found[fp_by_ext[ext_id]] = (job_id, old_fp, old_jd_hash)
+    return found
+
+
+def _close_superseded(db: Session, source: str, rows: dict[str, dict], current_ids: dict[str, int]) -> int:
+    """同 (source, board_token, external_id) 下、不是这批当前那一行的，一并关掉（历史遗留的重复行）"""
+    by_board: dict[str, dict[str, int]] = {}
+    for fp, job_id in current_ids.items():
+        r = rows[fp]
+        if r["board_token"] is not None and r["external_id"] is not None:
+            by_board.setdefault(r["board_token"], {})[r["external_id"]] = job_id
+
+    closed = 0
+    now = datetime.utcnow()
+    for board_token, id_by_ext in by_board.items():
+        ext_ids = list(id_by_ext)
+        for i in range(0, len(ext_ids), BULK_INSERT_CHUNK):
+            chunk = ext_ids[i:i + BULK_INSERT_CHUNK]
+            stmt = (
+                update(JobPosting)
+                .where(
+                    JobPosting.source == source,
+                    JobPosting.board_token == board_token,
+                    JobPosting.external_id.in_(chunk),
+                    JobPosting.id.not_in([id_by_ext[e] for e in chunk]),
+                    JobPosting.closed_at.is_(None),
+                )
+                .values(closed_at=now, is_new=False)
+            )
+            closed += db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+    return closed
+
+
+def bulk_upsert_job_postings(
+    db: Session,
+    *,
+    source: str,
+    items: Iterable[dict],
+    update_existing: bool = False,
+) -> dict:
+    """
+    批量版 upsert_job_posting：整批只做一次 IN 查询 + 一次 commit。
+    进程内 fingerprint 集合（app.crud.fingerprint_index）能确定的 fingerprint 不再查库。
+
+    items 每项需要 company_name / role_title，
+    可选 location / url / jd_text / board_token / external_id。
+
+    update_existing=False：已存在（同 fingerprint）的行保持不变
+    update_existing=True：已存在的行按主键批量更新 jd_hash（有 JD 时）/ board_token / external_id
+                          —— 增量抓取时只会把“变了的 job”传进来；
+                          fingerprint 变了但 (source, board_token, external_id) 已有行的（改了标题 / 地点），
+                          原地更新那一行，不另插一行；同 external_id 的其它旧行同批关掉
+
+    返回 {"created": 新插入行数, "existing": 已存在/批内重复行数, "updated": 被更新的已存在行数,
+          "superseded": 被关掉的重复行数}
+    """
+    rows_by_fp: dict[str, dict] = {}
+    total = 0
+
+    for it in items:
+        company_name = (it.get("company_name") or "").strip()
+        role_title = (it.get("role_title") or "").strip()
+        if not company_name or not role_title:
+            continue
+        total += 1
+
+        location = it.get("location")
+        url = it.get("url")
+        jd_text = it.get("jd_text")
+        external_id = it.get("external_id")
+
+        fp = build_fingerprint(company_name, role_title, location, url)
+        if fp in rows_by_fp:
+            continue
+
+        rows_by_fp[fp] = {
+            "source": source,
+            "company_name": company_name,
+            "role_title": role_title,
+            "location": location.strip() if location else None,
+            "url": url.strip() if url else None,
+            "jd_text": jd_text,
+            "board_token": it.get("board_token"),
+            "external_id": str(external_id) if external_id is not None else None,
+            "fingerprint": fp,
+            "created_at": datetime.utcnow(),
+        }
+
+    if not rows_by_fp:
+        return {"created": 0, "existing": total, "updated": 0, "superseded": 0}
+
+    # JD 正文进 jd_blobs（去重 + 压缩），行里只留 jd_hash；正文留着写全文索引
+    jd_texts = {fp: r.pop("jd_text") for fp, r in rows_by_fp.items()}
+    for row, h in zip(rows_by_fp.values(), put_jd_blobs(db, jd_texts.values())):
+        row["jd_hash"] = h
+
+    # fingerprint 集合能确定的就不查库：
+    # - 确定没有：直接插入
+    # - 确定有：update_existing=False 时用不到 id，也不用查
+    # 集合没加载（None）或需要 id 更新的，才走 IN 查询
+    index = get_fingerprint_index()
+    known = {fp: index.contains(fp) for fp in rows_by_fp}
+    skip = {fp for fp, hit in known.items() if hit and not update_existing}
+    existing_ids = _lookup_ids(db, [fp for fp, hit in known.items() if hit is not False and fp not in skip])
+
+    new_rows = [r for fp, r in rows_by_fp.items() if fp not in existing_ids and fp not in skip]
+    # 快照按 external_id 比较：同一个 job 改了标题 / 地点就另插一行的话，旧行永远关不掉
+    moved = _lookup_by_external_id(db, source, new_rows) if update_existing and new_rows else {}
+    if moved:
+        new_rows = [r for r in new_rows if r["fingerprint"] not in moved]
+    new_ids = _insert_ignore_conflicts(db, new_rows) if new_rows else {}
+    created = len(new_ids)
+    search_index.index_docs(
+        db, "job_postings", [_search_doc(job_id, rows_by_fp[fp], jd_texts[fp]) for fp, job_id in new_ids.items()]
+    )
+    if update_existing and created < len(new_rows):
+        # 集合过期（别的进程插入过）：把冲突的行查回来按已存在更新
+        conflicted = [r["fingerprint"] for r in new_rows if r["fingerprint"] not in new_ids]
+        existing_ids.update(_lookup_ids(db, conflicted))
+
+    updated = 0
+    if update_existing and existing_ids:
+        with_jd, without_jd = [], []
+        for fp, job_id in existing_ids.items():
+            row = rows_by_fp[fp]
+            change = {"id": job_id, "board_token": row["board_token"], "external_id": row["external_id"]}
+            if row["jd_hash"] is not None:
+                change["jd_hash"] = row["jd_hash"]
+                with_jd.append(change)
+            else:
+                without_jd.append(change)
+
+        # 按主键批量 UPDATE（executemany）；参数形状要一致，所以分两组
+        for changes in (with_jd, without_jd):
+            if changes:
+                db.execute(update(JobPosting), changes)
+        updated = len(with_jd) + len(without_jd)
+
+        # JD 变了的重建全文索引
+        jd_changed = [(fp, job_id) for fp, job_id in existing_ids.items() if rows_by_fp[fp]["jd_hash"] is not None]
+        search_index.index_docs(
+            db, "job_postings", [_search_doc(job_id, rows_by_fp[fp], jd_texts[fp]) for fp, job_id in jd_changed]
+        )
+
+    if moved:
+        # 原地改 fingerprint / 标题等；没带 JD 的沿用旧 JD（全文索引也用旧正文）
+        old_texts = get_jd_texts(db, [h for fp, (_, _, h) in moved.items() if rows_by_fp[fp]["jd_hash"] is None])
+        changes = []
+        for fp, (job_id, _, old_jd_hash) in moved.items():
+            row = rows_by_fp[fp]
+            if row["jd_hash"] is None:
+                row["jd_hash"] = old_jd_hash
+                jd_texts[fp] = old_texts.get(old_jd_hash)
+            changes.append({"id": job_id, **{k: row[k] for k in _MOVED_COLUMNS}})
+        db.execute(update(JobPosting), changes)
+        updated += len(changes)
+        search_index.index_docs(
+            db, "job_postings", [_search_doc(m[0], rows_by_fp[fp], jd_texts[fp]) for fp, m in moved.items()]
+        )
+
+    superseded = 0
+    if update_existing:
+        current = {**existing_ids, **new_ids, **{fp: m[0] for fp, m in moved.items()}}
+        superseded = _close_superseded(db, source, rows_by_fp, current)
+
     db.commit()
-    db.refresh(obj)
-    return obj
+    if created or moved or superseded:
+        get_count_cache().bump("job_postings")
+    for _, old_fp, _ in moved.values():
+        index.discard(old_fp)
+    index.add(rows_by_fp)
+
+    return {"created": created, "existing": total - created, "updated": updated, "superseded": superseded}
+
+
+def board_has_new_postings(db: Session, *, source: str, board_token: str) -> bool:
+    """上一轮抓取留下的 is_new 行（走 ix_job_postings_source_board_external 的前缀）"""
+    stmt = select(JobPosting.id).where(
+        JobPosting.source == source,
+        JobPosting.board_token == board_token,
+        JobPosting.is_new.is_(True),
+    )
+    return db.execute(select(stmt.exists())).scalar()
+
+
+def apply_board_snapshot(
+    db: Session,
+    *,
+    source: str,
+    board_token: str,
+    added: Iterable[str],
+    removed: Iterable[str],
+) -> dict:
+    """
+    按 board 快照差异（external_id 集合）批量更新，整批一次 commit：
+    - 清掉这个 board 上一轮的 is_new
+    - added（上次快照里没有的）：is_new=True，并重新打开（之前关掉又出现的）
+    - removed（这次快照里没有的）：closed_at=now
+
+    返回 {"flagged_new": 标记为新的行数, "closed": 新关闭的行数}
+    """
+    board = (JobPosting.source == source) & (JobPosting.board_token == board_token)
+    now = datetime.utcnow()
+
+    def _update(where, values) -> int:
+        stmt = update(JobPosting).where(board, where).values(**values)
+        return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+    _update(JobPosting.is_new.is_(True), {"is_new": False})
+
+    flagged = closed = 0
+    added, removed = sorted(added), sorted(removed)
+    for i in range(0, len(added), BULK_INSERT_CHUNK):
+        chunk = added[i:i + BULK_INSERT_CHUNK]
+        # 同一个 external_id 只重新打开最新那一行（被顶掉的旧行保持关闭）
+        latest = (
+            select(func.max(JobPosting.id))
+            .where(board, JobPosting.external_id.in_(chunk))
+            .group_by(JobPosting.external_id)
+        )
+        flagged += _update(JobPosting.id.in_(latest), {"is_new": True, "closed_at": None})
+    for i in range(0, len(removed), BULK_INSERT_CHUNK):
+        chunk = removed[i:i + BULK_INSERT_CHUNK]
+        closed += _update(JobPosting.external_id.in_(chunk) & JobPosting.closed_at.is_(None), {"closed_at": now})
+
+    db.commit()
+    # is_new / closed_at 是 Job Inbox 的过滤条件
+    get_count_cache().bump("job_postings")
+    return {"flagged_new": flagged, "closed": closed}
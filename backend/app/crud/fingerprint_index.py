@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.job_posting import JobPosting
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH = 10_000
+
+
+class FingerprintIndex:
+    """
+    进程内的 job_postings.fingerprint 集合（sha256 hex -> 32 bytes，约 100B/条）。
+
+    启动时加载一次，插入时 add、删除时 discard，可随时 rebuild。
+    没加载好之前 contains() 返回 None（= 不知道），调用方照旧查库。
+
+    注意：多进程部署时别的进程插入的行这里看不到，所以“不在集合里”只用来跳过 SELECT，
+    插入本身仍然靠 fingerprint 唯一约束兜底。
+    """
+
+    def __init__(self) -> None:
+        self._fps: set[bytes] = set()
+        self._loaded = False
+        self._loading = False
+        self._added_while_loading: set[bytes] = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.unknown = 0
+        self.loaded_at: float | None = None
+        self.load_seconds: float | None = None
+
+    @staticmethod
+    def _key(fp: str) -> bytes:
+        return bytes.fromhex(fp)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """全量（重新）加载；加载期间的 add() 不会丢"""
+        started = time.perf_counter()
+        with self._lock:
+            self._loading = True
+            self._added_while_loading = set()
+
+        fps: set[bytes] = set()
+        try:
+            rows = db.execute(
+                select(JobPosting.fingerprint).execution_options(yield_per=LOAD_BATCH)
+            ).scalars()
+            for fp in rows:
+                fps.add(self._key(fp))
+        except Exception:
+            with self._lock:
+                self._loading = False
+            raise
+
+        with self._lock:
+            fps |= self._added_while_loading
+            self._fps = fps
+            self._added_while_loading = set()
+            self._loading = False
+            self._loaded = True
+
+        self.loaded_at = time.time()
+        self.load_seconds = round(time.perf_counter() - started, 3)
+        return len(fps)
+
+    def rebuild(self, db: Session) -> int:
+        return self.load(db)
+
+    def contains(self, fp: str) -> bool | None:
+        """True / False = 确定；None = 还没加载，需要查库"""
+        if not self._loaded:
+            self.unknown += 1
+            return None
+        if self._key(fp) in self._fps:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, fps: Iterable[str]) -> None:
+        keys = {self._key(fp) for fp in fps}
+        with self._lock:
+            self._fps |= keys
+            if self._loading:
+                self._added_while_loading |= keys
+
+    def discard(self, fp: str) -> None:
+        with self._lock:
+            self._fps.discard(self._key(fp))
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "size": len(self._fps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "unknown": self.unknown,
+            "load_seconds": self.load_seconds,
+        }
+
+
+_index = FingerprintIndex()
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    return _index
+
+
+def load_fingerprint_index() -> int | None:
+    """启动时在后台线程里调用；DB 不可用时只记日志（集合保持未加载，照旧查库）"""
+    db = SessionLocal()
+    try:
+        return _index.load(db)
+    except SQLAlchemyError:
+        logger.exception("failed to load fingerprint index")
+        return None
+    finally:
+        db.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import asc, desc, tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    total: int | None = None
+    # False = total 是估算值（COUNT_MODE=estimated）
+    total_exact: bool = True
+    # 下一页的游标；None = 没有下一页
+    next_cursor: str | None = None
+
+
+def encode_cursor(key: str, value: Any, id_: int) -> str:
+    """游标 = 排序方式 + 上一页最后一行的 (排序列, id)，base64url(JSON)，对客户端不透明"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    raw = json.dumps([key, value, id_], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, key: str) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_key, value, id_ = json.loads(raw)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if cursor_key != key or not isinstance(id_, int):
+        # 换了排序方式还拿旧游标：位置没有意义
+        raise InvalidCursor("Cursor does not match the requested sort order")
+    return value, id_
+
+
+def paginate(
+    q: Query,
+    column: InstrumentedAttribute | ColumnElement,
+    id_column: InstrumentedAttribute,
+    *,
+    descending: bool = True,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[list, str | None]:
+    """
+    keyset 分页：ORDER BY (column, id)，下一页 = WHERE (column, id) </> 游标位置。
+    配合 (column, id) 复合索引，第 N 页和第 1 页一样快，翻页期间的新插入也不会造成跳行 / 重复。
+
+    没有 cursor 时走 OFFSET（兼容旧的 offset 参数）；两种模式都返回 next_cursor。
+    排序列必须 NOT NULL。返回 (items, next_cursor)
+
+    column 也可以是 JOIN 进来的计算列（比如全文检索的 rank）或带 label 的表达式：会额外 SELECT 出来生成游标，
+    items 里仍然只有实体
+    """
+    key = f"{column.key}:{'desc' if descending else 'asc'}"
+    if cursor:
+        value, last_id = decode_cursor(cursor, key)
+        position = tuple_(column, id_column)
+        # 多加一个单列的范围条件（语义不变）：SQLite 对表达式索引用不上行值比较，有了它才能 SEARCH 而不是从头扫
+        if descending:
+            q = q.filter(column <= value, position < (value, last_id))
+        else:
+            q = q.filter(column >= value, position > (value, last_id))
+    elif offset:
+        q = q.offset(offset)
+
+    direction = desc if descending else asc
+    is_attribute = isinstance(column, InstrumentedAttribute)
+    if not is_attribute:
+        q = q.add_columns(column)
+    # 多取一行判断还有没有下一页
+    rows = q.order_by(direction(column), direction(id_column)).limit(limit + 1).all()
+
+    if is_attribute:
+        items, values = rows, [getattr(r, column.key) for r in rows]
+    else:
+        items, values = [r[0] for r in rows], [r[1] for r in rows]
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(key, values[limit - 1], getattr(items[-1], id_column.key))
+    return items, next_cursor
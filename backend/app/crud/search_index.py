@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from app.core.config import SEARCH_TS_CONFIG
+
+# 被索引的表 -> 全文索引表（表结构见 alembic 迁移 add full text search）
+#   PostgreSQL：<table>_fts(id PK, document tsvector) + GIN
+#   SQLite：FTS5 虚拟表 <table>_fts(title, location, body)，rowid = 原表 id
+FTS_TABLES = {
+    "applications": "applications_fts",
+    "job_postings": "job_postings_fts",
+}
+
+# 字段权重：标题（公司 + 职位）> 地点 > 正文（JD / 事件备注）
+PG_WEIGHTS = ("A", "B", "C")
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchDoc:
+    id: int
+    title: str
+    location: str | None = None
+    body: str | None = None
+
+
+def _dialect(db: Session) -> str:
+    return db.bind.dialect.name
+
+
+def supported(db: Session) -> bool:
+    return _dialect(db) in ("postgresql", "sqlite")
+
+
+def title_of(company_name: str | None, role_title: str | None) -> str:
+    return " ".join(p for p in (company_name, role_title) if p)
+
+
+def index_docs(db: Session, table: str, docs: Iterable[SearchDoc]) -> None:
+    """写入 / 覆盖索引文档；不 commit，和业务行同一个事务提交"""
+    fts = FTS_TABLES[table]
+    params = [
+        {"id": d.id, "title": d.title or "", "location": d.location or "", "body": d.body or ""}
+        for d in docs
+    ]
+    if not params:
+        return
+
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        a, b, c = PG_WEIGHTS
+        db.execute(
+            text(
+                f"""
+                INSERT INTO {fts} (id, document)
+                VALUES (
+                    :id,
+                    setweight(to_tsvector(CAST(:cfg AS regconfig), :title), '{a}')
+                    || setweight(to_tsvector(CAST(:cfg AS regconfig), :location), '{b}')
+                    || setweight(to_tsvector(CAST(:cfg AS regconfig), :body), '{c}')
+                )
+                ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document
+                """
+            ),
+            [{**p, "cfg": SEARCH_TS_CONFIG} for p in params],
+        )
+    elif dialect == "sqlite":
+        # FTS5 没有 ON CONFLICT：按 rowid 先删后插
+        db.execute(text(f"DELETE FROM {fts} WHERE rowid = :id"), [{"id": p["id"]} for p in params])
+        db.execute(
+            text(f"INSERT INTO {fts} (rowid, title, location, body) VALUES (:id, :title, :location, :body)"),
+            params,
+        )
+
+
+def remove_docs(db: Session, table: str, ids: Iterable[int]) -> None:
+    fts = FTS_TABLES[table]
+    params = [{"id": i} for i in ids]
+    if not params:
+        return
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        db.execute(text(f"DELETE FROM {fts} WHERE id = :id"), params)
+    elif dialect == "sqlite":
+        db.execute(text(f"DELETE FROM {fts} WHERE rowid = :id"), params)
+
+
+def match(db: Session, table: str, search: str) -> Subquery | None:
+    """
+    全文检索：返回子查询 (id, rank)，rank 越大越相关（可以 JOIN 原表再按 rank 排序）。
+    每个词按前缀匹配、词之间 AND（接近原来 ilike 的手感）。
+    不支持的数据库 / 没有可检索的词时返回 None，调用方退回 ilike。
+    """
+    tokens = _TOKEN.findall(search.lower())
+    if not tokens or not supported(db):
+        return None
+
+    fts = FTS_TABLES[table]
+    if _dialect(db) == "postgresql":
+        stmt = text(
+            f"""
+            SELECT f.id AS id, ts_rank(f.document, q.query) AS rank
+            FROM {fts} AS f, to_tsquery(CAST(:cfg AS regconfig), :query) AS q(query)
+            WHERE f.document @@ q.query
+            """
+        ).bindparams(cfg=SEARCH_TS_CONFIG, query=" & ".join(f"{t}:*" for t in tokens))
+    else:
+        w_title, w_location, w_body = SQLITE_BM25_WEIGHTS
+        # bm25() 越小越相关，取负数和 PostgreSQL 的 ts_rank 方向一致
+        stmt = text(
+            f"""
+            SELECT rowid AS id, -bm25({fts}, {w_title}, {w_location}, {w_body}) AS rank
+            FROM {fts}
+            WHERE {fts} MATCH :query
+            """
+        ).bindparams(query=" ".join(f'"{t}"*' for t in tokens))
+
+    return stmt.columns(id=Integer, rank=Float).subquery(f"{table}_hits")
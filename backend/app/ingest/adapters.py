@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.ingest.base import SourceAdapter
+from app.ingest.greenhouse import GreenhouseAdapter
+from app.ingest.lever import LeverAdapter
+
+# source name -> adapter class（新来源在这里注册）
+ADAPTERS: dict[str, type[SourceAdapter]] = {
+    GreenhouseAdapter.name: GreenhouseAdapter,
+    LeverAdapter.name: LeverAdapter,
+}
+
+
+def get_adapter(source: str, **kwargs) -> SourceAdapter:
+    cls = ADAPTERS.get(source)
+    if cls is None:
+        raise ValueError(f"Unknown ingestion source: {source}")
+    return cls(**kwargs)
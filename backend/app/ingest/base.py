@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.http import get_http_client
+from app.ingest.ratelimit import get_rate_limiter
+from app.ingest.resilience import RETRYABLE_STATUS, CircuitOpenError, get_resilience
+
+
+async def http_get(
+    url: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+    breaker_key: str | None = None,
+    counters: dict | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    所有出站请求都走这里：
+    - 全局限流（并发上限 + 每 host 令牌桶）
+    - 429 / 5xx / 网络错误按 jitter 指数退避重试（遵守 Retry-After）
+    - 按 breaker_key（默认 host）熔断：连续失败后直接抛 CircuitOpenError，不占并发槽位
+
+    重试用尽后：有响应就原样返回（调用方 raise_for_status），没响应就抛最后的异常。
+    counters（可选）累加本次的 retries / short_circuits，用于每个 board 的统计。
+    """
+    client = client or get_http_client()
+    resilience = get_resilience()
+    key = breaker_key or urlsplit(url).hostname or ""
+    breaker = resilience.breaker(key)
+
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            resilience.short_circuits += 1
+            if counters is not None:
+                counters["short_circuits"] = counters.get("short_circuits", 0) + 1
+            raise CircuitOpenError(f"circuit open for {key}")
+        if attempt:
+            resilience.retries += 1
+            if counters is not None:
+                counters["retries"] = counters.get("retries", 0) + 1
+
+        response = error = None
+        try:
+            # 退避的 sleep 在限流外面，不占并发槽位
+            async with get_rate_limiter().limit(url):
+                response = await client.get(url, **kwargs)
+        except httpx.TransportError as e:
+            error = e
+
+        if response is not None and response.status_code not in RETRYABLE_STATUS:
+            breaker.record_success()
+            return response
+
+        if breaker.record_failure():
+            resilience.trips += 1
+        delay = resilience.policy.delay(attempt, response)
+        if delay is None:
+            if response is not None:
+                return response
+            raise error
+
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def conditional_headers(etag: str | None, last_modified: str | None) -> dict:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def content_watermark(*parts) -> str:
+    """没有 updated_at 的来源：用关键字段的哈希当 watermark"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SourceAdapter(ABC):
+    """
+    抓取来源适配器：只负责“怎么拉数据 + 怎么映射字段”，
+    并发 / 增量 / 批量写库都在 app.services.ingestion 的共享 pipeline 里，
+    限流 / 重试 / 熔断在 http_get 里（请求时传 board_token 以便按 board 熔断，详情请求再传 detail=True）。
+
+    list_jobs() 返回：
+    {"not_modified": bool, "jobs": [raw, ...], "etag": str|None, "last_modified": str|None}
+
+    normalize() 把一条 raw job 映射成 pipeline 用的 dict：
+    {"external_id", "watermark", "role_title", "location", "url", "jd_text"}
+    （jd_text 为 None 表示列表里没有 JD，需要时 pipeline 会调 fetch_jd）
+    """
+
+    name: str = ""
+    default_base_url: str = ""
+
+    def __init__(self, base_url: str | None = None, client: httpx.AsyncClient | None = None):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.client = client
+        # 这个 adapter 实例（通常 = 一次 board 抓取）的重试 / 熔断计数
+        self.counters = {"retries": 0, "short_circuits": 0}
+
+    async def get(
+        self, url: str, *, board_token: str | None = None, detail: bool = False, **kwargs
+    ) -> httpx.Response:
+        # 熔断按 board 隔离：一个 board 挂了不影响同 host 的其它 board；
+        # 列表和详情再分开：详情接口出错不会把下一次列表抓取也熔断掉
+        breaker_key = None
+        if board_token:
+            breaker_key = f"{urlsplit(url).hostname or ''}/{board_token}/{'detail' if detail else 'list'}"
+        return await http_get(url, client=self.client, breaker_key=breaker_key, counters=self.counters, **kwargs)
+
+    @abstractmethod
+    async def list_jobs(
+        self,
+        board_token: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        with_content: bool = False,
+    ) -> dict:
+        ...
+
+    @abstractmethod
+    async def fetch_detail(self, board_token: str, external_id: str) -> dict:
+        ...
+
+    @abstractmethod
+    def normalize(self, raw: dict) -> dict | None:
+        ...
+
+    def detail_content(self, detail: dict) -> str | None:
+        return detail.get("content")
+
+    async def fetch_jd(self, board_token: str, external_id: str) -> str | None:
+        return self.detail_content(await self.fetch_detail(board_token, external_id))
@@ -1,35 +1,73 @@
 from __future__ import annotations
 
-import httpx
+from app.core.config import GREENHOUSE_API_BASE
+from app.ingest.base import SourceAdapter, conditional_headers
 
 
-async def fetch_greenhouse_jobs(board_token: str) -> list[dict]:
+class GreenhouseAdapter(SourceAdapter):
     """
-    Greenhouse public job board endpoint (no login):
-    https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs
+    Greenhouse public job board API：
+    - GET {base}/{board}/jobs[?content=true]   列表（支持 ETag / Last-Modified）
+    - GET {base}/{board}/jobs/{id}             详情（content = JD HTML）
     """
-    url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs"
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
+    name = "greenhouse"
+    default_base_url = GREENHOUSE_API_BASE
 
-    # data: {"jobs":[...]}
-    return data.get("jobs", [])
+    async def list_jobs(
+        self,
+        board_token: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        with_content: bool = False,
+    ) -> dict:
+        """
+        带条件请求的列表抓取（If-None-Match / If-Modified-Since）。
 
-async def fetch_greenhouse_jobs(board_token: str) -> list[dict]:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs"
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
-    return data.get("jobs", [])
+        with_content=True 时走 listing-with-content（?content=true）：
+        每个 job 直接带 content（JD HTML），不用再逐个请求详情。
 
+        304 时 jobs 为空列表，etag / last_modified 沿用传入值。
+        """
+        params = {"content": "true"} if with_content else None
+        r = await self.get(
+            f"{self.base_url}/{board_token}/jobs",
+            board_token=board_token,
+            headers=conditional_headers(etag, last_modified),
+            params=params,
+        )
+
+        if r.status_code == 304:
+            return {"not_modified": True, "jobs": [], "etag": etag, "last_modified": last_modified}
 
-async def fetch_greenhouse_job_detail(board_token: str, job_id: int) -> dict:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs/{job_id}"
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url)
+        r.raise_for_status()
+        # data: {"jobs":[...]}
+        return {
+            "not_modified": False,
+            "jobs": r.json().get("jobs", []),
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+
+    async def fetch_detail(self, board_token: str, external_id: str) -> dict:
+        r = await self.get(f"{self.base_url}/{board_token}/jobs/{external_id}", board_token=board_token, detail=True)
         r.raise_for_status()
         return r.json()
+
+    def normalize(self, raw: dict) -> dict | None:
+        # Greenhouse jobs fields (common):
+        # id, title, location: {name}, absolute_url, updated_at, content (?content=true)
+        title = raw.get("title") or ""
+        if not title:
+            return None
+        job_id = raw.get("id")
+        return {
+            "external_id": str(job_id) if job_id is not None else None,
+            "watermark": str(raw.get("updated_at") or ""),
+            "role_title": title,
+            "location": (raw.get("location") or {}).get("name"),
+            "url": raw.get("absolute_url"),
+            "jd_text": raw.get("content") or None,
+        }
+
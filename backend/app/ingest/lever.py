@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from app.core.config import LEVER_API_BASE
+from app.ingest.base import SourceAdapter, conditional_headers, content_watermark
+
+
+class LeverAdapter(SourceAdapter):
+    """
+    Lever public postings API：
+    - GET {base}/{company}?mode=json        列表（每条都带 description）
+    - GET {base}/{company}/{id}?mode=json   详情
+
+    Lever 没有 updated_at，watermark 用关键字段哈希。
+    """
+
+    name = "lever"
+    default_base_url = LEVER_API_BASE
+
+    async def list_jobs(
+        self,
+        board_token: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        with_content: bool = False,
+    ) -> dict:
+        r = await self.get(
+            f"{self.base_url}/{board_token}",
+            board_token=board_token,
+            headers=conditional_headers(etag, last_modified),
+            params={"mode": "json"},
+        )
+
+        if r.status_code == 304:
+            return {"not_modified": True, "jobs": [], "etag": etag, "last_modified": last_modified}
+
+        r.raise_for_status()
+        data = r.json()
+        return {
+            "not_modified": False,
+            "jobs": data if isinstance(data, list) else [],
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+
+    async def fetch_detail(self, board_token: str, external_id: str) -> dict:
+        r = await self.get(
+            f"{self.base_url}/{board_token}/{external_id}",
+            board_token=board_token,
+            detail=True,
+            params={"mode": "json"},
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def detail_content(self, detail: dict) -> str | None:
+        return detail.get("description") or detail.get("descriptionPlain")
+
+    def normalize(self, raw: dict) -> dict | None:
+        # Lever postings fields (common):
+        # id, text, categories: {location, team, commitment}, hostedUrl, description, createdAt
+        title = raw.get("text") or ""
+        if not title:
+            return None
+        location = (raw.get("categories") or {}).get("location")
+        jd_text = self.detail_content(raw)
+        return {
+            "external_id": raw.get("id"),
+            "watermark": content_watermark(title, location, raw.get("hostedUrl"), jd_text),
+            "role_title": title,
+            "location": location,
+            "url": raw.get("hostedUrl"),
+            "jd_text": jd_text,
+        }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from app.core.config import INGEST_MAX_CONCURRENCY, INGEST_HOST_RATE, INGEST_HOST_BURST
+
+
+class TokenBucket:
+    """经典令牌桶：每秒补 rate 个令牌，最多 burst 个；拿不到就 sleep 到下一个令牌"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """返回等待的秒数（用于统计）"""
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    所有 board / 所有后台任务共用的出站限流：
+    - 全局并发上限（同时在飞的请求数）
+    - 每个 host 一个令牌桶（boards-api.greenhouse.io 等）
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = INGEST_MAX_CONCURRENCY,
+        rate: float = INGEST_HOST_RATE,
+        burst: int = INGEST_HOST_BURST,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._sem: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.requests = 0
+        self.throttled_seconds = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # asyncio 原语绑定 event loop；换了 loop（测试 / 脚本）就重建
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._sem
+
+    def bucket(self, host: str) -> TokenBucket:
+        b = self._buckets.get(host)
+        if b is None:
+            b = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return b
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        async with self._semaphore():
+            if self.rate > 0:
+                host = urlsplit(url).hostname or ""
+                self.throttled_seconds += await self.bucket(host).acquire()
+            self.requests += 1
+            yield
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "max_concurrency": self.max_concurrency,
+            "host_rate": self.rate,
+            "host_burst": self.burst,
+        }
+
+
+_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    return _limiter
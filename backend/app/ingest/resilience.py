@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.core.config import (
+    INGEST_BREAKER_RESET,
+    INGEST_BREAKER_THRESHOLD,
+    INGEST_RETRY_AFTER_MAX,
+    INGEST_RETRY_ATTEMPTS,
+    INGEST_RETRY_BASE_DELAY,
+    INGEST_RETRY_MAX_DELAY,
+)
+
+# 这些状态码说明上游暂时不行，值得重试
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """熔断中：请求没有发出去"""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 可以是秒数，也可以是 HTTP-date"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        *,
+        attempts: int = INGEST_RETRY_ATTEMPTS,
+        base_delay: float = INGEST_RETRY_BASE_DELAY,
+        max_delay: float = INGEST_RETRY_MAX_DELAY,
+        max_retry_after: float = INGEST_RETRY_AFTER_MAX,
+    ):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float | None:
+        """
+        第 attempt 次（从 0 开始）失败后要等多久；None = 不再重试。
+        full jitter：uniform(0, min(max_delay, base * 2^attempt))，
+        上游给了 Retry-After 就至少等那么久（太久则放弃）。
+        """
+        if attempt + 1 >= self.attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    closed -> 连续失败 threshold 次 -> open（直接拒绝）
+    open   -> reset 秒后 -> half-open（只放一个探测请求，成功关闭，失败重新打开）
+    """
+
+    def __init__(self, *, threshold: int = INGEST_BREAKER_THRESHOLD, reset_seconds: float = INGEST_BREAKER_RESET):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """返回这次失败是否让熔断器（重新）打开"""
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.threshold):
+            self.opened_at = time.monotonic()
+            self._probing = False
+            return True
+        return False
+
+
+class Resilience:
+    """所有出站请求共用的重试策略 + 按 key（host/board）的熔断器 + 计数"""
+
+    def __init__(self, policy: RetryPolicy | None = None, **breaker_kwargs):
+        self.policy = policy or RetryPolicy()
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        self.retries = 0
+        self.short_circuits = 0
+        self.trips = 0
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        b = self._breakers.get(key)
+        if b is None:
+            b = self._breakers[key] = CircuitBreaker(**self._breaker_kwargs)
+        return b
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "short_circuits": self.short_circuits,
+            "trips": self.trips,
+            "open_circuits": sorted(k for k, b in self._breakers.items() if b.state != "closed"),
+        }
+
+
+_resilience = Resilience()
+
+
+def get_resilience() -> Resilience:
+    return _resilience
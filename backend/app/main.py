@@ -1,6 +1,17 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.core.config import COMPANY_PREFIX_INDEX_ENABLED, CRAWL_SCHEDULER_ENABLED, FINGERPRINT_INDEX_ENABLED
 from app.core.database import test_db_connection
+from app.core.http import start_http_client, close_http_client
+from app.crud.company_prefix_index import load_company_prefix_index
+from app.crud.company_trigram_index import run_company_trigram_refresher
+from app.crud.fingerprint_index import load_fingerprint_index
+from app.services.crawl_scheduler import get_crawl_scheduler
+from app.services.job_runner import get_job_runner
 from app.api.v1 import all_routers
 from app.web import router as web_router
 
@@ -8,7 +19,53 @@ from app.web import router as web_router
 import app.models
 from app.core.database import Base, engine
 
-app = FastAPI(title="JobTrackIQ API")
+
+logger = logging.getLogger(__name__)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    # 后台任务的异常当场记日志，不等到 "Task exception was never retrieved"
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background: list[asyncio.Task] = []
+
+    def _background(coro, name: str) -> None:
+        task = asyncio.create_task(coro, name=name)
+        task.add_done_callback(_log_failure)
+        background.append(task)
+
+    # 共享的出站 HTTP 连接池（Greenhouse 等抓取共用）
+    await start_http_client()
+    # fingerprint 集合后台加载，加载完之前去重照旧查库
+    if FINGERPRINT_INDEX_ENABLED:
+        _background(asyncio.to_thread(load_fingerprint_index), "fingerprint-index-loader")
+    # 公司名前缀索引同样后台加载，加载完之前 /companies/suggest 查库
+    if COMPANY_PREFIX_INDEX_ENABLED:
+        _background(asyncio.to_thread(load_company_prefix_index), "company-prefix-index-loader")
+    # SQLite 上模糊联想用进程内三元组索引：后台加载 + 定期刷新，加载完之前只有前缀命中
+    if engine.dialect.name == "sqlite":
+        _background(run_company_trigram_refresher(), "company-trigram-refresher")
+    # 后台抓取队列（提交后轮询 /api/v1/ingest/jobs/{id}）
+    await get_job_runner().start()
+    # 定时抓取 crawl_boards 里的 board（默认关闭）
+    if CRAWL_SCHEDULER_ENABLED:
+        await get_crawl_scheduler().start()
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await get_crawl_scheduler().stop()
+        await get_job_runner().stop()
+        await close_http_client()
+
+
+app = FastAPI(title="JobTrackIQ API", lifespan=lifespan)
 
 # API 路由
 for r in all_routers:
@@ -13,4 +13,7 @@ from app.models.company_index import CompanyIndex  # noqa: F401
 from app.models.role import Role  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.job_posting import JobPosting  # noqa: F401
-
+from app.models.board_ingest_state import BoardIngestState  # noqa: F401
+from app.models.ingest_job import IngestJob  # noqa: F401
+from app.models.crawl_board import CrawlBoard  # noqa: F401
+from app.models.jd_blob import JdBlob  # noqa: F401
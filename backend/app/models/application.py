@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Integer, Text
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -10,6 +10,16 @@ from app.core.database import Base
 class Application(Base):
     __tablename__ = "applications"
 
+    # keyset 分页：list_applications 每种排序都是 ORDER BY (列, id)
+    __table_args__ = (
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_updated_at_id", "updated_at", "id"),
+        Index("ix_applications_company_name_id", "company_name", "id"),
+        Index("ix_applications_role_title_id", "role_title", "id"),
+        # 按状态筛选的默认列表：WHERE status ORDER BY (created_at, id)
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     company_name: Mapped[str] = mapped_column(String(200), index=True)
@@ -21,11 +31,34 @@ class Application(Base):
     status: Mapped[str] = mapped_column(String(40), default="active")
     current_stage: Mapped[str] = mapped_column(String(60), default="applied")
 
-    jd_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # 批量导入时的 ref（app.services.importer）：重跑 / 分文件导入按它找回已导入的 application
+    external_ref: Mapped[Optional[str]] = mapped_column(String(200), nullable=True, unique=True, index=True)
+
+    # JD 正文在 jd_blobs（压缩 + 去重），这里只存引用
+    jd_hash: Mapped[Optional[str]] = mapped_column(ForeignKey("jd_blobs.hash"), nullable=True, index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # 最近一条事件（(event_time, id) 最大的那条）：add_event / delete_event 在同一个事务里维护，
+    # 列表页不用再 GROUP BY 查 events。不加外键：和 events.application_id 互相引用，删除顺序会很麻烦
+    last_event_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_event_type: Mapped[Optional[str]] = mapped_column(String(60), nullable=True)
+    last_event_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
     events = relationship("Event", back_populates="application", cascade="all, delete-orphan")
+
+
+# 最近活动时间：有事件 = 最近一条事件的时间，没有 = 创建时间（非空，能做 keyset 排序）。
+# 排序 / 筛选都用这个表达式，才能走下面的表达式索引
+last_activity_at = func.coalesce(Application.last_event_at, Application.created_at)
+
+Index("ix_applications_last_activity_id", last_activity_at, Application.id)
+# 导入时按公司 + 职位（不区分大小写）找回已有的 application（app.services.importer）
+Index(
+    "ix_applications_lower_company_role",
+    func.lower(Application.company_name),
+    func.lower(Application.role_title),
+)
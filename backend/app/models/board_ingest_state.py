@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Boolean, JSON, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class BoardIngestState(Base):
+    """
+    每个 board 的增量抓取状态：
+    - etag / last_modified：列表接口的条件请求头
+    - job_watermarks：{external job id: updated_at}，用来跳过没变的 job
+    """
+
+    __tablename__ = "board_ingest_states"
+
+    __table_args__ = (
+        UniqueConstraint("source", "board_token", name="uq_board_ingest_states_source_board"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    board_token: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    job_watermarks: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    # 上次是否抓了 JD：没抓过的话，这次要 JD 就得全量重抓
+    with_jd: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
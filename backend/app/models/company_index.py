@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
-from app.db import Base
 
 
 
@@ -16,6 +15,15 @@ class CompanyIndex(Base):
     __table_args__ = (
 
         UniqueConstraint("normalized_name", name="uq_company_index_normalized_name"),
+        # 模糊联想：pg_trgm 的 GIN 索引（只在 PostgreSQL 上建；SQLite 用进程内三元组索引）
+        Index(
+            "ix_company_index_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # 前缀联想查库兜底：search_key 前缀范围 + 按热度排序
+        Index("ix_company_index_search_key_popularity", "search_key", "popularity", "last_seen_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -26,6 +34,9 @@ class CompanyIndex(Base):
     # 归一化后的名字（用于搜索 & 去重）
     normalized_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
 
+    # 模糊匹配用：normalized_name 只留字母数字（"Open AI Inc" -> "openaiinc"）
+    search_key: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+
     # 来源：user_input / crawler / seed
     source: Mapped[str] = mapped_column(String(50), nullable=False, default="user_input")
 
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Boolean, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+
+class CrawlBoard(Base):
+    """
+    定时抓取的 board 注册表：company_index 的一家公司 -> 一个 ATS board。
+    next_run_at 由调度器（app.services.crawl_scheduler）按热度 / 活跃度计算。
+    """
+
+    __tablename__ = "crawl_boards"
+
+    __table_args__ = (
+        UniqueConstraint("source", "board_token", name="uq_crawl_boards_source_board"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    company_id: Mapped[int] = mapped_column(
+        ForeignKey("company_index.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    source: Mapped[str] = mapped_column(String(50), nullable=False, default="greenhouse")
+    board_token: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    fetch_jd: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+
+    next_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # ok / failed
+    last_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # 连续失败次数（调度间隔按 2^n 退避）
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    company = relationship("CompanyIndex")
+
+    @property
+    def company_name(self) -> str | None:
+        return self.company.name if self.company else None
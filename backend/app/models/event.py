@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Integer, ForeignKey, Text
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -10,6 +10,13 @@ from app.core.database import Base
 class Event(Base):
     __tablename__ = "events"
 
+    # 单个 application 的时间线 keyset 分页：WHERE application_id ORDER BY (event_time, id)
+    __table_args__ = (
+        Index("ix_events_application_id_event_time_id", "application_id", "event_time", "id"),
+        # 防连点 _is_duplicate_event：WHERE application_id, event_type ORDER BY event_time DESC LIMIT 1
+        Index("ix_events_application_id_event_type_event_time", "application_id", "event_type", "event_time"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id"), index=True)
 
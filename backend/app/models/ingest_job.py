@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Boolean, Text, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# queued -> running -> done / failed
+INGEST_JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class IngestJob(Base):
+    """后台抓取任务（提交后立即返回 id，前端轮询状态）"""
+
+    __tablename__ = "ingest_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    source: Mapped[str] = mapped_column(String(50), nullable=False, default="greenhouse")
+    board_token: Mapped[str] = mapped_column(String(255), nullable=False)
+    company_name: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    fetch_jd: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    full_refresh: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued", index=True)
+
+    # 抓取结果计数（fetched / created / updated ...）
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
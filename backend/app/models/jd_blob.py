@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class JdBlob(Base):
+    """
+    JD 正文（内容寻址）：hash = sha256(归一化后的 JD)，同样的 JD 只存一份。
+    job_postings / applications 只存 jd_hash，正文压缩后放这里，详情页才解压。
+    """
+
+    __tablename__ = "jd_blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # zlib / zstd
+    codec: Mapped[str] = mapped_column(String(10), nullable=False, default="zlib")
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    compressed_size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
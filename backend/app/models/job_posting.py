@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Text, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -12,6 +12,11 @@ class JobPosting(Base):
 
     __table_args__ = (
         UniqueConstraint("fingerprint", name="uq_job_postings_fingerprint"),
+        Index("ix_job_postings_source_board_external", "source", "board_token", "external_id"),
+        # Job Inbox “New since last crawl”：WHERE is_new ORDER BY created_at DESC
+        Index("ix_job_postings_is_new_created_at", "is_new", "created_at"),
+        # keyset 分页：ORDER BY (created_at, id)
+        Index("ix_job_postings_created_at_id", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -26,8 +31,17 @@ class JobPosting(Base):
     url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     posted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
-    jd_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 抓取来源里的 board / job id（手动录入为空）
+    board_token: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    external_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    # JD 正文在 jd_blobs（压缩 + 去重），这里只存引用
+    jd_hash: Mapped[str | None] = mapped_column(ForeignKey("jd_blobs.hash"), nullable=True, index=True)
 
     fingerprint: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
 
+    # 抓取快照：最近一次抓取新出现的 = is_new；从 board 上消失的记 closed_at
+    is_new: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
@@ -18,15 +18,43 @@ class ApplicationOut(BaseModel):
     location: str | None
     status: str
     current_stage: str
+    jd_hash: str | None = None
     created_at: datetime
     updated_at: datetime
+    last_event_id: int | None = None
+    last_event_type: str | None = None
+    last_event_at: datetime | None = None
 
     model_config = {"from_attributes": True}
 
+
+class ApplicationDetailOut(ApplicationOut):
+    jd_text: str | None = None
+
+
+class ApplicationFieldsOut(BaseModel):
+    """
+    列表接口的 ?fields= 稀疏字段：字段都可选，配合 response_model_exclude_unset
+    只输出请求的那几个（id 总是有）
+    """
+    id: int
+    company_name: str | None = None
+    role_title: str | None = None
+    channel: str | None = None
+    location: str | None = None
+    status: str | None = None
+    current_stage: str | None = None
+    jd_hash: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    last_event_id: int | None = None
+    last_event_type: str | None = None
+    last_event_at: datetime | None = None
+
 from typing import List
 from pydantic import BaseModel
 
 class ApplicationListOut(BaseModel):
     total: int
-    items: List["ApplicationOut"]
+    items: List["ApplicationFieldsOut"]
 
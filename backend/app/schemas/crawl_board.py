@@ -0,0 +1,32 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from app.schemas.ingest import SOURCE_PATTERN
+
+
+class CrawlBoardCreate(BaseModel):
+    source: str = Field(default="greenhouse", pattern=SOURCE_PATTERN)
+    board_token: str = Field(min_length=1, max_length=255)
+    company_name: str | None = Field(default=None, max_length=255)
+    fetch_jd: bool = True
+
+
+class CrawlBoardOut(BaseModel):
+    id: int
+    company_id: int
+    company_name: str | None = None
+    source: str
+    board_token: str
+    fetch_jd: bool
+    enabled: bool
+    next_run_at: datetime | None
+    last_run_at: datetime | None
+    last_status: str | None
+    last_error: str | None
+    last_duration_ms: int | None
+    consecutive_failures: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
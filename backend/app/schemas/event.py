@@ -16,3 +16,25 @@ class EventOut(BaseModel):
     notes: str | None
 
     model_config = {"from_attributes": True}
+
+
+class EventBatchItem(EventCreate):
+    application_id: int
+
+
+class EventBatchCreate(BaseModel):
+    events: list[EventBatchItem] = Field(min_length=1, max_length=5000)
+
+
+class EventBatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    event: EventOut | None = None
+    error: str | None = None
+
+
+class EventBatchOut(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: list[EventBatchItemResult]
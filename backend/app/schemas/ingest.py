@@ -0,0 +1,17 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+
+# 与 app.ingest.adapters.ADAPTERS 保持一致
+SOURCE_PATTERN = "^(greenhouse|lever)$"
+
+
+class BoardRef(BaseModel):
+    source: str = Field(default="greenhouse", pattern=SOURCE_PATTERN)
+    board_token: str = Field(min_length=1, max_length=255)
+    company_name: str | None = Field(default=None, max_length=255)
+
+
+class IngestBatchCreate(BaseModel):
+    boards: list[BoardRef] = Field(min_length=1, max_length=500)
+    fetch_jd: bool = False
+    full_refresh: bool = False
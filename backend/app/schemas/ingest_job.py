@@ -0,0 +1,31 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from app.schemas.ingest import SOURCE_PATTERN
+
+
+class IngestJobCreate(BaseModel):
+    source: str = Field(default="greenhouse", pattern=SOURCE_PATTERN)
+    board_token: str = Field(min_length=1, max_length=255)
+    company_name: str | None = Field(default=None, max_length=255)
+    fetch_jd: bool = False
+    full_refresh: bool = False
+
+
+class IngestJobOut(BaseModel):
+    id: int
+    source: str
+    board_token: str
+    company_name: str
+    fetch_jd: bool
+    full_refresh: bool
+    status: str
+    result: dict | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    class Config:
+        from_attributes = True
@@ -19,9 +19,35 @@ class JobPostingOut(BaseModel):
     location: str | None
     url: str | None
     posted_at: datetime | None
-    jd_text: str | None
+    # JD 正文在 jd_blobs；列表只给引用，详情接口才返回 jd_text
+    jd_hash: str | None = None
     fingerprint: str
+    is_new: bool = False
+    closed_at: datetime | None = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class JobPostingDetailOut(JobPostingOut):
+    jd_text: str | None = None
+
+
+class JobPostingFieldsOut(BaseModel):
+    """
+    列表接口的 ?fields= 稀疏字段：字段都可选，配合 response_model_exclude_unset
+    只输出请求的那几个（id 总是有）
+    """
+    id: int
+    source: str | None = None
+    company_name: str | None = None
+    role_title: str | None = None
+    location: str | None = None
+    url: str | None = None
+    posted_at: datetime | None = None
+    jd_hash: str | None = None
+    fingerprint: str | None = None
+    is_new: bool | None = None
+    closed_at: datetime | None = None
+    created_at: datetime | None = None
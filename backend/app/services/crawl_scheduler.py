@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from functools import partial
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    CRAWL_BASE_INTERVAL,
+    CRAWL_CONCURRENCY,
+    CRAWL_JITTER,
+    CRAWL_MAX_INTERVAL,
+    CRAWL_MIN_INTERVAL,
+)
+from app.core.database import SessionLocal
+from app.crud.crud_crawl_board import get_crawl_board, list_crawl_boards, record_crawl_board_run
+from app.services.ingestion import db_executor, ingest_board
+
+logger = logging.getLogger(__name__)
+
+# 最近活跃（company_index.last_seen_at）的公司抓得更勤
+RECENT_ACTIVITY = timedelta(days=7)
+# 没有待办时最多睡多久（顺便兜底 wake 丢失）
+IDLE_SECONDS = 60.0
+# 启动时没有 next_run_at 的 board 在这个窗口内随机铺开，避免同时打上游
+STARTUP_SPREAD_SECONDS = 60.0
+
+
+def crawl_interval(
+    *,
+    popularity: int,
+    last_seen_at: datetime | None,
+    failures: int = 0,
+    now: datetime | None = None,
+) -> float:
+    """
+    下次抓取间隔（秒）：
+      base / (1 + log2(popularity))，最近 7 天活跃再减半
+      连续失败按 2^n 退避
+    最后夹在 [CRAWL_MIN_INTERVAL, CRAWL_MAX_INTERVAL]，再加 ±CRAWL_JITTER 抖动
+    """
+    now = now or datetime.utcnow()
+    interval = CRAWL_BASE_INTERVAL / (1 + math.log2(max(1, popularity)))
+    if last_seen_at and now - last_seen_at <= RECENT_ACTIVITY:
+        interval /= 2
+    if failures:
+        interval *= 2 ** min(failures, 10)
+    interval = min(CRAWL_MAX_INTERVAL, max(CRAWL_MIN_INTERVAL, interval))
+    return interval * random.uniform(1 - CRAWL_JITTER, 1 + CRAWL_JITTER)
+
+
+def _percentile(values, pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100.0 * (len(values) - 1))))
+    return round(values[k], 3)
+
+
+class CrawlScheduler:
+    """
+    进程内的定时抓取调度器：
+    - 堆里放 (到期时间, board id)，到期就抓，抓完按热度 / 活跃度算下次时间再放回去
+    - 同时抓取的 board 数受 concurrency（全局预算）限制；出站请求仍走全局限流
+    - next_run_at / 结果写回 crawl_boards，重启后按原计划继续
+    - stats()：调度延迟（到期 -> 开抓）和抓取耗时
+    """
+
+    def __init__(self, concurrency: int = CRAWL_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self._heap: list[tuple[float, int]] = []
+        # board id -> 当前有效的到期时间（堆里旧的条目靠它识别并丢弃）
+        self._due: dict[int, float] = {}
+        self._running: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._loop_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._budget: asyncio.Semaphore | None = None
+
+        self.crawls = 0
+        self.failures = 0
+        self._lags: deque[float] = deque(maxlen=500)
+        self._durations: deque[float] = deque(maxlen=500)
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None
+
+    async def start(self) -> None:
+        if self._loop_task:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._budget = asyncio.Semaphore(self.concurrency)
+
+        def _boards() -> list[tuple[int, datetime | None]]:
+            db = SessionLocal()
+            try:
+                return [(b.id, b.next_run_at) for b in list_crawl_boards(db, enabled_only=True)]
+            finally:
+                db.close()
+
+        now = time.time()
+        for board_id, next_run_at in await asyncio.to_thread(_boards):
+            if next_run_at is None:
+                self._push(board_id, now + random.uniform(0, STARTUP_SPREAD_SECONDS))
+            else:
+                self._push(board_id, _to_ts(next_run_at))
+
+        self._loop_task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._loop_task, *self._tasks) if t]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._tasks = set()
+        self._heap = []
+        self._due = {}
+        self._running = set()
+        self._loop = None
+
+    def schedule(self, board_id: int, when: datetime | None = None) -> None:
+        """（重新）安排一个 board；when=None 表示立刻。可以在同步路由的线程池里调用"""
+        if self._loop is None:
+            return
+        ts = _to_ts(when) if when else time.time()
+        self._loop.call_soon_threadsafe(self._push, board_id, ts)
+
+    def unschedule(self, board_id: int) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._due.pop, board_id, None)
+
+    def _push(self, board_id: int, ts: float) -> None:
+        self._due[board_id] = ts
+        heapq.heappush(self._heap, (ts, board_id))
+        if self._wake:
+            self._wake.set()
+
+    async def _run_loop(self) -> None:
+        assert self._wake is not None and self._budget is not None
+        while True:
+            while self._heap and self._heap[0][0] <= time.time():
+                due, board_id = heapq.heappop(self._heap)
+                if self._due.get(board_id) != due:
+                    continue  # 被重新安排过 / 已取消
+                if board_id in self._running:
+                    continue  # 正在抓：抓完后按 _due 里的时间重新入堆
+
+                # 预算满了就在这里等，等待时间计入调度延迟
+                await self._budget.acquire()
+                if self._due.get(board_id) != due:
+                    self._budget.release()
+                    continue
+                del self._due[board_id]
+                self._lags.append(time.time() - due)
+                self._running.add(board_id)
+
+                task = asyncio.create_task(self._crawl(board_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            timeout = IDLE_SECONDS
+            if self._heap:
+                timeout = min(IDLE_SECONDS, max(0.0, self._heap[0][0] - time.time()))
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _crawl(self, board_id: int) -> None:
+        assert self._budget is not None
+        # 这次抓取的所有 DB 操作（包括 ingest_board 里的）都在同一个专用线程里跑，不挡事件循环
+        executor = db_executor("crawl")
+        loop = asyncio.get_running_loop()
+        db = SessionLocal()
+
+        def _db(fn, *args, **kwargs):
+            return loop.run_in_executor(executor, partial(fn, db, *args, **kwargs))
+
+        def _load(db: Session):
+            board = get_crawl_board(db, board_id)
+            if not board or not board.enabled:
+                return None
+            # 之后 ingest 的 commit 会让 board 过期：要用的字段先在这个线程里取出来
+            params = {
+                "source": board.source,
+                "board_token": board.board_token,
+                "company_name": board.company.name,
+                "fetch_jd": board.fetch_jd,
+            }
+            return board, params
+
+        def _record(db: Session, board, *, ok: bool, error: str | None, duration: float) -> datetime:
+            if not ok:
+                db.rollback()
+            # ingest 会更新 company_index 的 popularity / last_seen_at
+            db.refresh(board.company)
+            interval = crawl_interval(
+                popularity=board.company.popularity,
+                last_seen_at=board.company.last_seen_at,
+                failures=0 if ok else board.consecutive_failures + 1,
+            )
+            next_run_at = datetime.utcnow() + timedelta(seconds=interval)
+            record_crawl_board_run(
+                db,
+                board,
+                ok=ok,
+                error=error,
+                duration_ms=int(duration * 1000),
+                next_run_at=next_run_at,
+            )
+            return next_run_at
+
+        try:
+            loaded = await _db(_load)
+            if loaded is None:
+                return
+            board, params = loaded
+
+            started = time.perf_counter()
+            ok, error = True, None
+            try:
+                await ingest_board(db, **params, executor=executor)
+            except (httpx.HTTPError, ValueError) as e:
+                ok, error = False, f"{params['source']} fetch failed: {e}"
+            except Exception as e:
+                logger.exception("scheduled crawl of board %s failed", board_id)
+                ok, error = False, str(e)
+            duration = time.perf_counter() - started
+
+            self.crawls += 1
+            self.failures += 0 if ok else 1
+            self._durations.append(duration)
+
+            next_run_at = await _db(_record, board, ok=ok, error=error, duration=duration)
+            # 抓取期间被“立即运行”过的话，按那个时间来
+            pending = self._due.get(board_id)
+            self._push(board_id, pending if pending is not None else _to_ts(next_run_at))
+        except Exception:
+            logger.exception("crawl scheduler failed on board %s", board_id)
+        finally:
+            try:
+                await loop.run_in_executor(executor, db.close)
+            finally:
+                executor.shutdown(wait=False)
+                self._running.discard(board_id)
+                self._budget.release()
+
+    def stats(self) -> dict:
+        next_due = min(self._due.values()) if self._due else None
+        return {
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "scheduled": len(self._due),
+            "in_flight": len(self._running),
+            "next_due_in_seconds": round(next_due - time.time(), 1) if next_due is not None else None,
+            "crawls": self.crawls,
+            "failures": self.failures,
+            "lag_seconds_p50": _percentile(self._lags, 50),
+            "lag_seconds_p95": _percentile(self._lags, 95),
+            "lag_seconds_max": round(max(self._lags), 3) if self._lags else None,
+            "duration_seconds_p50": _percentile(self._durations, 50),
+            "duration_seconds_p95": _percentile(self._durations, 95),
+        }
+
+
+def _to_ts(dt: datetime) -> float:
+    # DB 里存的是 naive UTC
+    return (dt - datetime(1970, 1, 1)).total_seconds()
+
+
+_scheduler = CrawlScheduler()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    return _scheduler
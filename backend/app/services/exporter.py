@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Sequence
+
+from sqlalchemy import String, cast, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import EXPORT_CHUNK_ROWS
+from app.core.database import SessionLocal
+from app.crud.crud_jd_blob import get_jd_texts
+from app.models.application import Application
+from app.models.event import Event
+from app.services.importer import ID_REF_PREFIX
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # 可选依赖：只有 Parquet 导出需要
+    pyarrow = None
+
+FORMATS = ("csv", "ndjson", "parquet")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# 一行 = application × 它的一个事件（没有事件的 application 也有一行，事件字段为空）。
+# 导出的文件可以直接再导入（app.services.importer）：ref = 导入时的 ref，没有就是 "id:<application id>"
+# （导回同一个库时按 id 找回原来那条；导到别的库会新建，external_ref 记成这个值），
+# 其余同名字段含义一致；jd_text 只在每个 application 的第一行给（导入也只看第一行）
+EXPORT_COLUMNS = (
+    ("ref", func.coalesce(Application.external_ref, literal(ID_REF_PREFIX) + cast(Application.id, String))),
+    ("application_id", Application.id),
+    ("company_name", Application.company_name),
+    ("role_title", Application.role_title),
+    ("channel", Application.channel),
+    ("location", Application.location),
+    ("status", Application.status),
+    ("current_stage", Application.current_stage),
+    ("jd_hash", Application.jd_hash),
+    ("created_at", Application.created_at),
+    ("updated_at", Application.updated_at),
+    ("event_id", Event.id),
+    ("event_type", Event.event_type),
+    ("event_time", Event.event_time),
+    ("notes", Event.notes),
+)
+# jd_text 不在查询里：按块从 jd_blobs 解压（行里只有 jd_hash）
+COLUMN_NAMES = (*(name for name, _ in EXPORT_COLUMNS), "jd_text")
+_APPLICATION_ID = COLUMN_NAMES.index("application_id")
+_JD_HASH = COLUMN_NAMES.index("jd_hash")
+
+
+def parquet_available() -> bool:
+    return pyarrow is not None
+
+
+def _export_query(*, status: str | None = None, since: datetime | None = None):
+    stmt = (
+        select(*(col.label(name) for name, col in EXPORT_COLUMNS))
+        .select_from(Application)
+        .outerjoin(Event, Event.application_id == Application.id)
+        .order_by(Application.id, Event.event_time, Event.id)
+    )
+    if status:
+        stmt = stmt.where(Application.status == status)
+    if since:
+        stmt = stmt.where(Application.updated_at >= since)
+    return stmt
+
+
+def iter_export_chunks(
+    db: Session,
+    *,
+    status: str | None = None,
+    since: datetime | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[Sequence[tuple]]:
+    """
+    按块取行：yield_per = 服务端游标（PostgreSQL 的 named cursor），
+    每次只从数据库拉 chunk_rows 行，内存和总行数无关；每块的 JD 一次批量取回
+    """
+    result = db.execute(
+        _export_query(status=status, since=since).execution_options(yield_per=chunk_rows)
+    )
+    last_app_id = None
+    try:
+        for rows in result.partitions():
+            # 每个 application 的第一行（按 application id 排序，同一个 application 的行是连着的）
+            firsts = []
+            for r in rows:
+                firsts.append(r[_APPLICATION_ID] != last_app_id)
+                last_app_id = r[_APPLICATION_ID]
+            texts = get_jd_texts(db, (r[_JD_HASH] for r, first in zip(rows, firsts) if first))
+            yield [(*r, texts.get(r[_JD_HASH]) if first else None) for r, first in zip(rows, firsts)]
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _csv_chunks(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def _drain() -> bytes:
+        data = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        return data
+
+    # 表头先发出去：客户端马上就能收到第一个字节
+    writer.writerow(COLUMN_NAMES)
+    yield _drain()
+    for rows in chunks:
+        writer.writerows(
+            tuple(v.isoformat() if isinstance(v, datetime) else v for v in row) for row in rows
+        )
+        yield _drain()
+
+
+def _ndjson_chunks(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(COLUMN_NAMES, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+class _ByteSink(io.RawIOBase):
+    """ParquetWriter 写到这里；每写完一个 row group 就把攒下的字节取走发给客户端"""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet_schema():
+    string, ts, int64 = pyarrow.string(), pyarrow.timestamp("us"), pyarrow.int64()
+    types = {
+        "application_id": int64,
+        "event_id": int64,
+        "created_at": ts,
+        "updated_at": ts,
+        "event_time": ts,
+    }
+    return pyarrow.schema([(name, types.get(name, string)) for name in COLUMN_NAMES])
+
+
+def _parquet_chunks(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    # 每块一个 row group：写完一块就把这块的字节发出去，footer 最后发
+    schema = _parquet_schema()
+    sink = _ByteSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    fmt: str,
+    *,
+    status: str | None = None,
+    since: datetime | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """
+    给 StreamingResponse 用的生成器：自己开 / 关 session（请求的 get_db session 在响应发完之前就会关掉），
+    边查边编码边发
+    """
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    encoders = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}
+    encode = encoders[fmt]
+
+    db = SessionLocal()
+    try:
+        yield from encode(iter_export_chunks(db, status=status, since=since, chunk_rows=chunk_rows))
+    finally:
+        db.close()
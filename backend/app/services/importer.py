@@ -0,0 +1,496 @@
+"""
+Bulk import of applications and their events from CSV / NDJSON.
+
+One record per row (CSV header / NDJSON keys, all optional except as noted):
+
+    ref            external key grouping rows of the same application
+                   (default: company_name + role_title); stored as
+                   applications.external_ref. "id:<n>" (written by the
+                   exporter) also matches application <n>
+    company_name, role_title, channel, location, jd_text
+                   application fields; required on the first row of an application
+    event_type, event_time, notes
+                   one event; event_time is required for imported events
+
+The file is read incrementally and written in batched transactions; the event
+state machine is replayed in memory (no per-row queries). Invalid rows are
+reported and skipped, the rest of the batch is still imported.
+
+Keys are resolved against applications already in the database, so re-running
+a file (or resuming after a failed batch) does not duplicate anything, and a
+later file can add events to applications created by an earlier one. Events
+not newer than an application's latest stored event count as already imported.
+
+    cd backend
+    python -m app.services.importer tracking.csv --batch-size 2000
+    python -m app.services.importer - --format ndjson < tracking.ndjson
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Callable, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+from app.core.database import SessionLocal
+from app.crud import search_index
+from app.crud.counting import get_count_cache
+from app.crud.crud_application import index_applications
+from app.crud.crud_event import _apply_strong_fsm, _utc_naive, refresh_last_events
+from app.crud.crud_jd_blob import put_jd_blobs
+from app.models.application import Application
+from app.models.event import Event
+from app.schemas.application import ApplicationCreate
+from app.schemas.event import EventCreate
+
+FORMATS = ("csv", "ndjson")
+
+# 直接对 Table 做 Core INSERT：ORM 的批量 INSERT 会按“哪些字段是 None”把行切成很多小组，
+# notes / channel 有的有有的没有时就退化成几条一批
+applications = Application.__table__
+events = Event.__table__
+
+APPLICATION_FIELDS = tuple(ApplicationCreate.model_fields)
+EVENT_FIELDS = tuple(EventCreate.model_fields)
+# schema 没限制长度、但列有长度的字段（PostgreSQL 超长会让整批失败，这里先按行拦下）
+LIMITED_FIELDS = {
+    name: applications.c[name].type.length for name in ("channel", "location")
+}
+REF_LENGTH = applications.c.external_ref.type.length
+# 导出（app.services.exporter）时没有 external_ref 的 application 用 "id:<application id>" 当 ref，
+# 导回同一个库时按 id 找回原来那条，不会再建一份
+ID_REF_PREFIX = "id:"
+
+
+def detect_format(filename: str | None) -> str | None:
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """
+    逐行读，不把整个文件读进内存。yield (行号, 行)：
+    CSV 是 dict（行号 = 数据行序号，不算表头），NDJSON 是原始行（行号 = 文件行号，解析留给 _parse_row 按行报错）
+    """
+    if fmt == "csv":
+        for row_no, row in enumerate(csv.DictReader(stream), start=1):
+            yield row_no, row
+    elif fmt == "ndjson":
+        for row_no, line in enumerate(stream, start=1):
+            if line.strip():
+                yield row_no, line
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+@dataclass(slots=True)
+class _Row:
+    row_no: int
+    key: tuple
+    ref: str | None
+    application: ApplicationCreate | None
+    event: EventCreate | None
+
+
+@dataclass(slots=True)
+class _AppState:
+    """导入过的 application 只留这点状态（状态机 + 顺序 / 去重检查），内存随 application 数增长、与行数无关"""
+    id: int | None = None
+    status: str = "active"
+    current_stage: str = "applied"
+    last_event: tuple[datetime, str] | None = None
+    # 数据库里已有的 application：本次运行开始前最近的一条事件，不比它新的算已导入（重跑 / 续传）
+    stored_event: tuple[datetime, str] | None = None
+
+
+def _clean(raw: dict) -> dict:
+    # CSV 空格子 = 没填；多出来的列（DictReader 的 None 键）忽略
+    out = {}
+    for k, v in raw.items():
+        if k is None:
+            continue
+        if isinstance(v, str):
+            v = v.strip() or None
+        out[k.strip()] = v
+    return out
+
+
+def _parse_row(row_no: int, raw: dict | str) -> _Row:
+    """校验一行（复用 ApplicationCreate / EventCreate）；不合法抛 ValueError / ValidationError"""
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("Expected a JSON object")
+    data = _clean(raw)
+    ref = str(data["ref"]) if data.get("ref") is not None else None
+    if ref and len(ref) > REF_LENGTH:
+        raise ValueError(f"ref: longer than {REF_LENGTH} characters")
+
+    application = None
+    if data.get("company_name") or data.get("role_title"):
+        application = ApplicationCreate.model_validate({k: data.get(k) for k in APPLICATION_FIELDS})
+        for name, length in LIMITED_FIELDS.items():
+            value = getattr(application, name)
+            if value and len(value) > length:
+                raise ValueError(f"{name}: longer than {length} characters")
+
+    event = None
+    if data.get("event_type"):
+        event = EventCreate.model_validate({k: data.get(k) for k in EVENT_FIELDS})
+        if event.event_time is None:
+            raise ValueError("event_time is required for imported events")
+        event.event_time = _utc_naive(event.event_time)
+
+    if application is None and event is None:
+        raise ValueError("Row has neither application fields nor an event")
+
+    if ref:
+        key = ("ref", ref)
+    elif application is not None:
+        key = ("name", application.company_name.lower(), application.role_title.lower())
+    else:
+        raise ValueError("Event rows need a ref or company_name + role_title")
+    return _Row(row_no=row_no, key=key, ref=ref, application=application, event=event)
+
+
+def _error_message(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+    return str(e)
+
+
+class ApplicationImporter:
+    """
+    流式导入：每 batch_size 行一个事务。
+
+    每批：这次运行还没见过的 key 按 ref / 公司 + 职位一次 IN 查询找回已有的 application →
+    新 application 一次 INSERT ... RETURNING 拿 id（JD 批量进 jd_blobs）→
+    事件按 event_time 排序后在内存里重放 _apply_strong_fsm（不查库）→ 事件一次 executemany（+ 重算 last_event_*）→
+    之前批次的 application 批量 UPDATE status / current_stage → 全文索引 → commit。
+
+    行级错误（校验失败 / 状态机拒绝 / 早于已导入的事件 / 重复事件）记进报告、跳过该行，不影响同批其他行；
+    数据库错误回滚当前批并抛出（之前的批已提交）
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        max_errors: int = IMPORT_MAX_ERRORS,
+        progress: Callable[[dict], None] | None = None,
+    ) -> None:
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.max_errors = max_errors
+        self.progress = progress
+        self._apps: dict[tuple, _AppState] = {}
+        self.summary = {
+            "rows": 0,
+            "applications": 0,
+            "events": 0,
+            "skipped": 0,
+            "errors": 0,
+            "batches": 0,
+            "seconds": None,
+        }
+        self.error_details: list[dict] = []
+
+    def _error(self, row_no: int, ref: str | None, message: str) -> None:
+        self.summary["errors"] += 1
+        if len(self.error_details) < self.max_errors:
+            self.error_details.append({"row": row_no, "ref": ref, "error": message})
+
+    def run(self, records: Iterable[tuple[int, dict | str]]) -> dict:
+        started = time.perf_counter()
+        batch: list[_Row] = []
+        for row_no, raw in records:
+            self.summary["rows"] += 1
+            try:
+                batch.append(_parse_row(row_no, raw))
+            except (ValueError, ValidationError) as e:
+                ref = raw.get("ref") if isinstance(raw, dict) else None
+                self._error(row_no, ref or None, _error_message(e))
+                continue
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+
+        self.summary["seconds"] = round(time.perf_counter() - started, 3)
+        return {
+            **self.summary,
+            # 状态机错误在批末才知道，按行号排一下
+            "error_details": sorted(self.error_details, key=lambda e: e["row"]),
+            "errors_truncated": self.summary["errors"] > len(self.error_details),
+        }
+
+    def _write_batch(self, rows: list[_Row]) -> None:
+        try:
+            self._write(rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        # 新 application / 状态机可能改了 status（列表的过滤条件）
+        get_count_cache().bump("applications")
+        self.summary["batches"] += 1
+        if self.progress is not None:
+            self.progress(self.summary)
+
+    def _resolve_existing(self, rows: list[_Row]) -> None:
+        """
+        本批里这次运行还没见过的 key，查回数据库里已有的 application（状态 + 最近事件）：
+        ref 按 external_ref（external_ref 里没有的 "id:<n>" 再按 id 找没有 external_ref 的那条）；
+        没有 ref 的按公司 + 职位（只匹配没有 external_ref 的，多条取 id 最小的）
+        """
+        refs: set[str] = set()
+        names: set[tuple[str, str]] = set()
+        for row in rows:
+            if row.key in self._apps:
+                continue
+            if row.key[0] == "ref":
+                refs.add(row.ref)
+            else:
+                names.add(row.key[1:])
+
+        cols = (
+            Application.id,
+            Application.status,
+            Application.current_stage,
+            Application.last_event_at,
+            Application.last_event_type,
+        )
+        found: list[tuple[tuple, tuple]] = []
+        if refs:
+            found += [
+                (("ref", ref), state)
+                for ref, *state in self.db.execute(
+                    select(Application.external_ref, *cols).where(Application.external_ref.in_(refs))
+                )
+            ]
+        id_refs = {
+            int(ref[len(ID_REF_PREFIX):]): ref
+            for ref in refs - {key[1] for key, _ in found}
+            if ref.startswith(ID_REF_PREFIX) and ref[len(ID_REF_PREFIX):].isdigit()
+        }
+        if id_refs:
+            found += [
+                (("ref", id_refs[app_id]), (app_id, *state))
+                for external_ref, app_id, *state in self.db.execute(
+                    select(Application.external_ref, *cols).where(Application.id.in_(id_refs))
+                )
+                if external_ref is None
+            ]
+        if names:
+            # 和 key 一样不区分大小写；单独的公司名 IN 让 SQLite 能走 ix_applications_lower_company_role
+            company, role = func.lower(Application.company_name), func.lower(Application.role_title)
+            # external_ref IS NULL 放在 Python 里过滤：写在 SQL 里 SQLite 会改走 external_ref 索引（几乎全是 NULL）
+            found += [
+                (("name", company_key, role_key), state)
+                for company_key, role_key, external_ref, *state in self.db.execute(
+                    select(company, role, Application.external_ref, *cols)
+                    .where(company.in_({c for c, _ in names}), tuple_(company, role).in_(names))
+                    .order_by(Application.id.desc())
+                )
+                if external_ref is None
+            ]
+        for key, (app_id, status, current_stage, last_event_at, last_event_type) in found:
+            last_event = (last_event_at, last_event_type) if last_event_at is not None else None
+            # 按 id 倒序查的：同名多条时最后写进去的是 id 最小的
+            self._apps[key] = _AppState(app_id, status, current_stage, last_event, last_event)
+
+    def _write(self, rows: list[_Row]) -> None:
+        db = self.db
+
+        # 0) 已经在数据库里的 application（之前的运行 / 别的文件导入的，或者手工建的）
+        self._resolve_existing(rows)
+
+        # 1) 本批第一次出现的 application（后面重复的公司 / 职位字段忽略）
+        created: dict[tuple, ApplicationCreate] = {}
+        for row in rows:
+            if row.application is not None and row.key not in self._apps:
+                created.setdefault(row.key, row.application)
+        new_states = {key: _AppState() for key in created}
+
+        # 2) 按 event_time 重放状态机（同一时间按行号），被拒的行不改状态
+        accepted: list[tuple[tuple, _AppState, EventCreate]] = []
+        for row in sorted((r for r in rows if r.event is not None), key=lambda r: (r.event.event_time, r.row_no)):
+            state = new_states.get(row.key) or self._apps.get(row.key)
+            if state is None:
+                self._error(row.row_no, row.ref, "Unknown application: its first row must include company_name and role_title")
+                continue
+            event = row.event
+            stored = state.stored_event
+            if stored is not None and (event.event_time < stored[0] or (event.event_time, event.event_type) == stored):
+                self.summary["skipped"] += 1
+                continue
+            if state.last_event is not None:
+                if event.event_time < state.last_event[0]:
+                    self._error(row.row_no, row.ref, "event_time is earlier than an already imported event of this application")
+                    continue
+                if (event.event_time, event.event_type) == state.last_event:
+                    self._error(row.row_no, row.ref, "Duplicate event")
+                    continue
+            try:
+                _apply_strong_fsm(state, event.event_type)
+            except ValueError as e:
+                self._error(row.row_no, row.ref, str(e))
+                continue
+            state.last_event = (event.event_time, event.event_type)
+            accepted.append((row.key, state, event))
+
+        # 3) 新 application：创建时间 = 最早的事件时间（没有事件就是现在）
+        if created:
+            keys = list(created)
+            first_event_at: dict[tuple, datetime] = {}
+            for key, _, event in accepted:
+                first_event_at.setdefault(key, event.event_time)
+            hashes = put_jd_blobs(db, [created[k].jd_text for k in keys])
+            now = datetime.utcnow()
+            params = []
+            for key, jd_hash in zip(keys, hashes):
+                state = new_states[key]
+                params.append(
+                    {
+                        **created[key].model_dump(exclude={"jd_text"}),
+                        "external_ref": key[1] if key[0] == "ref" else None,
+                        "jd_hash": jd_hash,
+                        "status": state.status,
+                        "current_stage": state.current_stage,
+                        "created_at": first_event_at.get(key, now),
+                        "updated_at": now,
+                    }
+                )
+            # 要按参数顺序拿回 id；SQLite 上 sort_by_parameter_order 会退化成一行一条 INSERT，
+            # 而 SQLite 的 rowid 按插入顺序递增，直接批量插入再排序就是参数顺序
+            sqlite = db.bind.dialect.name == "sqlite"
+            ids = db.execute(
+                insert(applications).returning(applications.c.id, sort_by_parameter_order=not sqlite), params
+            ).scalars().all()
+            if sqlite:
+                ids.sort()
+            for key, app_id in zip(keys, ids):
+                new_states[key].id = app_id
+            self._apps.update(new_states)
+
+        # 4) 事件一次写入
+        if accepted:
+            db.execute(
+                insert(events),
+                [
+                    {
+                        "application_id": state.id,
+                        "event_type": event.event_type,
+                        "event_time": event.event_time,
+                        "notes": event.notes,
+                    }
+                    for _, state, event in accepted
+                ],
+            )
+            # last_event_*：事件 id 是数据库分配的，写完按 events 一条 UPDATE 重算
+            refresh_last_events(db, [state.id for _, state, _ in accepted])
+
+        # 5) 之前批次导入的 application：状态机结果按主键批量 UPDATE
+        touched = {key: state for key, state, _ in accepted if key not in new_states}
+        if touched:
+            db.execute(
+                update(Application),
+                [{"id": s.id, "status": s.status, "current_stage": s.current_stage} for s in touched.values()],
+            )
+
+        # 6) 全文索引：新 application 直接用内存里的 JD + 备注；老的有新备注才重建（要读之前的备注）
+        notes: dict[tuple, list[str]] = defaultdict(list)
+        for key, _, event in accepted:
+            if event.notes:
+                notes[key].append(event.notes)
+        search_index.index_docs(
+            db,
+            "applications",
+            [
+                search_index.SearchDoc(
+                    id=new_states[key].id,
+                    title=search_index.title_of(data.company_name, data.role_title),
+                    location=data.location,
+                    body="\n".join([data.jd_text or "", *notes[key]]),
+                )
+                for key, data in created.items()
+            ],
+        )
+        reindex = [self._apps[key].id for key in notes if key not in new_states]
+        if reindex:
+            index_applications(db, db.query(Application).filter(Application.id.in_(reindex)))
+
+        self.summary["applications"] += len(created)
+        self.summary["events"] += len(accepted)
+
+
+def import_applications(
+    db: Session,
+    stream: IO[str],
+    *,
+    fmt: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """从文本流导入（fmt = csv / ndjson），返回汇总 + 行级错误"""
+    importer = ApplicationImporter(db, batch_size=batch_size, progress=progress)
+    return importer.run(iter_records(stream, fmt))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import applications and their events from CSV / NDJSON.")
+    parser.add_argument("path", help="CSV / NDJSON file, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--quiet", action="store_true", help="no per-batch progress on stderr")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    def _progress(summary: dict) -> None:
+        print(
+            f"batch {summary['batches']}: rows={summary['rows']} applications={summary['applications']} "
+            f"events={summary['events']} errors={summary['errors']}",
+            file=sys.stderr,
+        )
+
+    if args.path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    else:
+        stream = open(args.path, encoding="utf-8-sig", newline="")
+
+    db = SessionLocal()
+    try:
+        with stream:
+            result = import_applications(
+                db, stream, fmt=fmt, batch_size=args.batch_size, progress=None if args.quiet else _progress
+            )
+    finally:
+        db.close()
+
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
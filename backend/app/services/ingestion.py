@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import INGEST_BOARD_CONCURRENCY, INGEST_MAX_CONCURRENCY, INGEST_WRITE_BATCH
+from app.core.database import SessionLocal
+from app.crud.crud_company import upsert_company_index
+from app.crud.crud_ingest_state import get_board_state, save_board_state
+from app.crud.crud_job_posting import apply_board_snapshot, board_has_new_postings, bulk_upsert_job_postings
+from app.ingest.adapters import get_adapter
+from app.ingest.base import SourceAdapter
+
+
+def db_executor(name: str) -> ThreadPoolExecutor:
+    """单线程 executor：一个 session 的所有 DB 操作都放到这里跑（不挡事件循环，session 也不跨线程）"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+
+async def _produce(
+    adapter: SourceAdapter,
+    board_token: str,
+    *,
+    ready: list[tuple[dict, str | None]],
+    need_detail: list[dict],
+    queue: asyncio.Queue,
+    workers: int,
+) -> None:
+    """
+    生产者：先放列表里已经有 JD 的，再由 workers 个协程逐个抓详情放进队列。
+    队列有上限，写库跟不上时这里会被 put() 挡住（背压），内存不随 board 大小增长。
+    JD 抓失败放 None。全局并发 / 限速 / 重试仍由 http_get 控制。
+    """
+    pending = iter(need_detail)
+
+    async def _worker() -> None:
+        for job in pending:
+            try:
+                jd = await adapter.fetch_jd(board_token, job["external_id"])
+            except Exception:
+                jd = None
+            await queue.put((job, jd))
+
+    try:
+        for entry in ready:
+            await queue.put(entry)
+        await asyncio.gather(*(_worker() for _ in range(max(1, workers))))
+    except Exception:
+        await queue.put(None)
+        raise
+    # 结束标记：写库端收到 None 就停
+    await queue.put(None)
+
+
+async def ingest_board(
+    db: Session,
+    *,
+    source: str,
+    board_token: str,
+    company_name: str,
+    fetch_jd: bool = False,
+    incremental: bool = True,
+    adapter: SourceAdapter | None = None,
+    executor: ThreadPoolExecutor | None = None,
+) -> dict:
+    """
+    所有来源共用的抓取 pipeline（来源差异都在 adapter 里）：
+    1) 带 ETag / Last-Modified 发条件请求，304 直接返回（零 DB 写）
+    2) normalize + 按 external_id 去重，只处理 watermark 变了的 job
+    3) 列表里没带 JD 的才逐个请求详情（受全局限流 / 重试 / 按 board 熔断）
+    4) 边抓边写：详情经有界队列流给写库端，每 INGEST_WRITE_BATCH 条 bulk upsert 一次；
+       最后保存新的 watermark（JD 抓失败的 job 保留旧 watermark，下次重试）
+    5) 和上一轮快照做集合差：新出现的标 is_new，消失的批量标 closed_at
+
+    所有 DB 操作都在一个专用线程里跑：不挡事件循环，db session 也始终在同一个线程上用。
+    调用方自己还要用这个 session 的话传自己的 executor（db_executor()），前后的 DB 操作也放在里面跑；
+    不传就为这个 board 建一个。
+    列表抓取失败会直接抛异常，由调用方决定怎么报错。
+    """
+    own_executor = executor is None
+    executor = executor or db_executor(f"ingest-{source}")
+    try:
+        return await _ingest_board(
+            db,
+            executor,
+            source=source,
+            board_token=board_token,
+            company_name=company_name,
+            fetch_jd=fetch_jd,
+            incremental=incremental,
+            adapter=adapter or get_adapter(source),
+        )
+    finally:
+        if own_executor:
+            # 等 DB 线程上正在跑的操作结束（被取消时也一样），调用方之后再 rollback / close 才安全
+            await asyncio.to_thread(executor.shutdown)
+
+
+async def _ingest_board(
+    db: Session,
+    executor: ThreadPoolExecutor,
+    *,
+    source: str,
+    board_token: str,
+    company_name: str,
+    fetch_jd: bool,
+    incremental: bool,
+    adapter: SourceAdapter,
+) -> dict:
+    loop = asyncio.get_running_loop()
+
+    def _db(fn, **kwargs):
+        # 在 DB 线程里跑 fn(db, **kwargs)
+        return loop.run_in_executor(executor, partial(fn, db, **kwargs))
+
+    def _get_state(db: Session):
+        state = get_board_state(db, source=source, board_token=board_token)
+        # 脱离 session：后面各批的 commit 不会让它过期（过期了再读属性就会在事件循环线程里查库）
+        if state is not None:
+            db.expunge(state)
+        return state
+
+    state = await _db(_get_state)
+
+    watermarks: dict[str, str] = {}
+    etag = last_modified = None
+    # 上次没抓 JD、这次要 JD：不能复用 watermark，否则没变的 job 永远拿不到 JD
+    if incremental and state and (state.with_jd or not fetch_jd):
+        watermarks = state.job_watermarks or {}
+        etag, last_modified = state.etag, state.last_modified
+
+    # 要 JD 时尽量让列表直接带上 JD（Greenhouse: ?content=true）
+    listing = await adapter.list_jobs(
+        board_token,
+        etag=etag,
+        last_modified=last_modified,
+        with_content=fetch_jd,
+    )
+
+    summary = {
+        "source": source,
+        "board": board_token,
+        "not_modified": listing["not_modified"],
+        "fetched": len(listing["jobs"]),
+        "changed": 0,
+        "unchanged": 0,
+        "created": 0,
+        "existing": 0,
+        "updated": 0,
+        "added": 0,
+        "removed": 0,
+        "detail_fetches": 0,
+        # JD 没抓到的 job（详情请求失败 / 被熔断）：照样入库，保留旧 watermark 下次重试
+        "jd_failures": 0,
+        "retries": 0,
+        "short_circuits": 0,
+    }
+    if listing["not_modified"]:
+        summary.update(adapter.counters)
+        return summary
+
+    jobs: list[dict] = []
+    seen_ids: set[str] = set()
+    for raw in listing["jobs"]:
+        job = adapter.normalize(raw)
+        if not job:
+            continue
+        if job["external_id"] is not None:
+            if job["external_id"] in seen_ids:
+                continue
+            seen_ids.add(job["external_id"])
+        jobs.append(job)
+
+    changed = [
+        j for j in jobs
+        if j["external_id"] is None or watermarks.get(j["external_id"]) != j["watermark"]
+    ]
+    summary["changed"] = len(changed)
+    summary["unchanged"] = len(jobs) - len(changed)
+
+    # 列表里缺 JD 的才回退到逐个请求详情
+    ready: list[tuple[dict, str | None]] = []
+    need_detail: list[dict] = []
+    for j in changed:
+        if not fetch_jd:
+            ready.append((j, None))
+        elif not j["jd_text"] and j["external_id"] is not None:
+            need_detail.append(j)
+        else:
+            ready.append((j, j["jd_text"]))
+    summary["detail_fetches"] = len(need_detail)
+
+    # 边抓边写：fetch 往有界队列里放，这里按固定批量写库（写库在线程里跑，不挡 fetch）
+    batch_size = max(1, INGEST_WRITE_BATCH)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+    producer = asyncio.create_task(
+        _produce(
+            adapter,
+            board_token,
+            ready=ready,
+            need_detail=need_detail,
+            queue=queue,
+            workers=INGEST_MAX_CONCURRENCY,
+        )
+    )
+
+    jd_failed_ids: set[str] = set()
+    batch: list[dict] = []
+
+    async def _flush() -> None:
+        result = await _db(bulk_upsert_job_postings, source=source, items=batch, update_existing=True)
+        for k in ("created", "existing", "updated"):
+            summary[k] += result[k]
+        batch.clear()
+
+    try:
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                break
+            job, jd = entry
+            if fetch_jd and jd is None and job["external_id"] is not None and not job["jd_text"]:
+                jd_failed_ids.add(job["external_id"])
+            batch.append(
+                {
+                    "company_name": company_name,
+                    "role_title": job["role_title"],
+                    "location": job["location"],
+                    "url": job["url"],
+                    "jd_text": jd,
+                    "board_token": board_token,
+                    "external_id": job["external_id"],
+                }
+            )
+            if len(batch) >= batch_size:
+                await _flush()
+        if batch:
+            await _flush()
+        # 把生产者的异常（如果有）抛出来
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+    summary["jd_failures"] = len(jd_failed_ids)
+
+    if changed:
+        # 反哺公司索引（共用系统）：整批只记一次
+        await _db(upsert_company_index, name=company_name, source="crawler")
+
+    # 快照差异：上一轮见过的 external_id（上次 watermark 的 key）vs 这一轮，纯集合运算
+    current_ids = {j["external_id"] for j in jobs if j["external_id"] is not None}
+    previous_ids = set(state.job_watermarks or {}) if state else set()
+    added, removed = current_ids - previous_ids, previous_ids - current_ids
+    # 快照没变时跳过 UPDATE + commit；只需要清掉上一轮留下的 is_new 时才写
+    if added or removed or await _db(board_has_new_postings, source=source, board_token=board_token):
+        await _db(apply_board_snapshot, source=source, board_token=board_token, added=added, removed=removed)
+    summary["added"], summary["removed"] = len(added), len(removed)
+
+    new_watermarks = {}
+    for j in jobs:
+        key = j["external_id"]
+        if key is None:
+            continue
+        if key in jd_failed_ids:
+            # JD 没抓到：沿用旧 watermark（没有就记 None），下次还会当成变更；
+            # key 照样记下，watermark 的 key 集合就是这个 board 的快照
+            new_watermarks[key] = watermarks.get(key)
+            continue
+        new_watermarks[key] = j["watermark"]
+
+    # 有 JD 没抓到时不记 ETag，否则下次 304 就没机会重试了
+    if jd_failed_ids:
+        listing["etag"] = listing["last_modified"] = None
+
+    # 这次没抓 JD 的话新行没有 JD，下次要 JD 时需要全量
+    with_jd = fetch_jd
+    if (
+        not state
+        or new_watermarks != (state.job_watermarks or {})
+        or listing["etag"] != state.etag
+        or listing["last_modified"] != state.last_modified
+        or with_jd != state.with_jd
+    ):
+        await _db(
+            save_board_state,
+            source=source,
+            board_token=board_token,
+            etag=listing["etag"],
+            last_modified=listing["last_modified"],
+            job_watermarks=new_watermarks,
+            with_jd=with_jd,
+        )
+
+    summary.update(adapter.counters)
+    return summary
+
+
+async def ingest_boards(
+    boards: list[tuple[str, str, str]],
+    *,
+    fetch_jd: bool = False,
+    incremental: bool = True,
+    concurrency: int = INGEST_BOARD_CONCURRENCY,
+) -> list[dict]:
+    """
+    多个 board 并发抓取：boards = [(source, board_token, company_name), ...]
+
+    - 同时处理的 board 数受 concurrency 限制
+    - 出站请求共用全局限流（并发上限 + 每 host 令牌桶）
+    - 每个 board 用自己的 DB session，单个 board 失败不影响其它 board
+
+    返回每个 board 的结果（顺序同输入）：ok=True 带计数，ok=False 带 error
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(source: str, board_token: str, company_name: str) -> dict:
+        async with sem:
+            started = time.perf_counter()
+            db = SessionLocal()
+            base = {"source": source, "board": board_token, "company_name": company_name}
+            try:
+                summary = await ingest_board(
+                    db,
+                    source=source,
+                    board_token=board_token,
+                    company_name=company_name,
+                    fetch_jd=fetch_jd,
+                    incremental=incremental,
+                )
+                result = {"ok": True, **base, **summary}
+            except (httpx.HTTPError, ValueError) as e:
+                db.rollback()
+                result = {"ok": False, **base, "error": f"{source} fetch failed: {e}"}
+            except Exception as e:
+                db.rollback()
+                result = {"ok": False, **base, "error": str(e)}
+            finally:
+                db.close()
+            result["duration_ms"] = int((time.perf_counter() - started) * 1000)
+            return result
+
+    return await asyncio.gather(*(_one(*b) for b in boards))
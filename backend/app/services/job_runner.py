@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import partial
+
+import httpx
+
+from app.core.config import INGEST_WORKERS
+from app.core.database import SessionLocal
+from app.crud.crud_ingest_job import (
+    get_ingest_job,
+    list_pending_ingest_jobs,
+    mark_ingest_job_running,
+    mark_ingest_job_done,
+    mark_ingest_job_failed,
+)
+from app.services.ingestion import db_executor, ingest_board
+
+logger = logging.getLogger(__name__)
+
+
+class IngestJobRunner:
+    """
+    进程内的后台抓取队列：
+    - submit() 只把 job id 放进 asyncio.Queue，HTTP 请求立即返回
+    - 固定数量的 worker 协程消费队列（并发上限 = workers）
+    - 状态 / 计数 / 错误都写回 ingest_jobs 表，重启后 queued/running 的任务会重新排队
+    """
+
+    def __init__(self, workers: int = INGEST_WORKERS):
+        self.workers = max(1, workers)
+        self._queue: asyncio.Queue[int] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+
+        def _pending() -> list[int]:
+            db = SessionLocal()
+            try:
+                return [j.id for j in list_pending_ingest_jobs(db)]
+            finally:
+                db.close()
+
+        for job_id in await asyncio.to_thread(_pending):
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    def submit(self, job_id: int) -> None:
+        """可以在 event loop 里调用，也可以在同步路由的线程池里调用"""
+        if self._queue is None or self._loop is None:
+            raise RuntimeError("Ingest job runner is not started")
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+
+    async def _worker(self, n: int) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("ingest worker %s crashed on job %s", n, job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: int) -> None:
+        # 这个任务的所有 DB 操作（包括 ingest_board 里的）都在同一个专用线程里跑，不挡事件循环
+        executor = db_executor("ingest-job")
+        loop = asyncio.get_running_loop()
+        db = SessionLocal()
+
+        def _db(fn, *args):
+            return loop.run_in_executor(executor, partial(fn, db, *args))
+
+        def _start(db):
+            job = get_ingest_job(db, job_id)
+            if not job or job.status in {"done", "failed"}:
+                return None
+            mark_ingest_job_running(db, job)
+            # 之后 ingest 的 commit 会让 job 过期：要用的字段先在这个线程里取出来
+            params = {
+                "source": job.source,
+                "board_token": job.board_token,
+                "company_name": job.company_name,
+                "fetch_jd": job.fetch_jd,
+                "incremental": not job.full_refresh,
+            }
+            return job, params
+
+        def _failed(db, job, error: str):
+            db.rollback()
+            mark_ingest_job_failed(db, job, error)
+
+        try:
+            started = await _db(_start)
+            if started is None:
+                return
+            job, params = started
+
+            try:
+                summary = await ingest_board(db, **params, executor=executor)
+            except (httpx.HTTPError, ValueError) as e:
+                await _db(_failed, job, f"{params['source']} fetch failed: {e}")
+                return
+            except Exception as e:
+                logger.exception("ingest job %s failed", job_id)
+                await _db(_failed, job, str(e))
+                return
+
+            await _db(mark_ingest_job_done, job, summary)
+        finally:
+            await loop.run_in_executor(executor, db.close)
+            executor.shutdown(wait=False)
+
+
+_runner = IngestJobRunner()
+
+
+def get_job_runner() -> IngestJobRunner:
+    return _runner
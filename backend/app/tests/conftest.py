@@ -0,0 +1,165 @@
+"""
+测试用一个临时 SQLite 库：整个 session 只跑一次 alembic upgrade head 得到模板库，
+每个测试开始前把模板拷一份（干净的库，迁移里建的 FTS 表也在），进程内的单例也全部换新。
+
+DATABASE_URL 必须在 import app.* 之前设好，所以放在模块最上面。
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+_TMP = tempfile.TemporaryDirectory(prefix="jobtrackiq-tests-")
+_DB = Path(_TMP.name) / "test.db"
+_TEMPLATE = Path(_TMP.name) / "template.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB}"
+
+BACKEND = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _migrated():
+    from alembic import command
+    from alembic.config import Config
+
+    from app.core.database import engine
+
+    command.upgrade(Config(str(BACKEND / "alembic.ini")), "head")
+    engine.dispose()
+    shutil.copyfile(_DB, _TEMPLATE)
+    yield
+    engine.dispose()
+    _TMP.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    from app.core.database import engine
+    from app.crud import company_prefix_index, company_trigram_index, counting, fingerprint_index
+    from app.ingest import ratelimit, resilience
+
+    engine.dispose()
+    shutil.copyfile(_TEMPLATE, _DB)
+
+    monkeypatch.setattr(fingerprint_index, "_index", fingerprint_index.FingerprintIndex())
+    monkeypatch.setattr(company_prefix_index, "_index", company_prefix_index.CompanyPrefixIndex())
+    monkeypatch.setattr(company_trigram_index, "_index", company_trigram_index.CompanyTrigramIndex())
+    monkeypatch.setattr(counting, "_counts", counting.CountCache())
+    # 不限速；重试不等待（需要测退避 / 熔断的测试自己再换）
+    monkeypatch.setattr(ratelimit, "_limiter", ratelimit.HostRateLimiter(rate=0))
+    monkeypatch.setattr(
+        resilience, "_resilience", resilience.Resilience(policy=resilience.RetryPolicy(base_delay=0, max_delay=0))
+    )
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class FakeGreenhouseBoard:
+    """
+    boards-api.greenhouse.io 的最小替身（给 httpx.MockTransport 用）：
+    ETag = 版本号，touch() 改 job 会 bump 版本和那个 job 的 updated_at
+    """
+
+    def __init__(self, n: int = 5, token: str = "acme"):
+        self.token = token
+        self.version = 1
+        self.jobs = {i: self._job(i) for i in range(1, n + 1)}
+        # False：?content=true 也不给 content，JD 只能逐个抓详情
+        self.listing_content = True
+        # 不是 200 时详情请求直接返回这个状态码
+        self.detail_status = 200
+        self.listing_calls = 0
+        self.detail_calls = 0
+
+    @staticmethod
+    def _job(job_id: int) -> dict:
+        return {
+            "id": job_id,
+            "title": f"Role {job_id}",
+            "location": {"name": "Remote"},
+            "absolute_url": f"https://example.com/jobs/{job_id}",
+            "updated_at": "2026-01-01T00:00:00Z",
+            "content": f"<p>JD {job_id}</p>",
+        }
+
+    @property
+    def etag(self) -> str:
+        return f'"v{self.version}"'
+
+    def touch(self, job_id: int, **changes) -> None:
+        self.jobs[job_id].update(changes, updated_at=f"2026-01-01T00:00:{self.version:02d}Z")
+        self.version += 1
+
+    def remove(self, job_id: int) -> None:
+        del self.jobs[job_id]
+        self.version += 1
+
+    def add(self, job_id: int) -> None:
+        self.jobs[job_id] = self._job(job_id)
+        self.version += 1
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        # /v1/boards/{token}/jobs[/{id}]
+        parts = request.url.path.strip("/").split("/")
+        if parts[2] != self.token:
+            return httpx.Response(404)
+        if len(parts) == 4:
+            self.listing_calls += 1
+            if request.headers.get("If-None-Match") == self.etag:
+                return httpx.Response(304)
+            with_content = self.listing_content and request.url.params.get("content") == "true"
+            jobs = [
+                {k: v for k, v in job.items() if with_content or k != "content"}
+                for job in self.jobs.values()
+            ]
+            return httpx.Response(200, json={"jobs": jobs}, headers={"ETag": self.etag})
+
+        self.detail_calls += 1
+        if self.detail_status != 200:
+            return httpx.Response(self.detail_status)
+        job = self.jobs.get(int(parts[4]))
+        if job is None:
+            return httpx.Response(404)
+        return httpx.Response(200, json=job)
+
+
+@pytest.fixture
+def greenhouse():
+    return FakeGreenhouseBoard()
+
+
+@pytest.fixture
+def ingest(db, greenhouse):
+    """ingest(**kw)：对 greenhouse 替身跑一遍 ingest_board，返回 summary"""
+    from app.ingest.greenhouse import GreenhouseAdapter
+    from app.services.ingestion import ingest_board
+
+    async def _run(**kw):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(greenhouse.handler)) as client:
+            return await ingest_board(
+                db,
+                source="greenhouse",
+                board_token=greenhouse.token,
+                company_name="Acme",
+                adapter=GreenhouseAdapter(client=client),
+                **kw,
+            )
+
+    return lambda **kw: asyncio.run(_run(**kw))
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.crud.crud_application import create_application, list_applications
+from app.crud.crud_event import add_event, list_events_for_application
+from app.crud.pagination import InvalidCursor
+from app.main import app
+from app.models.application import Application
+from app.schemas.application import ApplicationCreate
+from app.schemas.event import EventCreate
+
+ORDER_FIELDS = ("created_at", "updated_at", "company_name", "role_title", "last_activity_at")
+BASE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def applications(db):
+    # 排序值大量重复：翻页必须靠 (排序列, id) 才不重不漏
+    apps = [
+        create_application(db, ApplicationCreate(company_name=f"Company {i % 3}", role_title=f"Role {i % 4}"))
+        for i in range(11)
+    ]
+    for i, a in enumerate(apps):
+        db.execute(
+            update(Application)
+            .where(Application.id == a.id)
+            .values(created_at=BASE + timedelta(days=i % 3), updated_at=BASE + timedelta(days=i % 2))
+        )
+    db.commit()
+    return [a.id for a in apps]
+
+
+def _walk(db, limit=3, **kw):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = list_applications(db, limit=limit, cursor=cursor, **kw)
+        ids += [a.id for a in page.items]
+        pages += 1
+        if not page.next_cursor:
+            return ids, pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("order_by", ORDER_FIELDS)
+def test_cursor_walk_matches_offset_listing(db, applications, order_by, order):
+    expected = [a.id for a in list_applications(db, limit=100, order_by=order_by, order=order).items]
+    ids, pages = _walk(db, order_by=order_by, order=order)
+    assert ids == expected
+    assert sorted(ids) == sorted(applications)
+    assert pages == 4
+
+
+def test_cursor_walk_with_filter(db, applications):
+    db.execute(update(Application).where(Application.id.in_(applications[::2])).values(status="offer"))
+    db.commit()
+    ids, _ = _walk(db, limit=2, status="offer")
+    assert sorted(ids) == applications[::2]
+
+
+def test_cursor_from_another_sort_is_rejected(db, applications):
+    cursor = list_applications(db, limit=3, order_by="company_name").next_cursor
+    with pytest.raises(InvalidCursor):
+        list_applications(db, limit=3, order_by="created_at", cursor=cursor)
+    with pytest.raises(InvalidCursor):
+        list_applications(db, limit=3, cursor="not-a-cursor")
+
+
+def test_applications_api_pages_through_headers(applications):
+    client = TestClient(app)
+    r = client.get("/api/v1/applications", params={"limit": 5})
+    # 响应体保持 {total, items}，游标 / 总数在响应头
+    assert set(r.json()) == {"total", "items"}
+    assert r.json()["total"] == 11
+    assert r.headers["X-Total-Count"] == "11"
+    assert r.headers["X-Total-Exact"] == "true"
+
+    ids = [a["id"] for a in r.json()["items"]]
+    while "X-Next-Cursor" in r.headers:
+        r = client.get("/api/v1/applications", params={"limit": 5, "cursor": r.headers["X-Next-Cursor"]})
+        ids += [a["id"] for a in r.json()["items"]]
+    assert sorted(ids) == applications
+
+    bad = client.get("/api/v1/applications", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
+
+
+def test_event_timeline_cursor(db, applications):
+    application = db.get(Application, applications[0])
+    for i, event_type in enumerate(["applied", "follow_up", "interview_1", "interview_2", "offer"]):
+        add_event(db, application, EventCreate(event_type=event_type, event_time=BASE + timedelta(days=i)))
+
+    first = list_events_for_application(db, application.id, limit=2)
+    assert [e.event_type for e in first.items] == ["offer", "interview_2"]
+    second = list_events_for_application(db, application.id, limit=2, cursor=first.next_cursor)
+    assert [e.event_type for e in second.items] == ["interview_1", "follow_up"]
+    last = list_events_for_application(db, application.id, limit=2, cursor=second.next_cursor)
+    assert [e.event_type for e in last.items] == ["applied"]
+    assert last.next_cursor is None
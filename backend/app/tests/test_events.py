@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.crud.crud_application import create_application
+from app.crud.crud_event import (
+    add_event,
+    add_events_batch,
+    delete_event,
+    latest_events_for_applications,
+    refresh_last_events,
+)
+from app.main import app
+from app.models.application import Application
+from app.schemas.application import ApplicationCreate
+from app.schemas.event import EventBatchItem, EventCreate
+
+BASE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def apps(db):
+    return [
+        create_application(db, ApplicationCreate(company_name=f"Company {i}", role_title="Engineer"))
+        for i in range(2)
+    ]
+
+
+def _item(application, event_type, days=None, **kw):
+    event_time = BASE + timedelta(days=days) if days is not None else None
+    return EventBatchItem(application_id=application.id, event_type=event_type, event_time=event_time, **kw)
+
+
+def _state(db, application):
+    db.expire_all()
+    a = db.get(Application, application.id)
+    return a.status, a.current_stage
+
+
+def test_batch_replays_the_state_machine_in_event_time_order(db, apps):
+    a, b = apps
+    results = add_events_batch(db, [
+        _item(a, "interview_1", 3),
+        _item(b, "interview_2", 9),
+        _item(a, "applied", 1),
+        _item(b, "offer", 5),
+    ])
+    # 结果按请求顺序；a 的两条按时间先 applied 后 interview_1，都能过
+    assert [r["ok"] for r in results] == [True, False, True, True]
+    assert "Use 'reopen' first" in results[1]["error"]
+    assert results[0]["event"]["event_type"] == "interview_1"
+    assert _state(db, a) == ("active", "interview_1")
+    assert _state(db, b) == ("offer", "offer")
+
+
+def test_rejected_items_do_not_change_state(db, apps):
+    a, _ = apps
+    add_event(db, a, EventCreate(event_type="interview_2", event_time=BASE))
+
+    results = add_events_batch(db, [_item(a, "interview_1", 1), _item(a, "nonsense", 2)])
+    assert [r["ok"] for r in results] == [False, False]
+    assert "backwards" in results[0]["error"]
+    assert "Unknown event_type" in results[1]["error"]
+    assert _state(db, a) == ("active", "interview_2")
+
+
+def test_batch_reports_missing_applications_and_quick_duplicates(db, apps):
+    a, b = apps
+    results = add_events_batch(db, [
+        _item(a, "follow_up"),
+        _item(a, "follow_up"),
+        EventBatchItem(application_id=999, event_type="applied"),
+        _item(b, "applied", 1),
+    ])
+    assert [r["ok"] for r in results] == [True, False, False, True]
+    assert results[1]["error"].startswith("Duplicate event")
+    assert results[2]["error"] == "Application not found"
+
+
+def test_batch_endpoint(apps):
+    a, b = apps
+    r = TestClient(app).post("/api/v1/events/batch", json={"events": [
+        {"application_id": a.id, "event_type": "applied", "event_time": "2026-01-02T09:00:00"},
+        {"application_id": b.id, "event_type": "rejection", "event_time": "2026-01-03T09:00:00"},
+        {"application_id": b.id, "event_type": "interview_1", "event_time": "2026-01-04T09:00:00"},
+    ]})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["total"], body["succeeded"], body["failed"]) == (3, 2, 1)
+    assert [x["index"] for x in body["results"]] == [0, 1, 2]
+    assert body["results"][2]["ok"] is False
+
+
+def _last_event(db, application):
+    db.expire_all()
+    a = db.get(Application, application.id)
+    return a.last_event_type, a.last_event_at
+
+
+def test_last_event_ignores_backfilled_older_events(db, apps):
+    a, _ = apps
+    add_event(db, a, EventCreate(event_type="applied", event_time=BASE))
+    add_event(db, a, EventCreate(event_type="interview_1", event_time=BASE + timedelta(days=5)))
+    # 补录一条更早的事件：最近一条不变
+    add_event(db, a, EventCreate(event_type="follow_up", event_time=BASE + timedelta(days=2)))
+    assert _last_event(db, a) == ("interview_1", BASE + timedelta(days=5))
+
+
+def test_deleting_the_latest_event_falls_back_to_the_previous_one(db, apps):
+    a, _ = apps
+    first = add_event(db, a, EventCreate(event_type="applied", event_time=BASE))
+    latest = add_event(db, a, EventCreate(event_type="follow_up", event_time=BASE + timedelta(days=1)))
+
+    assert delete_event(db, latest.id)
+    assert _last_event(db, a) == ("applied", BASE)
+    assert delete_event(db, first.id)
+    assert _last_event(db, a) == (None, None)
+
+
+def test_batch_updates_last_event_per_application(db, apps):
+    a, b = apps
+    add_events_batch(db, [_item(a, "interview_1", 4), _item(a, "applied", 1), _item(b, "applied", 2)])
+    assert _last_event(db, a) == ("interview_1", BASE + timedelta(days=4))
+    assert _last_event(db, b) == ("applied", BASE + timedelta(days=2))
+    assert {k: e.event_type for k, e in latest_events_for_applications(db, [a.id, b.id]).items()} == {
+        a.id: "interview_1", b.id: "applied",
+    }
+
+
+def test_refresh_last_events_recomputes_from_events(db, apps):
+    a, b = apps
+    add_event(db, a, EventCreate(event_type="applied", event_time=BASE))
+    add_event(db, a, EventCreate(event_type="follow_up", event_time=BASE + timedelta(days=3)))
+    db.execute(update(Application).values(last_event_id=None, last_event_type=None, last_event_at=None))
+
+    refresh_last_events(db, [a.id, b.id])
+    db.commit()
+    assert _last_event(db, a) == ("follow_up", BASE + timedelta(days=3))
+    assert _last_event(db, b) == (None, None)
@@ -0,0 +1,102 @@
+import io
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.crud.crud_application import create_application
+from app.main import app
+from app.models.application import Application
+from app.models.event import Event
+from app.schemas.application import ApplicationCreate
+from app.services.importer import import_applications
+
+CSV = """ref,company_name,role_title,location,event_type,event_time,notes
+a1,Acme,Backend Engineer,Remote,applied,2026-01-02T09:00:00,
+a1,,,,interview_1,2026-01-09T10:00:00,phone screen
+a2,Globex,Data Scientist,,applied,2026-01-03T09:00:00,
+,Initech,SRE,,applied,2026-01-04T09:00:00,
+,initech,sre,,follow_up,2026-01-05T09:00:00,
+a2,,,,offer,2026-01-20T09:00:00,
+"""
+
+
+def _import(db, text, fmt="csv", **kw):
+    return import_applications(db, io.StringIO(text), fmt=fmt, **kw)
+
+
+def _counts(db):
+    return (
+        db.execute(select(func.count()).select_from(Application)).scalar_one(),
+        db.execute(select(func.count()).select_from(Event)).scalar_one(),
+    )
+
+
+def test_import_creates_applications_and_replays_events(db):
+    summary = _import(db, CSV)
+    assert {k: summary[k] for k in ("rows", "applications", "events", "errors")} == {
+        "rows": 6, "applications": 3, "events": 6, "errors": 0,
+    }
+
+    acme = db.execute(select(Application).where(Application.external_ref == "a1")).scalar_one()
+    assert (acme.status, acme.current_stage, acme.last_event_type) == ("active", "interview_1", "interview_1")
+    globex = db.execute(select(Application).where(Application.external_ref == "a2")).scalar_one()
+    assert globex.status == "offer"
+    # 没有 ref 的按公司 + 职位分组，不区分大小写
+    initech = db.execute(select(Application).where(Application.company_name == "Initech")).scalar_one()
+    assert initech.external_ref is None
+    assert initech.last_event_type == "follow_up"
+
+
+def test_reimport_is_idempotent(db):
+    _import(db, CSV)
+    again = _import(db, CSV)
+    assert (again["applications"], again["events"], again["errors"]) == (0, 0, 0)
+    assert again["skipped"] == 6
+    assert _counts(db) == (3, 6)
+
+
+def test_import_resumes_across_batches_and_files(db):
+    first, rest = CSV.splitlines(keepends=True)[:4], CSV.splitlines(keepends=True)[4:]
+    header = first[0]
+    assert _import(db, "".join(first), batch_size=1)["batches"] == 3
+    summary = _import(db, header + "".join(rest), batch_size=1)
+    # 后一个文件的事件挂到前一个文件建的 application 上
+    assert (summary["applications"], summary["events"]) == (1, 3)
+    assert _counts(db) == (3, 6)
+
+
+def test_import_matches_existing_applications_case_insensitively(db):
+    existing = create_application(db, ApplicationCreate(company_name="Initech", role_title="SRE"))
+    summary = _import(db, CSV)
+    assert summary["applications"] == 2
+    assert db.execute(
+        select(func.count()).select_from(Event).where(Event.application_id == existing.id)
+    ).scalar_one() == 2
+
+
+def test_import_reports_invalid_rows_and_keeps_the_rest(db):
+    text = CSV + "\n".join([
+        "a2,,,,interview_2,2026-01-21T09:00:00,",  # offer 之后不能再面试
+        "a1,,,,rejection,2026-01-08T09:00:00,",  # 早于之前批次导入的事件
+        "a3,,,,applied,2026-01-05T09:00:00,",  # 第一行没有公司 / 职位
+        "a4,Hooli,PM,,unknown,2026-01-05T09:00:00,",  # application 照建，事件被拒
+        "a5,Hooli,,,applied,2026-01-05T09:00:00,",  # 校验失败
+    ]) + "\n"
+    # 同一批里的事件按时间重放，分两批这几行才是“之后到的”
+    summary = _import(db, text, batch_size=6)
+    assert (summary["applications"], summary["events"], summary["errors"]) == (4, 6, 5)
+    assert [e["row"] for e in summary["error_details"]] == [7, 8, 9, 10, 11]
+    assert "Use 'reopen' first" in summary["error_details"][0]["error"]
+
+
+def test_import_ndjson_api():
+    text = (
+        '{"ref": "n1", "company_name": "Acme", "role_title": "ML Engineer", '
+        '"event_type": "applied", "event_time": "2026-01-02T09:00:00"}\n'
+        "not json\n"
+    )
+    r = TestClient(app).post(
+        "/api/v1/applications/import", files={"file": ("apps.ndjson", text.encode(), "application/x-ndjson")}
+    )
+    assert r.status_code == 200
+    assert (r.json()["applications"], r.json()["events"], r.json()["errors"]) == (1, 1, 1)
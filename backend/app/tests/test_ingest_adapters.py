@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+from app.ingest.adapters import get_adapter
+from app.ingest.base import content_watermark
+from app.ingest.greenhouse import GreenhouseAdapter
+from app.ingest.lever import LeverAdapter
+from app.models.company_index import CompanyIndex
+from app.models.job_posting import JobPosting
+
+LEVER_POSTING = {
+    "id": "5ac21346-8e0c-4494-8e7a-3eb92ff77902",
+    "text": "Backend Engineer",
+    "categories": {"location": "Berlin", "team": "Platform"},
+    "hostedUrl": "https://jobs.lever.co/acme/5ac21346",
+    "description": "<p>Build APIs</p>",
+}
+
+
+def _call(handler, adapter_cls, method, *args, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await getattr(adapter_cls(client=client), method)(*args, **kwargs)
+
+    return asyncio.run(_run())
+
+
+def test_adapter_registry():
+    assert isinstance(get_adapter("greenhouse"), GreenhouseAdapter)
+    assert isinstance(get_adapter("lever"), LeverAdapter)
+    with pytest.raises(ValueError):
+        get_adapter("workday")
+
+
+def test_greenhouse_list_jobs(greenhouse):
+    listing = _call(greenhouse.handler, GreenhouseAdapter, "list_jobs", "acme", with_content=True)
+    assert listing["not_modified"] is False
+    assert listing["etag"] == greenhouse.etag
+    assert [j["id"] for j in listing["jobs"]] == [1, 2, 3, 4, 5]
+    assert listing["jobs"][0]["content"] == "<p>JD 1</p>"
+
+    without = _call(greenhouse.handler, GreenhouseAdapter, "list_jobs", "acme")
+    assert "content" not in without["jobs"][0]
+
+
+def test_greenhouse_list_jobs_not_modified(greenhouse):
+    listing = _call(greenhouse.handler, GreenhouseAdapter, "list_jobs", "acme", etag=greenhouse.etag)
+    # 304：沿用传入的 ETag，不返回 job
+    assert listing == {"not_modified": True, "jobs": [], "etag": greenhouse.etag, "last_modified": None}
+
+    greenhouse.touch(1)
+    changed = _call(greenhouse.handler, GreenhouseAdapter, "list_jobs", "acme", etag='"v1"')
+    assert changed["not_modified"] is False
+    assert changed["etag"] == '"v2"'
+
+
+def test_greenhouse_list_jobs_raises_on_missing_board(greenhouse):
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(greenhouse.handler, GreenhouseAdapter, "list_jobs", "nope")
+
+
+def test_greenhouse_fetch_detail_and_normalize(greenhouse):
+    assert _call(greenhouse.handler, GreenhouseAdapter, "fetch_jd", "acme", "3") == "<p>JD 3</p>"
+
+    adapter = GreenhouseAdapter()
+    assert adapter.normalize(greenhouse.jobs[3]) == {
+        "external_id": "3",
+        "watermark": "2026-01-01T00:00:00Z",
+        "role_title": "Role 3",
+        "location": "Remote",
+        "url": "https://example.com/jobs/3",
+        "jd_text": "<p>JD 3</p>",
+    }
+    assert adapter.normalize({"id": 9, "title": ""}) is None
+
+
+def test_lever_list_jobs_and_detail():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        assert request.url.params["mode"] == "json"
+        if request.headers.get("If-None-Match") == '"lv1"':
+            return httpx.Response(304)
+        if request.url.path == "/v0/postings/acme":
+            return httpx.Response(200, json=[LEVER_POSTING], headers={"ETag": '"lv1"'})
+        if request.url.path == f"/v0/postings/acme/{LEVER_POSTING['id']}":
+            return httpx.Response(200, json=LEVER_POSTING)
+        return httpx.Response(404)
+
+    listing = _call(handler, LeverAdapter, "list_jobs", "acme")
+    assert listing["jobs"] == [LEVER_POSTING]
+    assert listing["etag"] == '"lv1"'
+
+    assert _call(handler, LeverAdapter, "list_jobs", "acme", etag='"lv1"')["not_modified"] is True
+    assert _call(handler, LeverAdapter, "fetch_jd", "acme", LEVER_POSTING["id"]) == "<p>Build APIs</p>"
+
+
+def test_lever_normalize_uses_content_hash_as_watermark():
+    adapter = LeverAdapter()
+    job = adapter.normalize(LEVER_POSTING)
+    assert job["external_id"] == LEVER_POSTING["id"]
+    assert (job["role_title"], job["location"], job["jd_text"]) == ("Backend Engineer", "Berlin", "<p>Build APIs</p>")
+    assert job["watermark"] == content_watermark(
+        "Backend Engineer", "Berlin", LEVER_POSTING["hostedUrl"], "<p>Build APIs</p>"
+    )
+
+    edited = adapter.normalize({**LEVER_POSTING, "description": "<p>Build APIs in Go</p>"})
+    assert edited["watermark"] != job["watermark"]
+
+
+def test_ingest_board_end_to_end(db, ingest, greenhouse):
+    summary = ingest(fetch_jd=True)
+    assert summary["source"] == "greenhouse"
+    assert (summary["fetched"], summary["created"], summary["added"]) == (5, 5, 5)
+    # 列表带了 JD，不用逐个请求详情
+    assert summary["detail_fetches"] == greenhouse.detail_calls == 0
+
+    rows = db.execute(select(JobPosting).order_by(JobPosting.id)).scalars().all()
+    assert [(r.board_token, r.external_id, r.company_name) for r in rows] == [
+        ("acme", str(i), "Acme") for i in range(1, 6)
+    ]
+    assert all(r.jd_hash for r in rows)
+    assert db.execute(select(CompanyIndex.name)).scalars().all() == ["Acme"]
+
+    # 第二次：ETag 没变，304 之后什么都不写
+    again = ingest(fetch_jd=True)
+    assert again["not_modified"] is True
+    assert again["created"] == again["changed"] == 0
+    assert db.execute(select(func.count()).select_from(JobPosting)).scalar_one() == 5
+
+
+def test_ingest_board_falls_back_to_detail_requests(db, ingest, greenhouse):
+    greenhouse.listing_content = False
+    summary = ingest(fetch_jd=True)
+    assert summary["detail_fetches"] == greenhouse.detail_calls == 5
+    assert summary["jd_failures"] == 0
+    assert db.execute(select(func.count()).where(JobPosting.jd_hash.is_not(None))).scalar_one() == 5
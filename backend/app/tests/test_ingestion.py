@@ -0,0 +1,142 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from app.core.database import engine
+from app.crud.crud_ingest_state import get_board_state
+from app.crud.crud_jd_blob import get_jd_text
+from app.crud.crud_job_posting import list_job_postings
+from app.ingest import resilience
+from app.main import app
+from app.models.job_posting import JobPosting
+
+
+def _posting(db, external_id):
+    db.expire_all()
+    return db.execute(select(JobPosting).where(JobPosting.external_id == str(external_id))).scalar_one()
+
+
+def test_reingest_skips_unchanged_jobs(ingest, greenhouse):
+    first = ingest(fetch_jd=True)
+    assert (first["changed"], first["created"]) == (5, 5)
+
+    # 列表 ETag 变了但 job 都没变：全部按 watermark 跳过
+    greenhouse.version += 1
+    again = ingest(fetch_jd=True)
+    assert again["not_modified"] is False
+    assert (again["fetched"], again["changed"], again["unchanged"]) == (5, 0, 5)
+    assert again["created"] == again["updated"] == 0
+
+
+def test_reingest_writes_only_changed_jobs(db, ingest, greenhouse):
+    ingest(fetch_jd=True)
+    greenhouse.touch(2, content="<p>JD 2, now remote-first</p>")
+
+    summary = ingest(fetch_jd=True)
+    assert (summary["changed"], summary["unchanged"], summary["updated"]) == (1, 4, 1)
+    assert "remote-first" in get_jd_text(db, _posting(db, 2).jd_hash)
+
+
+def test_watermarks_and_etag_are_saved(db, ingest, greenhouse):
+    ingest()
+    state = get_board_state(db, source="greenhouse", board_token="acme")
+    assert state.etag == greenhouse.etag
+    assert state.job_watermarks == {str(i): "2026-01-01T00:00:00Z" for i in range(1, 6)}
+    assert state.with_jd is False
+
+
+def test_full_refresh_ignores_watermarks(ingest, greenhouse):
+    ingest()
+    summary = ingest(incremental=False)
+    assert summary["not_modified"] is False
+    assert summary["changed"] == 5
+    assert greenhouse.listing_calls == 2
+
+
+def test_asking_for_jd_after_a_run_without_it_refetches(ingest):
+    ingest(fetch_jd=False)
+    summary = ingest(fetch_jd=True)
+    # 上次没抓 JD：watermark / ETag 都不能复用
+    assert summary["not_modified"] is False
+    assert (summary["changed"], summary["updated"]) == (5, 5)
+
+
+def test_failed_jd_keeps_old_watermark_for_retry(db, ingest, greenhouse, monkeypatch):
+    greenhouse.listing_content = False
+    greenhouse.detail_status = 500
+
+    failed = ingest(fetch_jd=True)
+    assert failed["jd_failures"] == 5
+    state = get_board_state(db, source="greenhouse", board_token="acme")
+    # 不记 ETag，下次不会 304；watermark 为 None，下次还会当成变更
+    assert state.etag is None
+    assert set(state.job_watermarks.values()) == {None}
+
+    # 连续 500 已经把详情熔断打开了：换一套新的熔断器，模拟熔断恢复以后
+    monkeypatch.setattr(resilience, "_resilience", resilience.Resilience(policy=resilience.RetryPolicy(base_delay=0)))
+    greenhouse.detail_status = 200
+    retried = ingest(fetch_jd=True)
+    assert (retried["changed"], retried["jd_failures"]) == (5, 0)
+    assert get_jd_text(db, _posting(db, 1).jd_hash) == "<p>JD 1</p>"
+
+
+def _listed(db, **kw):
+    return sorted(int(j.external_id) for j in list_job_postings(db, limit=100, **kw).items)
+
+
+def test_snapshot_closes_removed_and_reopens_readded_postings(db, ingest, greenhouse):
+    first = ingest()
+    assert (first["added"], first["removed"]) == (5, 0)
+    assert _listed(db, only_new=True) == [1, 2, 3, 4, 5]
+
+    greenhouse.remove(3)
+    removed = ingest()
+    assert (removed["added"], removed["removed"]) == (0, 1)
+    assert _posting(db, 3).closed_at is not None
+    # 关掉的默认不列出来，include_closed=True 才有
+    assert _listed(db) == [1, 2, 4, 5]
+    assert _listed(db, include_closed=True) == [1, 2, 3, 4, 5]
+    assert _listed(db, only_new=True) == []
+
+    greenhouse.add(3)
+    readded = ingest()
+    assert (readded["added"], readded["removed"]) == (1, 0)
+    assert _posting(db, 3).closed_at is None
+    assert _listed(db, only_new=True) == [3]
+    assert _listed(db) == [1, 2, 3, 4, 5]
+
+
+def test_unchanged_snapshot_clears_new_flags_then_skips_the_update(db, ingest, greenhouse):
+    ingest()
+    updates = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE job_postings"):
+            updates.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        greenhouse.version += 1
+        ingest()
+        # 上一轮留下的 is_new 要清掉
+        assert len(updates) == 1
+        assert _listed(db, only_new=True) == []
+
+        updates.clear()
+        greenhouse.version += 1
+        summary = ingest()
+        assert (summary["added"], summary["removed"]) == (0, 0)
+        assert updates == []
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_jobs_api_hides_closed_postings_by_default(ingest, greenhouse):
+    ingest()
+    greenhouse.remove(5)
+    ingest()
+
+    client = TestClient(app)
+    assert len(client.get("/api/v1/jobs").json()) == 4
+    r = client.get("/api/v1/jobs", params={"include_closed": "true"})
+    assert len(r.json()) == 5
+    assert r.headers["X-Total-Count"] == "5"
@@ -0,0 +1,91 @@
+from sqlalchemy import func, insert, select
+
+from app.crud.crud_job_posting import build_fingerprint, bulk_upsert_job_postings
+from app.crud.fingerprint_index import get_fingerprint_index
+from app.models.job_posting import JobPosting
+
+
+def _items(n, *, board_token="acme"):
+    return [
+        {
+            "company_name": "Acme",
+            "role_title": f"Role {i}",
+            "location": "Remote",
+            "url": f"https://example.com/{i}",
+            "jd_text": f"JD {i}",
+            "board_token": board_token,
+            "external_id": str(i),
+        }
+        for i in range(n)
+    ]
+
+
+def _insert_behind_index(db, items):
+    # 绕过 crud 直接插入（像是别的进程写的）：进程内 fingerprint 集合看不到
+    db.execute(insert(JobPosting), [
+        {
+            "source": "greenhouse",
+            "company_name": it["company_name"],
+            "role_title": it["role_title"],
+            "fingerprint": build_fingerprint(it["company_name"], it["role_title"], it["location"], it["url"]),
+        }
+        for it in items
+    ])
+    db.commit()
+
+
+def _count(db):
+    return db.execute(select(func.count()).select_from(JobPosting)).scalar_one()
+
+
+def test_bulk_upsert_inserts_once(db):
+    first = bulk_upsert_job_postings(db, source="greenhouse", items=_items(5))
+    assert first == {"created": 5, "existing": 0, "updated": 0, "superseded": 0}
+
+    again = bulk_upsert_job_postings(db, source="greenhouse", items=_items(5))
+    assert again["created"] == 0
+    assert again["existing"] == 5
+    assert _count(db) == 5
+
+
+def test_bulk_upsert_counts_duplicates_in_batch(db):
+    items = _items(3)
+    result = bulk_upsert_job_postings(db, source="greenhouse", items=items + items[:2])
+    assert result["created"] == 3
+    assert result["existing"] == 2
+    assert _count(db) == 3
+
+
+def test_bulk_upsert_skips_rows_the_fingerprint_set_missed(db):
+    # 集合说“没有”，插入靠 ON CONFLICT DO NOTHING 兜底
+    get_fingerprint_index().load(db)
+    _insert_behind_index(db, _items(3))
+
+    result = bulk_upsert_job_postings(db, source="greenhouse", items=_items(4))
+    assert result["created"] == 1
+    assert result["existing"] == 3
+    assert _count(db) == 4
+
+
+def test_bulk_upsert_updates_rows_it_lost_the_insert_race_for(db):
+    get_fingerprint_index().load(db)
+    it = _items(1)[0]
+    _insert_behind_index(db, [it])
+
+    result = bulk_upsert_job_postings(db, source="greenhouse", items=[it], update_existing=True)
+    assert result == {"created": 0, "existing": 1, "updated": 1, "superseded": 0}
+    row = db.execute(select(JobPosting)).scalar_one()
+    assert (row.board_token, row.external_id) == ("acme", "0")
+    assert row.jd_hash is not None
+
+
+def test_bulk_upsert_updates_moved_job_in_place(db):
+    bulk_upsert_job_postings(db, source="greenhouse", items=_items(2), update_existing=True)
+    retitled = _items(2)
+    retitled[0]["role_title"] = "Senior Role 0"
+
+    result = bulk_upsert_job_postings(db, source="greenhouse", items=retitled, update_existing=True)
+    assert result["created"] == 0
+    assert _count(db) == 2
+    titles = db.execute(select(JobPosting.role_title).order_by(JobPosting.id)).scalars().all()
+    assert titles == ["Senior Role 0", "Role 1"]
@@ -0,0 +1,9 @@
+from app.core.database import engine
+from bench.query_plans import _run_checks, _seed
+
+
+def test_hot_queries_use_their_indexes():
+    # bench/query_plans.py 的检查在测试库（SQLite）上跑一遍：不许全表扫描，该用的索引要用上
+    _seed(engine, 3000)
+    failed = {r["check"]: r["problems"] for r in _run_checks(engine) if not r["ok"]}
+    assert failed == {}
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.ingest import resilience
+from app.ingest.base import http_get
+from app.ingest.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+def _get(handler, url="https://boards.example.com/v1/acme/jobs", **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await http_get(url, client=client, **kwargs)
+
+    return asyncio.run(_run())
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker(threshold=2, reset_seconds=0)
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    # reset_seconds=0：马上进入 half-open，只放一个探测请求
+    assert breaker.state == "half-open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    # 探测失败：重新打开
+    assert breaker.record_failure() is True
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() is True
+
+
+def test_open_breaker_rejects_until_reset():
+    breaker = CircuitBreaker(threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+
+def test_retry_policy_gives_up_after_attempts_and_long_retry_after():
+    policy = RetryPolicy(attempts=3, base_delay=1, max_delay=4, max_retry_after=10)
+    assert 0 <= policy.delay(0) <= 1
+    assert policy.delay(2) is None
+    assert policy.delay(0, httpx.Response(429, headers={"Retry-After": "5"})) >= 5
+    assert policy.delay(0, httpx.Response(429, headers={"Retry-After": "60"})) is None
+
+
+def test_http_get_retries_transient_errors():
+    statuses = iter([503, 429, 200])
+    counters = {}
+    r = _get(lambda request: httpx.Response(next(statuses)), counters=counters)
+    assert r.status_code == 200
+    assert counters == {"retries": 2}
+    assert resilience.get_resilience().breaker("boards.example.com").state == "closed"
+
+
+def test_http_get_returns_last_response_when_retries_run_out():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    assert _get(handler).status_code == 500
+    assert len(calls) == RetryPolicy().attempts
+
+
+def test_http_get_short_circuits_an_open_breaker():
+    breaker = resilience.get_resilience().breaker("acme/list")
+    while breaker.state == "closed":
+        breaker.record_failure()
+
+    counters = {}
+    with pytest.raises(CircuitOpenError):
+        _get(lambda request: httpx.Response(200), breaker_key="acme/list", counters=counters)
+    assert counters == {"short_circuits": 1}
+    # 别的 key 不受影响
+    assert _get(lambda request: httpx.Response(200), breaker_key="other/list").status_code == 200
+
+
+def test_failing_details_do_not_trip_the_listing_breaker(ingest, greenhouse):
+    greenhouse.listing_content = False
+    greenhouse.detail_status = 500
+
+    first = ingest(fetch_jd=True)
+    assert first["jd_failures"] == 5
+    breakers = resilience.get_resilience()
+    assert breakers.breaker("boards-api.greenhouse.io/acme/detail").state == "open"
+    assert breakers.breaker("boards-api.greenhouse.io/acme/list").state == "closed"
+
+    # 详情熔断中：列表照常抓，详情直接短路并记成 JD 失败
+    calls = greenhouse.detail_calls
+    second = ingest(fetch_jd=True)
+    assert second["not_modified"] is False
+    assert second["jd_failures"] == 5
+    assert second["short_circuits"] == 5
+    assert greenhouse.detail_calls == calls
@@ -17,7 +17,6 @@ from app.crud.crud_event import (
     add_event,
     delete_event,
     list_events_for_application,
-    latest_events_for_applications,
 )
 from app.models.event import Event
 from app.crud.crud_metrics import metrics_overview, metrics_time_to_milestones, metrics_by_channel
@@ -30,19 +29,22 @@ from app.schemas.job_posting import JobPostingCreate
 from app.crud.crud_company import upsert_company_index
 
 from app.crud.crud_job_posting import get_job_posting, delete_job_posting
+from app.crud.crud_jd_blob import get_jd_text
+from app.crud.pagination import InvalidCursor
 
-import urllib.parse
-
-from app.ingest.greenhouse import fetch_greenhouse_jobs
-from app.crud.crud_job_posting import upsert_job_posting  # 你之前加的通用 upsert
-from app.crud.crud_company import upsert_company_index
-
-import asyncio
-from app.ingest.greenhouse import fetch_greenhouse_jobs, fetch_greenhouse_job_detail
+from app.crud.crud_ingest_job import create_ingest_job
+from app.ingest.adapters import ADAPTERS
+from app.services.job_runner import get_job_runner
 
 
 templates = Jinja2Templates(directory="app/templates")
 
+# 列表模板实际用到的列：列表查询只 SELECT 这些（改模板时记得同步）
+APPLICATION_LIST_COLUMNS = (
+    "id", "company_name", "role_title", "channel", "location", "status", "last_event_type", "last_event_at",
+)
+JOB_LIST_COLUMNS = ("id", "company_name", "role_title", "location", "url", "jd_hash", "is_new", "created_at")
+
 
 def _fmt_dt(dt):
     if not dt:
@@ -51,6 +53,18 @@ def _fmt_dt(dt):
 
 
 templates.env.filters["dt"] = _fmt_dt
+# 分页的 Prev 链接要用
+templates.env.globals["max"] = max
+
+
+def _list_or_first_page(list_fn, db: Session, **kw):
+    # 游标失效（排序变了 / 手改 URL）就从 offset 位置重新开始，页面不报错
+    try:
+        return list_fn(db, **kw)
+    except InvalidCursor:
+        return list_fn(db, **{**kw, "cursor": None})
+
+
 router = APIRouter(prefix="/ui")
 
 
@@ -61,11 +75,11 @@ def home(
     status: str | None = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ):
     # ✅ 默认值：无论 DB 是否可用/是否有数据，模板渲染都不会炸
-    total, items = 0, []
-    latest_events: dict[int, list] | dict = {}
+    total, total_exact, items, next_cursor = 0, True, [], None
 
     overview = {
         "total_applications": 0,
@@ -81,26 +95,25 @@ def home(
     db_error = None
 
     try:
-        total, items = list_applications(
+        page = _list_or_first_page(
+            list_applications,
             db,
             status=status,
             search=search,
             limit=limit,
             offset=offset,
-            order_by="created_at",
+            cursor=cursor,
+            # 搜索结果按相关度，否则最新的在前
+            order_by="relevance" if search else "created_at",
             order="desc",
+            columns=APPLICATION_LIST_COLUMNS,
         )
+        total, total_exact, items, next_cursor = page.total, page.total_exact, page.items, page.next_cursor
 
         # 这些 metrics 在“空库 / 表不存在 / 连接失败”等情况下都可能抛 SQLAlchemyError
         overview = metrics_overview(db) or overview
         timing = metrics_time_to_milestones(db) or timing
         channels = metrics_by_channel(db, min_samples=1) or channels
-
-        # items 为空时也别查
-        if items:
-            latest_events = latest_events_for_applications(db, [a.id for a in items])
-        else:
-            latest_events = {}
     except SQLAlchemyError as e:
         # ✅ 不让 UI 500，把错误显示到页面上
         db_error = str(e)
@@ -113,10 +126,12 @@ def home(
             "title": "JobTrackIQ",
             "items": items,
             "total": total,
+            "total_exact": total_exact,
             "search": search,
             "status": status,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
             "metrics_total": overview.get("total_applications", 0),
             "metrics_by_status": overview.get("by_status", {}),
             "offer_rate": overview.get("offer_rate", 0.0),
@@ -124,7 +139,6 @@ def home(
             "avg_days_to_interview": timing.get("avg_days_to_interview"),
             "avg_days_to_offer": timing.get("avg_days_to_offer"),
             "channels": channels,
-            "latest_events": latest_events,
             "db_error": db_error,
         },
         status_code=200,
@@ -187,7 +201,7 @@ def app_detail(
     if not app_obj:
         return RedirectResponse(url="/ui/", status_code=303)
 
-    events = list_events_for_application(db, application_id, limit=200, offset=0)
+    events = list_events_for_application(db, application_id, limit=200).items
 
     return templates.TemplateResponse(
         "application_detail.html",
@@ -196,6 +210,7 @@ def app_detail(
             "title": f"Application {application_id}",
             "app": app_obj,
             "events": events,
+            "jd_text": get_jd_text(db, app_obj.jd_hash),
             "err": err,  # ✅ 新增：模板可显示
         },
         status_code=200,
@@ -245,17 +260,31 @@ def delete_event_ui(
 def jobs_page(
     request: Request,
     search: str | None = None,
+    new: bool = False,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
     err: str | None = None,
     ok: str | None = None,
+    ingest_job: int | None = None,
     db: Session = Depends(get_db),
 ):
-    total, items = 0, []
+    total, total_exact, items, next_cursor = 0, True, [], None
     db_error = None
 
     try:
-        total, items = list_job_postings(db, search=search, limit=limit, offset=offset)
+        page = _list_or_first_page(
+            list_job_postings,
+            db,
+            search=search,
+            only_new=new,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order_by="relevance" if search else "created_at",
+            columns=JOB_LIST_COLUMNS,
+        )
+        total, total_exact, items, next_cursor = page.total, page.total_exact, page.items, page.next_cursor
     except SQLAlchemyError as e:
         db_error = str(e)
 
@@ -266,11 +295,15 @@ def jobs_page(
             "title": "Job Inbox",
             "items": items,
             "total": total,
+            "total_exact": total_exact,
             "search": search,
+            "new": new,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
             "err": err,
             "ok": ok,
+            "ingest_job": ingest_job,
             "db_error": db_error,
         },
         status_code=200,
@@ -303,6 +336,29 @@ def jobs_create(
 
     return RedirectResponse(url="/ui/jobs", status_code=303)
 
+@router.get("/jobs/{job_id}", name="ui_job_detail")
+def job_detail(
+    request: Request,
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    job = get_job_posting(db, job_id)
+    if not job:
+        return RedirectResponse(url="/ui/jobs", status_code=303)
+
+    return templates.TemplateResponse(
+        "job_detail.html",
+        {
+            "request": request,
+            "title": f"{job.company_name} — {job.role_title}",
+            "job": job,
+            # 只有详情页才解压 JD
+            "jd_text": get_jd_text(db, job.jd_hash),
+        },
+        status_code=200,
+    )
+
+
 @router.post("/jobs/{job_id}/to-application", name="ui_job_to_application")
 def job_to_application(
     job_id: int,
@@ -321,6 +377,7 @@ def job_to_application(
             channel=job.source,      # 你也可以改成 "job_inbox"
             location=job.location,
         ),
+        jd_hash=job.jd_hash,         # JD 共用同一个 blob，不复制正文
     )
 
     # 2) 反哺 company index（保持共用系统）
@@ -340,10 +397,11 @@ def job_to_application(
     return RedirectResponse(url=f"/ui/applications/{app_obj.id}", status_code=303)
 
 @router.post("/ingest/greenhouse", name="ui_ingest_greenhouse")
-async def ui_ingest_greenhouse(
+def ui_ingest_greenhouse(
     board_token: str = Form(...),
     company_name: str = Form(...),
     fetch_jd: str | None = Form(None),  # ✅ checkbox: "on" or None
+    source: str = Form("greenhouse"),
     db: Session = Depends(get_db),
 ):
     board_token = board_token.strip()
@@ -351,71 +409,17 @@ async def ui_ingest_greenhouse(
 
     if not board_token or not company_name:
         return RedirectResponse(url="/ui/jobs?err=board_token%20and%20company_name%20required", status_code=303)
+    if source not in ADAPTERS:
+        return RedirectResponse(url="/ui/jobs?err=unknown%20source", status_code=303)
 
-    try:
-        jobs = await fetch_greenhouse_jobs(board_token)
-    except Exception as e:
-        msg = urllib.parse.quote(f"Greenhouse fetch failed: {e}")
-        return RedirectResponse(url=f"/ui/jobs?err={msg}", status_code=303)
-
-    # ✅ 是否抓 JD
-    need_jd = (fetch_jd == "on")
-
-    # ✅ 并发限制（别太猛）
-    sem = asyncio.Semaphore(6)
-
-    async def _get_jd(job_id: int) -> str | None:
-        if not need_jd:
-            return None
-        async with sem:
-            try:
-                detail = await fetch_greenhouse_job_detail(board_token, job_id)
-                # Greenhouse detail 常见字段：content (HTML), title, location...
-                return detail.get("content")
-            except Exception:
-                return None
-
-    # 先准备任务（仅对有 id 的 job）
-    jd_map: dict[int, str | None] = {}
-    if need_jd:
-        tasks = []
-        ids = []
-        for j in jobs:
-            job_id = j.get("id")
-            if isinstance(job_id, int):
-                ids.append(job_id)
-                tasks.append(_get_jd(job_id))
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        for job_id, res in zip(ids, results):
-            jd_map[job_id] = res if isinstance(res, str) else None
-
-    upserted = 0
-    for j in jobs:
-        title = j.get("title") or ""
-        if not title:
-            continue
-        location = (j.get("location") or {}).get("name")
-        url = j.get("absolute_url")
-        job_id = j.get("id")
-
-        jd_text = None
-        if need_jd and isinstance(job_id, int):
-            jd_text = jd_map.get(job_id)
-
-        obj = upsert_job_posting(
-            db,
-            source="greenhouse",
-            company_name=company_name,
-            role_title=title,
-            location=location,
-            url=url,
-            jd_text=jd_text,  # ✅ 现在存入
-        )
-        upserted += 1
-        upsert_company_index(db, name=obj.company_name, source="crawler")
-
-    ok_msg = urllib.parse.quote(
-        f"Imported {len(jobs)} jobs (upserted {upserted}) from {board_token}"
-        + (" with JD" if need_jd else "")
+    # ✅ 放进后台队列，页面轮询状态（不在请求里跑完整个抓取）
+    job = create_ingest_job(
+        db,
+        source=source,
+        board_token=board_token,
+        company_name=company_name,
+        fetch_jd=(fetch_jd == "on"),
     )
-    return RedirectResponse(url=f"/ui/jobs?ok={ok_msg}", status_code=303)
\ No newline at end of file
+    get_job_runner().submit(job.id)
+
+    return RedirectResponse(url=f"/ui/jobs?ingest_job={job.id}", status_code=303)
@@ -0,0 +1,226 @@
+"""
+Offline ingestion benchmark.
+
+Starts the local mock job-board server, points the Greenhouse adapter at it,
+runs the real ingest endpoint (in-process, via ASGI) against a temp SQLite DB
+and prints machine-readable JSON results.
+
+    cd backend
+    python -m bench.ingest_bench --sizes 100,1000,10000 --latency-ms 20 --output bench.json
+    python -m bench.ingest_bench --baseline bench.json      # exit 1 on regression
+
+For each board size two runs are measured:
+    initial  - empty DB, every job is new
+    recrawl  - same board again (incremental / no-change path)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.mock_board_server import MockBoardServer
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100.0 * (len(values) - 1))))
+    return round(values[k], 2)
+
+
+def _peak_rss_mb() -> float:
+    # Linux: KB；macOS: bytes
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss /= 1024
+    return round(rss / 1024, 1)
+
+
+class Probe:
+    """SQL 语句数 / commit 数 / 出站请求延迟"""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+        self.latency_ms: dict[str, list[float]] = {"listing": [], "detail": []}
+
+    def attach_db(self, engine) -> None:
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count_statement(*_args, **_kwargs):
+            self.statements += 1
+
+        @event.listens_for(engine, "commit")
+        def _count_commit(*_args, **_kwargs):
+            self.commits += 1
+
+    def attach_http(self, client) -> None:
+        async def _on_request(request):
+            request.extensions["bench_started"] = time.perf_counter()
+
+        async def _on_response(response):
+            started = response.request.extensions.get("bench_started")
+            if started is None:
+                return
+            await response.aread()  # 算到 body 读完为止
+            kind = "detail" if response.request.url.path.rstrip("/").split("/")[-1].isdigit() else "listing"
+            self.latency_ms[kind].append((time.perf_counter() - started) * 1000)
+
+        client.event_hooks["request"].append(_on_request)
+        client.event_hooks["response"].append(_on_response)
+
+
+async def _run(api, probe: Probe, board: str, jobs: int, fetch_jd: bool, label: str) -> dict:
+    import httpx
+
+    probe.reset()
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        r = await client.post(f"/api/v1/ingest/greenhouse/{board}", params={"fetch_jd": str(fetch_jd).lower()})
+        elapsed = time.perf_counter() - started
+
+    body = r.json()
+    per_job = max(jobs, 1)
+    return {
+        "run": label,
+        "board_size": jobs,
+        "fetch_jd": fetch_jd,
+        "status_code": r.status_code,
+        "seconds": round(elapsed, 4),
+        "jobs_per_sec": round(jobs / elapsed, 1) if elapsed else None,
+        "created": body.get("created"),
+        "updated": body.get("updated"),
+        "not_modified": body.get("not_modified"),
+        "detail_fetches": body.get("detail_fetches"),
+        "retries": body.get("retries"),
+        "short_circuits": body.get("short_circuits"),
+        "listing_requests": len(probe.latency_ms["listing"]),
+        "detail_requests": len(probe.latency_ms["detail"]),
+        "detail_latency_p50_ms": _percentile(probe.latency_ms["detail"], 50),
+        "detail_latency_p95_ms": _percentile(probe.latency_ms["detail"], 95),
+        "db_statements": probe.statements,
+        "db_commits": probe.commits,
+        "db_statements_per_job": round(probe.statements / per_job, 4),
+        "db_commits_per_job": round(probe.commits / per_job, 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+async def _bench(args, server: MockBoardServer) -> list[dict]:
+    # app.* 只能在 DATABASE_URL / GREENHOUSE_API_BASE 设好之后 import
+    from alembic import command
+    from alembic.config import Config
+
+    from app.core.database import engine
+    from app.core.http import get_http_client
+    from app.main import app as api
+
+    # 和线上一样走迁移建表（全文索引表不在 ORM metadata 里）
+    command.upgrade(Config("alembic.ini"), "head")
+
+    probe = Probe()
+    probe.attach_db(engine)
+
+    results = []
+    async with api.router.lifespan_context(api):
+        probe.attach_http(get_http_client())
+        for size in args.sizes:
+            board = f"bench{size}-{size}"
+            results.append(await _run(api, probe, board, size, args.fetch_jd, "initial"))
+            results.append(await _run(api, probe, board, size, args.fetch_jd, "recrawl"))
+    return results
+
+
+def _check_regressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    problems = []
+    base = {(r["run"], r["board_size"], r["fetch_jd"]): r for r in baseline}
+    for r in results:
+        b = base.get((r["run"], r["board_size"], r["fetch_jd"]))
+        if not b:
+            continue
+        key = f'{r["run"]}/{r["board_size"]}'
+        if b.get("jobs_per_sec") and r["jobs_per_sec"] < b["jobs_per_sec"] * (1 - tolerance):
+            problems.append(f'{key}: jobs_per_sec {r["jobs_per_sec"]} < baseline {b["jobs_per_sec"]}')
+        for metric in ("db_statements_per_job", "db_commits_per_job"):
+            if r[metric] > b[metric] * (1 + tolerance) + 1e-9:
+                problems.append(f"{key}: {metric} {r[metric]} > baseline {b[metric]}")
+    return problems
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", default="100,1000", help="comma separated board sizes (100 .. 50000)")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="mock server latency per request")
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of detail requests failing with 503")
+    p.add_argument("--no-listing-content", action="store_true", help="force the per-job detail fetch path")
+    p.add_argument("--no-jd", dest="fetch_jd", action="store_false", help="benchmark plain (no JD) imports")
+    p.add_argument("--host-rate", type=float, default=0.0, help="INGEST_HOST_RATE for the run (0 = unlimited)")
+    p.add_argument("--max-concurrency", type=int, default=None, help="INGEST_MAX_CONCURRENCY for the run")
+    p.add_argument("--output", help="write JSON results to this file")
+    p.add_argument("--baseline", help="compare against a previous JSON result and exit 1 on regression")
+    p.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = p.parse_args()
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    server = MockBoardServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        listing_content=not args.no_listing_content,
+    ).start()
+
+    tmp = tempfile.TemporaryDirectory(prefix="jobtrackiq-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp.name) / 'bench.db'}"
+    os.environ["GREENHOUSE_API_BASE"] = server.base_url
+    os.environ["INGEST_HOST_RATE"] = str(args.host_rate)
+    if args.max_concurrency:
+        os.environ["INGEST_MAX_CONCURRENCY"] = str(args.max_concurrency)
+
+    try:
+        results = asyncio.run(_bench(args, server))
+    finally:
+        server.stop()
+        tmp.cleanup()
+
+    report = {
+        "benchmark": "ingest",
+        "params": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "listing_content": not args.no_listing_content,
+            "host_rate": args.host_rate,
+        },
+        "server_requests": server.counts,
+        "results": results,
+    }
+    out = json.dumps(report, indent=2)
+    print(out)
+    if args.output:
+        Path(args.output).write_text(out + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        problems = _check_regressions(results, baseline, args.tolerance)
+        for msg in problems:
+            print(f"REGRESSION {msg}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
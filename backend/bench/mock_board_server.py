@@ -0,0 +1,197 @@
+"""
+Local Greenhouse-compatible job board server for offline ingestion benchmarks.
+
+    python -m bench.mock_board_server --port 8765 --jobs 1000 --latency-ms 20
+
+Endpoints (same shape as boards-api.greenhouse.io):
+    GET /v1/boards/{board}/jobs[?content=true]   (ETag / If-None-Match supported)
+    GET /v1/boards/{board}/jobs/{id}
+
+Board size comes from --jobs, or per board via a numeric suffix: "acme-5000" -> 5000 jobs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+JD_TEMPLATE = (
+    "&lt;p&gt;We are looking for a {title} to join our team in {location}.&lt;/p&gt;"
+    "&lt;p&gt;You will build reliable systems, work with product and data teams, "
+    "and help us scale. Requirements: 3+ years of experience, Python, SQL.&lt;/p&gt;"
+)
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "London, UK", "Berlin, Germany"]
+
+
+class MockBoardServer:
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        jobs_per_board: int = 100,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        listing_content: bool = True,
+        seed: int = 42,
+    ):
+        self.jobs_per_board = jobs_per_board
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.listing_content = listing_content
+        self.version = 1  # bump 之后所有 board 的 ETag / updated_at 都会变
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"listing": 0, "detail": 0, "not_modified": 0, "errors": 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/boards"
+
+    def start(self) -> "MockBoardServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    # ---- data ----
+
+    def board_size(self, board: str) -> int:
+        suffix = board.rsplit("-", 1)[-1]
+        return int(suffix) if suffix.isdigit() else self.jobs_per_board
+
+    def job(self, board: str, i: int, *, content: bool) -> dict:
+        title = f"Software Engineer {i % 97}"
+        location = LOCATIONS[i % len(LOCATIONS)]
+        job = {
+            "id": 100000 + i,
+            "title": f"{title} ({board} #{i})",
+            "location": {"name": location},
+            "absolute_url": f"https://boards.example.com/{board}/jobs/{100000 + i}",
+            "updated_at": f"2026-01-01T00:00:{self.version % 60:02d}-05:00",
+        }
+        if content:
+            job["content"] = JD_TEMPLATE.format(title=title, location=location)
+        return job
+
+    # ---- http ----
+
+    def _sleep(self) -> None:
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._lock:
+                delay += self._rng.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # header 和 body 分两次写，不关 Nagle 会撞上 delayed ACK（每个响应多 ~40ms）
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:  # 安静点
+                pass
+
+            def _send(self, status: int, body: dict | list | None = None, headers: dict | None = None) -> None:
+                raw = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if raw:
+                    self.wfile.write(raw)
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                segs = [s for s in parts.path.split("/") if s]
+                # v1 / boards / {board} / jobs [/ {id}]
+                if len(segs) < 4 or segs[:2] != ["v1", "boards"] or segs[3] != "jobs":
+                    return self._send(404, {"error": "not found"})
+                board = segs[2]
+                server._sleep()
+
+                if len(segs) == 4:
+                    server._count("listing")
+                    with_content = parse_qs(parts.query).get("content") == ["true"] and server.listing_content
+                    etag = f'"{board}-v{server.version}-{int(with_content)}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server._count("not_modified")
+                        return self._send(304, None, {"ETag": etag})
+                    jobs = [server.job(board, i, content=with_content) for i in range(server.board_size(board))]
+                    return self._send(200, {"jobs": jobs}, {"ETag": etag})
+
+                server._count("detail")
+                if server._should_fail():
+                    server._count("errors")
+                    return self._send(503, {"error": "unavailable"})
+                try:
+                    i = int(segs[4]) - 100000
+                except ValueError:
+                    return self._send(404, {"error": "not found"})
+                if not 0 <= i < server.board_size(board):
+                    return self._send(404, {"error": "not found"})
+                return self._send(200, server.job(board, i, content=True))
+
+        return Handler
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--jobs", type=int, default=100, help="jobs per board")
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of detail requests answered with 503")
+    p.add_argument("--no-listing-content", action="store_true", help="ignore ?content=true (forces detail fetches)")
+    args = p.parse_args()
+
+    server = MockBoardServer(
+        host=args.host,
+        port=args.port,
+        jobs_per_board=args.jobs,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        listing_content=not args.no_listing_content,
+    ).start()
+    print(f"mock board server on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Query plan regression check for the hot crud queries.
+
+Seeds a large synthetic dataset (temp SQLite DB by default), runs the real crud
+functions, captures every SELECT they send and asks the database for its plan
+(SQLite: EXPLAIN QUERY PLAN, PostgreSQL: EXPLAIN (FORMAT JSON)).
+
+    cd backend
+    python -m bench.query_plans --applications 20000 --output plans.json
+    python -m bench.query_plans --database-url postgresql+psycopg2://.../scratch   # seeds that DB!
+    python -m bench.query_plans --database-url ... --no-seed                        # use existing data
+
+Exit 1 if any statement falls back to a full table scan (SQLite "SCAN <table>"
+without an index, PostgreSQL "Seq Scan"), or a check doesn't use the index it
+was designed for. Each check runs once before it is captured, so cached parts
+(count cache, in-memory trigram index) are measured in their steady state.
+The company prefix index is never loaded here: suggest checks hit the DB fallback.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+STATUSES = (("active", 70), ("rejected", 20), ("ghosted", 6), ("offer", 2), ("withdrawn", 2))
+# 只用 crud_event.KNOWN_EVENT_TYPES 里的类型（_seed 里会校验）
+EVENT_TYPES = ("applied", "follow_up", "interview_1", "interview_2", "offer", "rejection")
+COMPANY_WORDS = ("open", "deep", "data", "cloud", "quant", "micro", "nova", "stack", "byte", "meta")
+ROLES = ("Backend Engineer", "Data Scientist", "ML Engineer", "Frontend Engineer", "SRE")
+CITIES = ("Shanghai", "Beijing", "Remote", "Singapore", "London")
+
+# SQLite EXPLAIN QUERY PLAN 的一行：SCAN <表> [AS 别名] [USING ... INDEX ... | VIRTUAL TABLE ...]
+_SQLITE_SCAN = re.compile(r"^SCAN (\S+)(?: AS \S+)?(.*)$")
+
+
+def _seed(engine, n_apps: int) -> dict:
+    """Core executemany 批量灌数据，最后 ANALYZE（让 planner 有统计信息）"""
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+
+    from app.crud import search_index
+    from app.crud.crud_company import company_search_key, normalize_company_name
+    from app.crud.crud_event import KNOWN_EVENT_TYPES, refresh_last_events
+    from app.models.application import Application
+    from app.models.company_index import CompanyIndex
+    from app.models.event import Event
+    from app.models.job_posting import JobPosting
+
+    unknown = set(EVENT_TYPES) - KNOWN_EVENT_TYPES
+    if unknown:
+        raise ValueError(f"EVENT_TYPES not in KNOWN_EVENT_TYPES: {sorted(unknown)}")
+
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    statuses = [s for s, _ in STATUSES]
+    weights = [w for _, w in STATUSES]
+    companies = [f"{rnd.choice(COMPANY_WORDS)} {rnd.choice(COMPANY_WORDS)} {i}" for i in range(max(1, n_apps // 4))]
+
+    def _chunks(rows, size=10_000):
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+    apps, events, postings = [], [], []
+    for i in range(1, n_apps + 1):
+        created = now - timedelta(minutes=rnd.randint(0, 2 * 365 * 24 * 60))
+        apps.append({
+            "id": i,
+            "company_name": rnd.choice(companies),
+            "role_title": rnd.choice(ROLES),
+            "channel": "referral" if i % 5 == 0 else "website",
+            "location": rnd.choice(CITIES),
+            "status": rnd.choices(statuses, weights)[0],
+            "current_stage": "applied",
+            "jd_hash": None,
+            "created_at": created,
+            "updated_at": created,
+        })
+        t = created
+        for _ in range(rnd.randint(1, 8)):
+            t += timedelta(hours=rnd.randint(1, 240))
+            events.append({
+                "application_id": i,
+                "event_type": rnd.choice(EVENT_TYPES),
+                "event_time": t,
+                "notes": None,
+            })
+        postings.append({
+            "source": "greenhouse",
+            "company_name": rnd.choice(companies),
+            "role_title": rnd.choice(ROLES),
+            "location": rnd.choice(CITIES),
+            "board_token": f"board{i % 200}",
+            "external_id": str(i),
+            "fingerprint": f"{i:064x}",
+            "is_new": i % 10 == 0,
+            "closed_at": now if i % 7 == 0 else None,
+            "created_at": now - timedelta(minutes=i),
+        })
+
+    company_rows = []
+    for name in companies:
+        norm = normalize_company_name(name)
+        company_rows.append({
+            "name": name,
+            "normalized_name": norm,
+            "search_key": company_search_key(norm),
+            "source": "seed",
+            "popularity": rnd.randint(1, 500),
+            "last_seen_at": now - timedelta(days=rnd.randint(0, 365)),
+        })
+
+    with Session(engine) as db:
+        for table, rows in (
+            (Application.__table__, apps),
+            (Event.__table__, events),
+            (JobPosting.__table__, postings),
+            (CompanyIndex.__table__, company_rows),
+        ):
+            for chunk in _chunks(rows):
+                db.execute(insert(table), chunk)
+        for chunk in _chunks(apps):
+            refresh_last_events(db, [a["id"] for a in chunk])
+            search_index.index_docs(db, "applications", (
+                search_index.SearchDoc(
+                    id=a["id"], title=search_index.title_of(a["company_name"], a["role_title"]), location=a["location"]
+                )
+                for a in chunk
+            ))
+        db.commit()
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return {"applications": len(apps), "events": len(events), "job_postings": len(postings), "companies": len(companies)}
+
+
+class Capture:
+    """before_cursor_execute 抓 SELECT（EXPLAIN 自己发的语句不抓）"""
+
+    def __init__(self, engine) -> None:
+        from sqlalchemy import event
+
+        self.active = False
+        self.statements: list[tuple[str, object]] = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if self.active and not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                self.statements.append((statement, parameters))
+
+
+def _sqlite_plan(conn, statement: str, parameters, tables: set[str]) -> tuple[list[str], list[str]]:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    plan = [r[-1] for r in rows]
+    full_scans = []
+    for detail in plan:
+        m = _SQLITE_SCAN.match(detail)
+        # 子查询结果（anon_1 这类）不是表；FTS5 虚拟表走自己的倒排索引
+        if m and m.group(1) in tables and "INDEX" not in m.group(2) and "VIRTUAL TABLE" not in m.group(2):
+            full_scans.append(detail)
+    return plan, full_scans
+
+
+def _pg_plan(conn, statement: str, parameters, tables: set[str]) -> tuple[list[str], list[str]]:
+    doc = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar_one()
+    if isinstance(doc, str):
+        doc = json.loads(doc)
+    plan, full_scans = [], []
+
+    def _walk(node: dict, depth: int) -> None:
+        line = node["Node Type"]
+        if node.get("Relation Name"):
+            line += f" on {node['Relation Name']}"
+        if node.get("Index Name"):
+            line += f" using {node['Index Name']}"
+        plan.append("  " * depth + line)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables:
+            full_scans.append(line)
+        for child in node.get("Plans", []):
+            _walk(child, depth + 1)
+
+    _walk(doc[0]["Plan"], 0)
+    return plan, full_scans
+
+
+def _checks(db) -> list[tuple[str, str | None, object]]:
+    """(名字, 应该用到的索引, 调用)；索引为 None 时只检查没有全表扫描"""
+    from sqlalchemy import func, select
+
+    from app.crud import crud_application, crud_company, crud_event, crud_job_posting
+    from app.models.application import Application
+    from app.models.event import Event
+
+    app_id = db.execute(select(func.max(Application.id))).scalar_one() // 2
+    event_type = db.execute(select(Event.event_type).where(Event.application_id == app_id)).scalars().first()
+    page_ids = db.execute(select(Application.id).order_by(Application.created_at.desc()).limit(20)).scalars().all()
+    cursor = crud_application.list_applications(db, status="active", limit=20).next_cursor
+    activity_cursor = crud_application.list_applications(db, order_by="last_activity_at", limit=20).next_cursor
+    recent = datetime.utcnow() - timedelta(days=3)
+    event_cursor = crud_event.list_events_for_application(db, app_id, limit=2).next_cursor
+
+    return [
+        (
+            "events.is_duplicate",
+            "ix_events_application_id_event_type_event_time",
+            lambda: crud_event._is_duplicate_event(db, app_id, event_type or "applied"),
+        ),
+        (
+            "events.latest_for_applications",
+            None,
+            lambda: crud_event.latest_events_for_applications(db, page_ids),
+        ),
+        (
+            "events.list_for_application",
+            "ix_events_application_id_event_time_id",
+            lambda: crud_event.list_events_for_application(db, app_id, limit=20, cursor=event_cursor),
+        ),
+        (
+            "applications.list",
+            "ix_applications_created_at_id",
+            lambda: crud_application.list_applications(db, limit=20),
+        ),
+        (
+            "applications.list_by_status",
+            "ix_applications_status_created_at_id",
+            lambda: crud_application.list_applications(db, status="offer", limit=20),
+        ),
+        (
+            "applications.list_by_status_cursor",
+            "ix_applications_status_created_at_id",
+            lambda: crud_application.list_applications(db, status="active", limit=20, cursor=cursor),
+        ),
+        (
+            "applications.list_by_activity_cursor",
+            "ix_applications_last_activity_id",
+            lambda: crud_application.list_applications(
+                db, order_by="last_activity_at", limit=20, cursor=activity_cursor
+            ),
+        ),
+        (
+            "applications.active_since",
+            "ix_applications_last_activity_id",
+            lambda: crud_application.list_applications(
+                db, active_since=recent, order_by="last_activity_at", limit=20
+            ),
+        ),
+        (
+            "applications.search",
+            None,
+            lambda: crud_application.list_applications(db, search="backend", limit=20),
+        ),
+        (
+            "job_postings.list",
+            "ix_job_postings_created_at_id",
+            lambda: crud_job_posting.list_job_postings(db, limit=20),
+        ),
+        (
+            "job_postings.list_new",
+            "ix_job_postings_is_new_created_at",
+            lambda: crud_job_posting.list_job_postings(db, only_new=True, include_closed=True, limit=20),
+        ),
+        (
+            "companies.suggest_prefix",
+            "ix_company_index_search_key_popularity",
+            lambda: crud_company.suggest_companies(db, q="open d", limit=10, fuzzy=False),
+        ),
+        (
+            "companies.suggest_fuzzy",
+            None,
+            lambda: crud_company.suggest_companies(db, q="opne deep", limit=10, fuzzy=True),
+        ),
+    ]
+
+
+def _run_checks(engine) -> list[dict]:
+    from sqlalchemy.orm import Session
+
+    from app.core.database import Base
+    from app.crud.search_index import FTS_TABLES
+
+    # ORM 表 + 全文索引表（*_fts 是迁移里建的，不在 metadata 里）
+    tables = set(Base.metadata.tables) | set(FTS_TABLES.values())
+    explain = _pg_plan if engine.dialect.name == "postgresql" else _sqlite_plan
+    capture = Capture(engine)
+
+    results = []
+    with Session(engine) as db:
+        for name, expected_index, call in _checks(db):
+            call()  # 预热：count 缓存 / 进程内索引
+            capture.statements = []
+            capture.active = True
+            try:
+                call()
+            finally:
+                capture.active = False
+
+            statements = []
+            with engine.connect() as conn:
+                for statement, parameters in capture.statements:
+                    plan, full_scans = explain(conn, statement, parameters, tables)
+                    statements.append({
+                        "sql": " ".join(statement.split()),
+                        "plan": plan,
+                        "full_scans": full_scans,
+                    })
+
+            problems = [f"full scan: {s}" for st in statements for s in st["full_scans"]]
+            if expected_index and not any(expected_index in line for st in statements for line in st["plan"]):
+                problems.append(f"expected index {expected_index} not used")
+            results.append({
+                "check": name,
+                "expected_index": expected_index,
+                "ok": not problems,
+                "problems": problems,
+                "statements": statements,
+            })
+    return results
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--applications", type=int, default=20000, help="seeded applications (events ~4.5x)")
+    p.add_argument("--database-url", help="run against this DB instead of a temp SQLite file (migrated + seeded)")
+    p.add_argument("--no-seed", action="store_true", help="don't seed, use the data already in --database-url")
+    p.add_argument("--output", help="write JSON results to this file")
+    args = p.parse_args()
+
+    tmp = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="jobtrackiq-plans-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp.name) / 'plans.db'}"
+
+    try:
+        # app.* 只能在 DATABASE_URL 设好之后 import
+        from alembic import command
+        from alembic.config import Config
+
+        from app.core.database import engine
+
+        command.upgrade(Config("alembic.ini"), "head")
+        seeded = None if args.no_seed else _seed(engine, args.applications)
+        results = _run_checks(engine)
+        dialect = engine.dialect.name
+        engine.dispose()
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+    report = {"benchmark": "query_plans", "dialect": dialect, "seeded": seeded, "results": results}
+    out = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(out + "\n", encoding="utf-8")
+
+    failed = [r for r in results if not r["ok"]]
+    for r in results:
+        print(f'{"ok  " if r["ok"] else "FAIL"} {r["check"]}', file=sys.stderr)
+        for msg in r["problems"]:
+            print(f"     {msg}", file=sys.stderr)
+    print(out)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())